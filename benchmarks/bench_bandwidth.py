@@ -0,0 +1,94 @@
+"""
+Backlog drain over a simulated slow uplink, with and without upload shaping.
+
+A backlog drains against the stub server's simulated link while a fresh
+capture is uploaded every --live-interval seconds. The output shows how
+much of the link the drain takes and how long a live capture waits:
+
+    python -m benchmarks.bench_bandwidth [--link-kbps 1024] [--items 24] [--item-kb 256]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.stub_server import StubServer
+from src.argus.api.ratelimit import BACKLOG, LIVE, TokenBucket
+from src.argus.api.tracker import ActivityTrackerAPI
+from src.argus.uploadqueue.drainer import BacklogDrainer
+from src.argus.uploadqueue.persistent_queue import PersistentUploadQueue
+
+
+def scenarios(link: float):
+    return [
+        ("unlimited", TokenBucket(0)),
+        ("fixed 50% of link", TokenBucket(link * 0.5)),
+        ("adaptive from 2x link", TokenBucket(link * 2, adaptive=True, adapt_window=1.0)),
+    ]
+
+
+def write_files(workdir: str, count: int, size: int, prefix: str) -> list:
+    paths = []
+    for i in range(count):
+        path = os.path.join(workdir, f"{prefix}{i}.png")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))  # Incompressible, like an encoded screenshot
+        paths.append(path)
+    return paths
+
+
+def run(link_kbps: float, items: int, item_kb: int, live_interval: float, concurrency: int):
+    link = link_kbps * 1024
+    print(f"link {link_kbps:.0f} KiB/s, backlog {items} x {item_kb} KiB, live capture every {live_interval}s")
+    print(f"{'limiter':<24}{'drain s':>9}{'KiB/s':>8}{'live p50 ms':>13}{'live max ms':>13}{'final KiB/s':>13}")
+
+    with tempfile.TemporaryDirectory() as workdir, StubServer(link_bytes_per_sec=link) as server:
+        backlog_files = write_files(workdir, items, item_kb * 1024, "backlog")
+        live_file = write_files(workdir, 1, 64 * 1024, "live")[0]
+
+        for label, limiter in scenarios(link):
+            api = ActivityTrackerAPI(base_url=server.url)
+            api.limiter = limiter
+            queue = PersistentUploadQueue(os.path.join(workdir, f"{label}.db"))
+            for path in backlog_files:
+                queue.put("bench", path, 60.0)
+
+            drainer = BacklogDrainer(
+                queue,
+                lambda item: api.upload_activity(item.employee_id, item.filepath, "60", priority=BACKLOG),
+                concurrency=concurrency,
+            )
+            done = threading.Event()
+            live_latencies = []
+
+            def live_uploads():
+                while not done.wait(live_interval):
+                    started = time.perf_counter()
+                    api.upload_activity("bench", live_file, "60", priority=LIVE)
+                    live_latencies.append((time.perf_counter() - started) * 1000)
+
+            live = threading.Thread(target=live_uploads, daemon=True)
+            live.start()
+            report = drainer.drain()
+            done.set()
+            live.join()
+            queue.close()
+
+            sent_kib = items * item_kb
+            print(f"{label:<24}{report.elapsed:>9.1f}{sent_kib / report.elapsed:>8.0f}"
+                  f"{statistics.median(live_latencies) if live_latencies else 0:>13.0f}"
+                  f"{max(live_latencies, default=0):>13.0f}"
+                  f"{limiter.rate / 1024 if limiter.enabled else 0:>13.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--link-kbps", type=float, default=1024, help="simulated uplink, KiB/s")
+    parser.add_argument("--items", type=int, default=24)
+    parser.add_argument("--item-kb", type=int, default=256)
+    parser.add_argument("--live-interval", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    run(args.link_kbps, args.items, args.item_kb, args.live_interval, args.concurrency)
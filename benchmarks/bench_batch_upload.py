@@ -0,0 +1,66 @@
+"""
+Requests per item and drain throughput of the upload backlog, single vs batched uploads.
+
+Seeds a temporary pending queue with encoded screenshots and time-only
+records, then drains it against the local stub server:
+
+    python -m benchmarks.bench_batch_upload [--items 200] [--concurrency 4] [--batch-size 1 --batch-size 10]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.frames import synthetic_frame
+from benchmarks.stub_server import StubServer
+from src.argus.api.tracker import ActivityTrackerAPI
+from src.argus.screenshot.png import write_frame_png
+from src.argus.uploadqueue.drainer import BacklogDrainer
+from src.argus.uploadqueue.persistent_queue import PersistentUploadQueue
+
+
+def seed_queue(queue: PersistentUploadQueue, workdir: str, items: int):
+    """Every fourth item is a time-only record, like captures skipped as unchanged"""
+    for i in range(items):
+        path = None
+        if i % 4:
+            path = os.path.join(workdir, f"shot{i}.png")
+            write_frame_png(synthetic_frame(640, 360, seed=i), path, level=1)
+        queue.put("bench", path, 60.0)
+
+
+def run(items: int, concurrency: int, batch_sizes, server_batching: bool):
+    print(f"{items} items, concurrency {concurrency}, server batching {'on' if server_batching else 'off'}")
+    print(f"{'batch size':<12}{'requests':>10}{'req/item':>10}{'items/s':>10}{'failed':>8}")
+    with tempfile.TemporaryDirectory() as workdir, StubServer(batch=server_batching) as server:
+        for batch_size in batch_sizes:
+            queue = PersistentUploadQueue(os.path.join(workdir, f"queue{batch_size}.db"))
+            seed_queue(queue, workdir, items)
+            api = ActivityTrackerAPI(base_url=server.url)
+            server.reset_stats()
+
+            def upload_one(item):
+                return api.upload_activity(item.employee_id, item.filepath, str(item.work_seconds), item.content_hash)
+
+            def upload_many(batch):
+                return api.upload_batch([
+                    {"employee_id": item.employee_id, "screenshot_path": item.filepath,
+                     "work_seconds": str(item.work_seconds), "content_hash": item.content_hash}
+                    for item in batch
+                ])
+
+            report = BacklogDrainer(queue, upload_one, concurrency=concurrency,
+                                    upload_batch_fn=upload_many, batch_size=batch_size).drain()
+            stats = server.stats.as_dict()
+            print(f"{batch_size:<12}{stats['requests']:>10}{stats['requests_per_item']:>10.2f}"
+                  f"{report.throughput:>10.1f}{report.failed:>8}")
+            queue.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, action="append", help="may be repeated (default 1 and 10)")
+    parser.add_argument("--no-server-batch", action="store_true", help="stub server without the batch endpoint")
+    args = parser.parse_args()
+    run(args.items, args.concurrency, args.batch_size or [1, 10], not args.no_server_batch)
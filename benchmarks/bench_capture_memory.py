@@ -0,0 +1,65 @@
+"""
+Peak memory allocated while encoding one capture, measured with tracemalloc.
+
+Documented bound for the PNG path: the encoder streams rows to disk, so
+the peak traced allocation per capture must stay under PEAK_BOUND_BYTES
+whatever the frame or output size. The previous path (full RGB copy +
+joined scanlines + whole compressed file) is shown for comparison. Exits
+with status 1 when the bound is exceeded:
+
+    python -m benchmarks.bench_capture_memory [--resolution 3840x2160 ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import mss.tools
+
+from benchmarks.frames import synthetic_frame
+from src.argus.screenshot.codecs import PngCodec
+
+PEAK_BOUND_BYTES = 512 * 1024
+
+
+def traced_peak(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(resolutions) -> bool:
+    within_bound = True
+    print(f"{'resolution':<12}{'raw MB':>9}{'old peak MB':>13}{'new peak MB':>13}{'bound MB':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "capture.png")
+        codec = PngCodec()
+        for width, height in resolutions:
+            # Built outside the traced region, like the mss grab buffer
+            frame = synthetic_frame(width, height)
+            old_peak = traced_peak(lambda: mss.tools.to_png(frame.rgb, frame.size, output=path))
+            new_peak = traced_peak(lambda: codec.encode(frame, path))
+            bound = PEAK_BOUND_BYTES
+            within_bound = within_bound and new_peak <= bound
+
+            mb = 1024 * 1024
+            print(f"{width}x{height:<7}{len(frame.raw) / mb:>9.1f}{old_peak / mb:>13.1f}"
+                  f"{new_peak / mb:>13.2f}{bound / mb:>10.2f}{'' if new_peak <= bound else '  EXCEEDED'}")
+    return within_bound
+
+
+def parse_resolution(value: str):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resolution", type=parse_resolution, action="append",
+                        help="WIDTHxHEIGHT, may be repeated (default 1920x1080, 3840x2160, 11520x2160)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.resolution or [(1920, 1080), (3840, 2160), (11520, 2160)]) else 1)
@@ -0,0 +1,138 @@
+"""
+Per-event cost of ClickTracker.on_click under synthetic 1000 Hz event streams.
+
+Replays press/release streams (1000 events/s in bursts of activity, with
+idle gaps past the inactivity threshold between them) through the
+coalescing tracker and through a replica of the former per-click handler
+(a print and a callback per click). Time comes from a replay clock, so the
+inactivity monitor's checks run at their real cadence in stream time.
+The UI dispatcher is a queue that is drained after every check, like
+root.after:
+
+    python -m benchmarks.bench_clicktracker [--seconds 3600] [--rate 1000]
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.argus.mousetracking.clicktracker import ClickTracker
+
+
+class ReplayClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_stream(seconds: int, rate: int, threshold: float, seed: int = 0):
+    """(time, pressed) events: bursts of 30-300 s at `rate` events/s, idle gaps of up to twice the threshold"""
+    rng = random.Random(seed)
+    events = []
+    now = 0.0
+    step = 1.0 / rate
+    while now < seconds:
+        burst_end = min(seconds, now + rng.uniform(30, 300))
+        pressed = True
+        while now < burst_end:
+            events.append((now, pressed))
+            pressed = not pressed
+            now += step
+        now += rng.uniform(threshold / 2, threshold * 2)
+    return events
+
+
+class LegacyClickTracker:
+    """The handler as it was: a print, a callback and listener calls for every click"""
+
+    def __init__(self, callback, listeners):
+        self.callback = callback
+        self.activity_listeners = listeners
+        self.ignore_next_clicks = 0
+        self.last_click_time = datetime.now()
+
+    def on_click(self, x, y, button, pressed):
+        if pressed:
+            if self.ignore_next_clicks > 0:
+                self.ignore_next_clicks -= 1
+                return
+            self.last_click_time = datetime.now()
+            print(f"Real mouse activity detected at {self.last_click_time}")
+            self.callback(activity=True)
+            for listener in self.activity_listeners:
+                listener(self.last_click_time)
+
+
+def replay(events, on_click, clock: ReplayClock, check=None, check_interval: float = 10.0) -> float:
+    """Feed the stream to on_click, running check() every check_interval of stream time; returns seconds spent"""
+    next_check = check_interval
+    spent = 0.0
+    for at, pressed in events:
+        while check is not None and at >= next_check:
+            clock.now = next_check
+            check()
+            next_check += check_interval
+        clock.now = at
+        started = time.perf_counter()
+        on_click(0, 0, None, pressed)
+        spent += time.perf_counter() - started
+    return spent
+
+
+def run(seconds: int, rate: int, threshold: float):
+    events = make_stream(seconds, rate, threshold)
+    clicks = sum(1 for _, pressed in events if pressed)
+
+    # Coalescing tracker, callbacks marshalled through a queue like root.after
+    clock = ReplayClock()
+    tracker = ClickTracker(inactivity_threshold=threshold, clock=clock)
+    delivered = []
+    queued = []
+    counted = [0]
+
+    def on_activity(activity: bool):
+        # What the UI does: auto-pause on inactivity, auto-resume on activity
+        delivered.append(activity)
+        tracker.is_paused = not activity
+
+    tracker.callback = on_activity
+    tracker.dispatcher = lambda fn, *args: queued.append((fn, args))
+    tracker.add_activity_listener(lambda at, count: counted.__setitem__(0, counted[0] + count))
+    base = datetime(2024, 1, 1, 9, 0)
+
+    def check():
+        tracker.check(base + timedelta(seconds=clock.now))
+        while queued:
+            fn, args = queued.pop(0)
+            fn(*args)
+
+    spent = replay(events, tracker.on_click, clock, check, tracker.check_interval)
+    clock.now = events[-1][0] + tracker.check_interval
+    check()
+    new_us = spent / len(events) * 1e6
+    assert counted[0] == clicks, (counted[0], clicks)
+
+    # Former handler, its prints sent to /dev/null rather than a terminal
+    legacy_calls = [0]
+    legacy = LegacyClickTracker(lambda activity: legacy_calls.__setitem__(0, legacy_calls[0] + 1), [lambda at: None])
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        legacy_spent = replay(events, legacy.on_click, ReplayClock())
+    legacy_us = legacy_spent / len(events) * 1e6
+
+    print(f"{len(events)} events ({clicks} clicks) over {seconds}s of stream at {rate} Hz")
+    print(f"coalescing: {new_us:.2f} us per event, {len(delivered)} UI callbacks "
+          f"({delivered.count(False)} auto-pauses), {counted[0]} clicks reported to listeners")
+    print(f"per-click:  {legacy_us:.2f} us per event, {legacy_calls[0]} callbacks from the hook thread")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=3600, help="length of the replayed stream")
+    parser.add_argument("--rate", type=int, default=1000, help="events per second during activity")
+    parser.add_argument("--threshold", type=float, default=120.0, help="inactivity threshold in seconds")
+    args = parser.parse_args()
+    run(args.seconds, args.rate, args.threshold)
@@ -0,0 +1,61 @@
+"""
+Bytes per frame and milliseconds per frame for each screenshot codec.
+
+JPEG and WebP rows are skipped when Pillow is not installed:
+
+    python -m benchmarks.bench_codecs [--frames 3] [--resolution 1920x1080 ...]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.frames import synthetic_frame
+from src.argus.screenshot.codecs import create_codec
+
+CODEC_SETTINGS = [
+    {"format": "png", "zlib_level": 1},
+    {"format": "png", "zlib_level": 6},
+    {"format": "png", "zlib_level": 9},
+    {"format": "png", "zlib_level": 6, "max_width": 1280},
+    {"format": "jpeg", "quality": 60},
+    {"format": "jpeg", "quality": 85},
+    {"format": "jpeg", "quality": 75, "max_width": 1280},
+    {"format": "webp", "quality": 60},
+    {"format": "webp", "quality": 85},
+    {"format": "webp", "quality": 75, "max_width": 1280},
+]
+
+
+def run(resolutions, frames_per_resolution: int):
+    print(f"{'resolution':<12}{'codec':<34}{'bytes/frame':>14}{'ms/frame':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for width, height in resolutions:
+            frames = [synthetic_frame(width, height, seed=i) for i in range(frames_per_resolution)]
+            for options in CODEC_SETTINGS:
+                codec = create_codec(options)
+                if codec.name != options["format"]:
+                    continue  # Needs Pillow
+
+                total_bytes = 0
+                started = time.perf_counter()
+                for i, frame in enumerate(frames):
+                    total_bytes += codec.encode(frame, os.path.join(workdir, f"frame{i}{codec.extension}")).size
+                elapsed_ms = (time.perf_counter() - started) * 1000
+
+                print(f"{width}x{height:<7}{codec.describe():<34}"
+                      f"{total_bytes // len(frames):>14,}{elapsed_ms / len(frames):>10.1f}")
+
+
+def parse_resolution(value: str):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=3, help="sample frames per resolution")
+    parser.add_argument("--resolution", type=parse_resolution, action="append",
+                        help="WIDTHxHEIGHT, may be repeated (default 1920x1080 and 3840x2160)")
+    args = parser.parse_args()
+    run(args.resolution or [(1920, 1080), (3840, 2160)], args.frames)
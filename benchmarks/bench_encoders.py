@@ -0,0 +1,65 @@
+"""
+Encode throughput in-thread, on a thread pool and on the shared-memory process pool.
+
+Each mode encodes the same synthetic frames with the same codec settings:
+
+    python -m benchmarks.bench_encoders [--frames 12] [--workers 2] [--resolution 1920x1080] [--format png]
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_codecs import parse_resolution
+from benchmarks.frames import synthetic_frame
+from src.argus.screenshot.codecs import create_codec
+from src.argus.screenshot.process_encoder import ProcessPoolEncoder, encode_frame
+
+
+def _timed(label: str, frames: list, encode_one) -> None:
+    started = time.perf_counter()
+    total_bytes = sum(result.size for result in encode_one(frames))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24}{len(frames) / elapsed:>10.2f}{elapsed / len(frames) * 1000:>12.1f}"
+          f"{total_bytes // len(frames):>14,}")
+
+
+def run(resolution, frame_count: int, workers: int, options: dict):
+    width, height = resolution
+    codec = create_codec(options)
+    frames = [synthetic_frame(width, height, seed=i) for i in range(frame_count)]
+    print(f"{width}x{height}, {frame_count} frames, {codec.describe()}, {workers} worker(s)")
+    print(f"{'mode':<24}{'frames/s':>10}{'ms/frame':>12}{'bytes/frame':>14}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        def path(i):
+            return os.path.join(workdir, f"frame{i}{codec.extension}")
+
+        _timed("in-thread", frames, lambda fs: [encode_frame(f, path(i), codec) for i, f in enumerate(fs)])
+
+        with ThreadPoolExecutor(workers) as threads:
+            _timed("thread pool", frames, lambda fs: list(threads.map(
+                lambda item: encode_frame(item[1], path(item[0]), codec), enumerate(fs))))
+
+        encoder = ProcessPoolEncoder(workers)
+        try:
+            # Start the worker processes outside the timed section; their startup cost is paid once per session
+            encoder.encode(frames[0], path(0), codec)
+            # The pipeline drives the process pool from its encoder threads, one frame each
+            with ThreadPoolExecutor(workers) as threads:
+                _timed("process pool (shm)", frames, lambda fs: list(threads.map(
+                    lambda item: encoder.encode(item[1], path(item[0]), codec), enumerate(fs))))
+        finally:
+            encoder.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=12, help="frames encoded per mode")
+    parser.add_argument("--workers", type=int, default=2, help="threads / processes for the pool modes")
+    parser.add_argument("--resolution", type=parse_resolution, default=(1920, 1080), help="WIDTHxHEIGHT")
+    parser.add_argument("--format", default="png", help="codec name (png, jpeg, webp)")
+    parser.add_argument("--quality", type=int, default=80)
+    args = parser.parse_args()
+    run(args.resolution, args.frames, args.workers, {"format": args.format, "quality": args.quality})
@@ -0,0 +1,190 @@
+"""
+Load test: a fleet of headless capture clients against the stub activity API.
+
+Every client is a full ScreenshotCapture (pipeline, pending queue, backlog
+drainer) with its own ActivityTrackerAPI and connectivity monitor, a
+synthetic-frame grabber and a throwaway data folder. Each one logs in,
+then captures every --interval seconds for --duration seconds. The stub
+runs in a child process, so the CPU figure covers the clients only:
+
+    python -m benchmarks.bench_fleet [--clients 20] [--duration 60] [--interval 2]
+        [--latency-ms 100] [--error-rate 0.05] [--link-kbps 2048] [--resolution 1280x720]
+
+Reports uploads per second, p50/p99 upload latency, backlog growth and CPU
+time per capture. Captures are named by the second, so --interval must be
+at least 1.
+"""
+import argparse
+import logging
+import multiprocessing
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_codecs import parse_resolution
+from benchmarks.frames import synthetic_frame
+from benchmarks.stub_server import StubServer
+from src.argus.api.tracker import ActivityTrackerAPI
+from src.argus.filemanager.file_manager import FileManager
+from src.argus.screenshot.capture import ScreenshotCapture
+
+
+class SyntheticGrabber:
+    """Stands in for ScreenGrabber: a new screen-like frame every change_every grabs"""
+
+    def __init__(self, width: int, height: int, seed: int, change_every: int = 1):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.change_every = max(1, change_every)
+        self.grabs = 0
+
+    def grab(self):
+        frame = synthetic_frame(self.width, self.height, seed=self.seed + self.grabs // self.change_every)
+        self.grabs += 1
+        return [frame]
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> dict:
+        return {"grabs": self.grabs}
+
+
+class TimedAPI(ActivityTrackerAPI):
+    """ActivityTrackerAPI that records how long every upload_activity() call took"""
+
+    def __init__(self, base_url: str, latencies: list):
+        super().__init__(base_url=base_url)
+        self.latencies = latencies
+
+    def upload_activity(self, *args, **kwargs) -> bool:
+        started = time.perf_counter()
+        try:
+            return super().upload_activity(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+
+def _serve(conn, options: dict):
+    """Child process: run the stub until asked for its stats"""
+    with StubServer(**options) as server:
+        conn.send(server.url)
+        conn.recv()
+        conn.send(server.stats.as_dict())
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(clients: int, duration: float, interval: float, resolution, change_every: int, server_options: dict):
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe()
+    server = context.Process(target=_serve, args=(child_conn, server_options), daemon=True)
+    server.start()
+    url = parent_conn.recv()
+
+    width, height = resolution
+    latencies, login_latencies = [], []
+    logged_in = 0
+    fleet = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for i in range(clients):
+            api = TimedAPI(url, latencies)
+            capture = ScreenshotCapture(
+                None, api=api,
+                grabber=SyntheticGrabber(width, height, seed=i * 1000, change_every=change_every),
+                files=FileManager(base_dir=f"{workdir}/client{i}"),
+            )
+            started = time.perf_counter()
+            response = api.transport.post("login.php", json={"login_id": f"emp{i}", "password": "bench"})
+            login_latencies.append(time.perf_counter() - started)
+            logged_in += response.status_code == 200 and bool(response.json().get("success"))
+            fleet.append(capture)
+
+        captures = [0] * clients
+        stop = threading.Event()
+        backlog = []
+
+        def drive(index: int, capture: ScreenshotCapture):
+            capture.start(f"emp{index}")
+            # Spread the fleet over the interval instead of capturing in lockstep
+            if stop.wait(interval * index / clients):
+                return
+            while not stop.is_set():
+                if capture.capture():
+                    captures[index] += 1
+                stop.wait(interval)
+
+        def sample_backlog():
+            while not stop.wait(1.0):
+                backlog.append(sum(len(capture.pending_uploads) for capture in fleet))
+
+        cpu_start = time.process_time()
+        started = time.perf_counter()
+        threads = [threading.Thread(target=drive, args=(i, c), daemon=True) for i, c in enumerate(fleet)]
+        threads.append(threading.Thread(target=sample_backlog, daemon=True))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        # Include the uploads still in flight: the pipelines finish their queued work on stop()
+        for capture in fleet:
+            capture.stop()
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_start
+        pending = sum(len(capture.pending_uploads) for capture in fleet)
+        captured = sum(captures)
+        for capture in fleet:
+            capture.pending_uploads.close()
+            capture.connectivity.stop()
+
+    parent_conn.send("stats")
+    stats = parent_conn.recv()
+    server.join()
+
+    print(f"{clients} clients x {duration:.0f}s, capture every {interval:.1f}s at {width}x{height}, "
+          f"server {server_options}")
+    print(f"captures            {captured}")
+    print(f"uploads/s           {len(latencies) / elapsed:.1f} attempted, "
+          f"{stats['items'] / elapsed:.1f} received by the server")
+    print(f"upload latency ms   p50 {percentile(latencies, 50) * 1000:.0f}  p99 {percentile(latencies, 99) * 1000:.0f}  "
+          f"mean {statistics.mean(latencies) * 1000 if latencies else 0:.0f}")
+    print(f"login latency ms    p50 {percentile(login_latencies, 50) * 1000:.0f}  ({logged_in}/{clients} succeeded)")
+    print(f"backlog             peak {max(backlog, default=0)}  at end {pending}  "
+          f"growth {pending / (elapsed / 60):.1f} items/min")
+    print(f"CPU per capture ms  {cpu / captured * 1000 if captured else 0:.1f} "
+          f"({cpu / elapsed * 100:.0f}% of one core)")
+    print(f"server              {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60, help="seconds of capturing")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between a client's captures (>= 1)")
+    parser.add_argument("--resolution", type=parse_resolution, default=(1280, 720))
+    parser.add_argument("--change-every", type=int, default=1, help="grabs per new synthetic screen")
+    parser.add_argument("--latency-ms", type=float, default=0, help="stub server reply delay")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of requests the stub answers with 503")
+    parser.add_argument("--link-kbps", type=float, default=0, help="stub uplink speed in KiB/s (0 = unlimited)")
+    parser.add_argument("--no-batch", action="store_true", help="stub server without the batch endpoint")
+    parser.add_argument("--verbose", action="store_true", help="keep the clients' info logging")
+    args = parser.parse_args()
+    if args.interval < 1:
+        parser.error("--interval must be at least 1 second")
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+    run(args.clients, args.duration, args.interval, args.resolution, args.change_every, {
+        "batch": not args.no_batch,
+        "link_bytes_per_sec": args.link_kbps * 1024,
+        "latency": args.latency_ms / 1000,
+        "error_rate": args.error_rate,
+    })
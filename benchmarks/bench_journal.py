@@ -0,0 +1,56 @@
+"""
+Cost of the session journal: time per appended event and replay time on startup.
+
+Appends pause/resume pairs (plus a capture every few events) with the
+default batched fsync, then replays the journal the way a restart after a
+crash does:
+
+    python -m benchmarks.bench_journal [--pauses 1000 --pauses 100000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.argus.timetracker.journal import SessionJournal
+
+
+def run(pause_counts, sync_interval: float):
+    print(f"{'pauses':>10}{'lines':>10}{'KiB':>9}{'append us':>11}{'fsyncs':>8}{'replay ms':>11}")
+    for count in pause_counts:
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "session.journal")
+            journal = SessionJournal(path, sync_interval_sec=sync_interval)
+            journal.user_id = "bench"
+            at = datetime(2024, 1, 1, 9, 0)
+            journal.begin(at)
+
+            started = time.perf_counter()
+            for i in range(count):
+                at += timedelta(minutes=5)
+                journal.record("pause", at)
+                at += timedelta(minutes=2)
+                journal.record("resume", at)
+                if i % 2 == 0:
+                    journal.record("capture", at)
+            append_us = (time.perf_counter() - started) / journal.appends * 1e6
+            journal._stopped.set()
+
+            size = os.path.getsize(path)
+            started = time.perf_counter()
+            session = SessionJournal(path).recover("bench")
+            replay_ms = (time.perf_counter() - started) * 1000
+            assert session is not None and len(session.pauses) == count
+
+            print(f"{count:>10}{journal.appends:>10}{size / 1024:>9.0f}{append_us:>11.2f}"
+                  f"{journal.syncs:>8}{replay_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pauses", type=int, action="append",
+                        help="pause/resume pairs in the journal, may be repeated (default 100, 10000, 100000)")
+    parser.add_argument("--sync-interval", type=float, default=5.0, help="seconds between fsyncs")
+    args = parser.parse_args()
+    run(args.pauses or [100, 10_000, 100_000], args.sync_interval)
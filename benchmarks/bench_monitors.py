@@ -0,0 +1,80 @@
+"""
+Compare the bounding-box grab of the virtual screen against per-monitor capture.
+
+Frames are synthetic, so this runs without a display:
+
+    python -m benchmarks.bench_monitors [--scale 0.5]
+"""
+import argparse
+import time
+
+import mss.tools
+
+from benchmarks.frames import place, synthetic_frame
+from src.argus.screenshot.grabber import compose, pack_layout, virtual_region
+
+LAYOUTS = {
+    "laptop + 4K side by side": [
+        {"left": 0, "top": 840, "width": 1920, "height": 1080},
+        {"left": 1920, "top": 0, "width": 3840, "height": 2160},
+    ],
+    "landscape + portrait": [
+        {"left": 0, "top": 0, "width": 2560, "height": 1440},
+        {"left": 2560, "top": -240, "width": 1080, "height": 1920},
+    ],
+    "stacked, offset": [
+        {"left": 0, "top": 0, "width": 2560, "height": 1440},
+        {"left": 640, "top": 1440, "width": 1280, "height": 1024},
+    ],
+    "4K + two stacked 1080p": [
+        {"left": 0, "top": 0, "width": 1920, "height": 1080},
+        {"left": 0, "top": 1080, "width": 1920, "height": 1080},
+        {"left": 1920, "top": 0, "width": 3840, "height": 2160},
+    ],
+    "three 4K in a row": [
+        {"left": 0, "top": 0, "width": 3840, "height": 2160},
+        {"left": 3840, "top": 0, "width": 3840, "height": 2160},
+        {"left": 7680, "top": 0, "width": 3840, "height": 2160},
+    ],
+}
+
+
+def scale_layout(monitors, scale):
+    return [{key: int(value * scale) for key, value in m.items()} for m in monitors]
+
+
+def virtual_frame(frames, monitors):
+    """What a single bounding-box grab returns: every monitor plus the dead area between them"""
+    region = virtual_region(monitors)
+    offsets = [(m["left"] - region["left"], m["top"] - region["top"]) for m in monitors]
+    return compose(frames, region["width"], region["height"], offsets)
+
+
+def encode(frames):
+    started = time.perf_counter()
+    size = sum(len(mss.tools.to_png(frame.rgb, frame.size)) for frame in frames)
+    return (time.perf_counter() - started) * 1000, size
+
+
+def run(scale: float):
+    print(f"{'layout':<28}{'strategy':<14}{'pixels':>12}{'encode ms':>12}{'bytes':>12}")
+    for name, layout in LAYOUTS.items():
+        monitors = scale_layout(layout, scale)
+        frames = [place(synthetic_frame(m["width"], m["height"], seed=i), m) for i, m in enumerate(monitors)]
+        width, height, offsets = pack_layout(monitors)
+
+        strategies = {
+            "bounding box": [virtual_frame(frames, monitors)],
+            "composite": [compose(frames, width, height, offsets)],
+            "separate": frames,
+        }
+        for strategy, output in strategies.items():
+            pixels = sum(f.pixels for f in output)
+            encode_ms, size = encode(output)
+            print(f"{name:<28}{strategy:<14}{pixels:>12,}{encode_ms:>12.1f}{size:>12,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.5, help="scale factor applied to every monitor")
+    run(parser.parse_args().scale)
@@ -0,0 +1,81 @@
+"""
+Per-capture cost of TimeTracker.get_active_time_between with long pause histories.
+
+Builds sessions with an auto-pause every few minutes and times the query a
+capture makes (the active time since the previous capture), with the
+indexed pause store and with the former linear scan. The results of both
+are checked against each other on random ranges:
+
+    python -m benchmarks.bench_pause_index [--sessions 100 --sessions 100000] [--queries 2000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from src.argus.timetracker.time_tracker import TimeTracker
+
+
+def linear_paused(sessions, start_time: datetime, end_time: datetime) -> timedelta:
+    """The previous implementation: overlap with every pause session"""
+    total = timedelta()
+    for pause_start, pause_end in sessions:
+        overlap_start = max(pause_start, start_time)
+        overlap_end = min(pause_end, end_time)
+        if overlap_start < overlap_end:
+            total += overlap_end - overlap_start
+    return total
+
+
+def build_tracker(sessions: int, seed: int = 0):
+    """Tracker whose history has `sessions` pauses: work 1-10 min, idle 1-30 min, repeat"""
+    rng = random.Random(seed)
+    tracker = TimeTracker()
+    tracker.start_time = datetime(2024, 1, 1, 9, 0)
+    now = tracker.start_time
+    pauses = []
+    for _ in range(sessions):
+        now += timedelta(seconds=rng.randrange(60, 600))
+        pause_end = now + timedelta(seconds=rng.randrange(60, 1800), microseconds=rng.randrange(10 ** 6))
+        tracker.pause_sessions.add(now, pause_end)
+        pauses.append((now, pause_end))
+        now = pause_end
+    return tracker, pauses, now
+
+
+def per_call_us(fn, calls) -> float:
+    started = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - started) / len(calls) * 1e6
+
+
+def run(session_counts, queries: int):
+    print(f"{'sessions':>10}{'indexed us':>12}{'linear us':>12}{'speed-up':>10}")
+    for count in session_counts:
+        tracker, pauses, end = build_tracker(count)
+        rng = random.Random(1)
+
+        # What a capture asks: active time over the last capture interval, near the end of the session
+        recent = [(end - timedelta(seconds=rng.randrange(60, 3600)), end) for _ in range(queries)]
+        indexed = per_call_us(tracker.get_active_time_between, recent)
+        linear_calls = recent[:max(1, min(queries, 2_000_000 // max(1, count)))]
+        linear = per_call_us(lambda start, stop: stop - start - linear_paused(pauses, start, stop), linear_calls)
+
+        # Arbitrary ranges must give the same answer to the microsecond
+        span = (end - tracker.start_time).total_seconds()
+        for _ in range(50):
+            a = tracker.start_time + timedelta(seconds=rng.uniform(-60, span + 60))
+            b = a + timedelta(seconds=rng.uniform(0, span / 4))
+            assert tracker.pause_sessions.overlap(a, b) == linear_paused(pauses, a, b), (a, b)
+
+        print(f"{count:>10}{indexed:>12.2f}{linear:>12.1f}{linear / indexed:>9.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, action="append",
+                        help="pause sessions in the history, may be repeated (default 10, 1000, 10000, 100000)")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.sessions or [10, 1000, 10_000, 100_000], args.queries)
@@ -0,0 +1,84 @@
+"""
+Report query latency from the activity rollups, and the cost of keeping them current.
+
+Feeds a working year of synthetic sessions (8h days with pauses, a capture
+every few minutes, clicks) through the same calls the capture loop makes,
+flushing on every capture, then times the weekly and monthly summaries
+reports ask for:
+
+    python -m benchmarks.bench_rollups [--days 365] [--capture-interval 300]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from src.argus.reports.rollups import ActivityRollups
+
+
+def feed(rollups: ActivityRollups, days: int, capture_interval: int, seed: int = 0) -> int:
+    """Simulated sessions, returns the number of flushes made"""
+    rng = random.Random(seed)
+    flushes = 0
+    day = datetime(2024, 1, 1, 9, 0)
+    for _ in range(days):
+        if day.weekday() < 5:
+            at = day
+            end = day + timedelta(hours=8)
+            rollups.on_tracker_event("start", at)
+            while at < end:
+                at += timedelta(seconds=capture_interval)
+                rollups.record_click(at - timedelta(seconds=rng.randrange(capture_interval)))
+                rollups.record_capture(rng.randrange(50_000, 300_000), at)
+                rollups.record_upload(rng.randrange(50_000, 300_000), at)
+                rollups.flush(at)
+                flushes += 1
+                if rng.random() < 0.05:
+                    rollups.on_tracker_event("pause", at)
+                    at += timedelta(seconds=rng.randrange(300, 1800))
+                    rollups.on_tracker_event("resume", at)
+            rollups.on_tracker_event("reset", at)
+        day += timedelta(days=1)
+    return flushes
+
+
+def per_call_ms(fn, calls) -> float:
+    started = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - started) / len(calls) * 1000
+
+
+def run(days: int, capture_interval: int):
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "rollups.db")
+        rollups = ActivityRollups(path)
+        rollups.user_id = "bench"
+
+        started = time.perf_counter()
+        flushes = feed(rollups, days, capture_interval)
+        flush_us = (time.perf_counter() - started) / flushes * 1e6
+
+        weeks = [("bench", date(2024, 1, 1) + timedelta(days=7 * i)) for i in range(days // 7)]
+        months = [("bench", 2024 + i // 12, i % 12 + 1) for i in range(max(1, days // 31))]
+        week_ms = per_call_ms(rollups.week, weeks)
+        month_ms = per_call_ms(rollups.month, months)
+        year = rollups.summary("bench", date(2024, 1, 1), date(2024, 1, 1) + timedelta(days=days))
+        rollups.close()
+        size = os.path.getsize(path)
+
+    print(f"{days} days, {flushes} captures: {flush_us:.0f} us per capture to keep the rollups current, "
+          f"store {size / 1024:.0f} KiB")
+    print(f"week summary {week_ms:.2f} ms, month summary {month_ms:.2f} ms")
+    print(f"year: {year['active_seconds'] / 3600:.0f} h active, {year['idle_seconds'] / 3600:.0f} h idle, "
+          f"{year['captures']} captures, {year['bytes_uploaded'] / 1024 ** 2:.0f} MiB uploaded")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--capture-interval", type=int, default=300, help="seconds between captures")
+    args = parser.parse_args()
+    run(args.days, args.capture_interval)
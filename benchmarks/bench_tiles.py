@@ -0,0 +1,99 @@
+"""
+Bandwidth saved by tile-delta encoding on screen-like workloads.
+
+Every delta is rebuilt with the reconstruction utility and checked against
+the original frame:
+
+    python -m benchmarks.bench_tiles [--frames 20] [--keyframe-interval 10]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.frames import synthetic_frame
+from src.argus.screenshot.grabber import Frame
+from src.argus.screenshot.png import write_png
+from src.argus.screenshot.tiles import TileDeltaEncoder, reconstruct, tile_metadata
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+def paint(frame: Frame, x: int, y: int, width: int, height: int, seed: int):
+    """Overwrite a rectangle with fresh 'text'"""
+    rng = random.Random(seed)
+    stride = frame.width * 4
+    for row in range(height):
+        line = bytes(rng.choice((20, 230)) for _ in range(width)) if row % 18 < 11 else bytes([230]) * width
+        pixels = bytearray(width * 4)
+        pixels[0::4] = pixels[1::4] = pixels[2::4] = line
+        pixels[3::4] = b"\xff" * width
+        offset = (y + row) * stride + x * 4
+        frame.raw[offset:offset + width * 4] = pixels
+
+
+def terminal(base: Frame, step: int) -> Frame:
+    """A terminal pane in the bottom-right corner keeps printing"""
+    frame = Frame(bytearray(base.raw), base.width, base.height)
+    paint(frame, 1200, 600, 700, 460, seed=step)
+    return frame
+
+
+def chat(base: Frame, step: int) -> Frame:
+    """A chat window gets one new message per capture"""
+    frame = Frame(bytearray(base.raw), base.width, base.height)
+    for message in range(step % 8 + 1):
+        paint(frame, 40, 900 - message * 60, 500, 40, seed=message)
+    return frame
+
+
+def clock(base: Frame, step: int) -> Frame:
+    """Only the taskbar clock changes"""
+    frame = Frame(bytearray(base.raw), base.width, base.height)
+    paint(frame, 1820, 1050, 90, 24, seed=step)
+    return frame
+
+
+def window_switch(base: Frame, step: int) -> Frame:
+    """Worst case: a different full-screen window every capture"""
+    return synthetic_frame(WIDTH, HEIGHT, seed=step + 100)
+
+
+WORKLOADS = {"terminal": terminal, "chat": chat, "clock": clock, "window switch": window_switch}
+
+
+def run(frame_count: int, keyframe_interval: int, tile_size: int):
+    print(f"{'workload':<16}{'full PNG bytes':>16}{'delta bytes':>14}{'saved':>8}{'diff ms/frame':>15}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, workload in WORKLOADS.items():
+            base = synthetic_frame(WIDTH, HEIGHT, seed=1)
+            encoder = TileDeltaEncoder(tile_size=tile_size, keyframe_interval=keyframe_interval)
+            full_bytes = delta_bytes = 0
+            diff_seconds = 0.0
+
+            for step in range(frame_count):
+                frame = workload(base, step)
+                full_bytes += write_png(frame.rgb, frame.size, os.path.join(workdir, "full.png"))
+
+                started = time.perf_counter()
+                encoded, meta = encoder.process(frame, f"frame{step}.png")
+                diff_seconds += time.perf_counter() - started
+
+                path = os.path.join(workdir, f"frame{step}.png")
+                delta_bytes += write_png(encoded.rgb, encoded.size, path, text=tile_metadata(meta))
+                if reconstruct(path)[2] != frame.rgb:
+                    raise AssertionError(f"{name}: frame {step} did not reconstruct exactly")
+
+            saved = 1 - delta_bytes / full_bytes
+            print(f"{name:<16}{full_bytes:>16,}{delta_bytes:>14,}{saved:>8.0%}"
+                  f"{diff_seconds / frame_count * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--keyframe-interval", type=int, default=10)
+    parser.add_argument("--tile-size", type=int, default=64)
+    args = parser.parse_args()
+    run(args.frames, args.keyframe_interval, args.tile_size)
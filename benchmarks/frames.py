@@ -0,0 +1,39 @@
+import random
+
+from src.argus.screenshot.grabber import Frame
+
+
+def synthetic_frame(width: int, height: int, seed: int = 0, windows: int = 6) -> Frame:
+    """Screen-like BGRA frame: flat desktop, a few windows with rows of 'text'"""
+    rng = random.Random(seed)
+    stride = width * 4
+    background = bytes((rng.randrange(30, 70), rng.randrange(30, 70), rng.randrange(30, 70), 255))
+    raw = bytearray(background * (width * height))
+
+    for _ in range(windows):
+        win_w = rng.randrange(width // 5, width // 2)
+        win_h = rng.randrange(height // 5, height // 2)
+        x = rng.randrange(0, width - win_w)
+        y = rng.randrange(0, height - win_h)
+        paper = bytes((rng.randrange(200, 255),) * 3 + (255,))
+        ink = bytes((rng.randrange(0, 60),) * 3 + (255,))
+
+        # One "line of text" is a run of ink/paper spans; reuse it for every text row
+        text_row = bytearray()
+        while len(text_row) < win_w * 4:
+            text_row += ink * rng.randrange(1, 4) + paper * rng.randrange(2, 10)
+        text_row = bytes(text_row[:win_w * 4])
+        blank_row = paper * win_w
+
+        for row in range(win_h):
+            offset = (y + row) * stride + x * 4
+            raw[offset:offset + win_w * 4] = text_row if row % 18 < 11 else blank_row
+
+    return Frame(raw, width, height)
+
+
+def place(frame: Frame, monitor: dict) -> Frame:
+    """Attach a monitor position to a frame"""
+    frame.left = monitor["left"]
+    frame.top = monitor["top"]
+    return frame
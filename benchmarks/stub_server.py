@@ -0,0 +1,264 @@
+"""
+Local stand-in for the activity API, counting requests and uploaded items.
+
+Implements login.php, store_activity.php and, unless --no-batch is given,
+store_activity_batch.php with the same JSON replies as the real server.
+A record whose idempotency key was already stored is acknowledged again
+but not counted, so work_seconds shows what the server would total.
+--link-kbps simulates a slow uplink shared by all connections, --latency-ms
+delays every reply and --error-rate answers that share of requests with a 503:
+
+    python -m benchmarks.stub_server [--port 8765] [--no-batch] [--link-kbps 256] [--latency-ms 200] [--error-rate 0.05]
+"""
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+from src.argus.api.ratelimit import TokenBucket
+
+
+def parse_multipart(content_type: str, body: bytes) -> dict:
+    """Form fields -> text value, or bytes for file parts"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True)
+        fields[name] = payload if part.get_filename() else payload.decode("utf-8")
+    return fields
+
+
+class StubStats:
+    """What the stub server has received so far"""
+
+    def __init__(self):
+        self.requests = 0
+        self.items = 0
+        self.screenshots = 0
+        self.bytes_received = 0
+        self.logins = 0
+        self.errors_injected = 0
+        self.duplicates = 0
+        self.work_seconds = 0.0
+        # Capture times of the stored records, as the server would sort them
+        self.captured_at = []
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def record(self, items: int, screenshots: int, size: int):
+        with self._lock:
+            self.requests += 1
+            self.items += items
+            self.screenshots += screenshots
+            self.bytes_received += size
+
+    def count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def store(self, key, work_seconds, captured_at=None) -> bool:
+        """Count a record's seconds unless its idempotency key was seen before; False for a duplicate"""
+        with self._lock:
+            if key:
+                if key in self._keys:
+                    self.duplicates += 1
+                    return False
+                self._keys.add(key)
+            self.work_seconds += float(work_seconds or 0)
+            if captured_at is not None:
+                self.captured_at.append(float(captured_at))
+            return True
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "items": self.items,
+                "screenshots": self.screenshots,
+                "bytes_received": self.bytes_received,
+                "logins": self.logins,
+                "errors_injected": self.errors_injected,
+                "duplicates": self.duplicates,
+                "work_seconds": self.work_seconds,
+                "requests_per_item": self.requests / self.items if self.items else 0.0,
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ArgusStub/1.0"
+
+    def setup(self):
+        super().setup()
+        if self.server.link is not None:
+            # Small receive buffer so a slow simulated link pushes back on the client quickly
+            self.request.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 64 * 1024)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        if self.server.link is None:
+            return self.rfile.read(length)
+        # Simulated uplink shared by all connections, like a real access link
+        parts = []
+        while length > 0:
+            chunk = self.rfile.read(min(16 * 1024, length))
+            if not chunk:
+                break
+            self.server.link.acquire(len(chunk))
+            parts.append(chunk)
+            length -= len(chunk)
+        return b"".join(parts)
+
+    def do_POST(self):
+        body = self._read_body()
+        path = self.path.rsplit("/", 1)[-1]
+        if self.server.latency > 0:
+            time.sleep(self.server.latency)
+        if self.server.error_rate > 0 and random.random() < self.server.error_rate:
+            # Injected failure: nothing is stored, like a crashed PHP worker
+            self.server.stats.count("errors_injected")
+            self._reply(503, {"success": False, "message": "Service unavailable"})
+            return
+        if path == "login.php":
+            self._login(body)
+        elif path == "store_activity.php":
+            self._store_single(body)
+        elif path == "store_activity_batch.php" and self.server.batch:
+            self._store_batch(body)
+        else:
+            self.server.stats.record(0, 0, len(body))
+            self._reply(404, {"success": False, "message": "Not found"})
+
+    def _fields(self, body: bytes) -> dict:
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            return parse_multipart(content_type, body)
+        return dict(parse_qsl(body.decode("utf-8")))
+
+    def _login(self, body: bytes):
+        credentials = json.loads(body or b"{}")
+        self.server.stats.count("logins")
+        login_id = str(credentials.get("login_id", ""))
+        if not login_id or not credentials.get("password"):
+            self._reply(200, {"success": False, "message": "Invalid credentials"})
+            return
+        self._reply(200, {"success": True, "message": "Login successful",
+                          "employee": {"id": login_id, "name": f"Employee {login_id}"}})
+
+    def _store_single(self, body: bytes):
+        fields = self._fields(body)
+        screenshots = 1 if isinstance(fields.get("screenshot"), bytes) else 0
+        key = fields.get("idempotency_key") or self.headers.get("Idempotency-Key")
+        stored = self.server.stats.store(key, fields.get("time_between_screenshots_sec"), fields.get("captured_at"))
+        self.server.stats.record(1, screenshots, len(body))
+        self._reply(200, self._stored(stored))
+
+    def _store_batch(self, body: bytes):
+        fields = self._fields(body)
+        records = json.loads(fields.get("records", "[]"))
+        results = []
+        screenshots = 0
+        for record in records:
+            name = record.get("screenshot")
+            if name is not None and not isinstance(fields.get(name), bytes):
+                results.append({"success": False, "message": f"Missing file part {name}"})
+                continue
+            screenshots += name is not None
+            stored = self.server.stats.store(record.get("idempotency_key"), record.get("time_between_screenshots_sec"),
+                                             record.get("captured_at"))
+            results.append(self._stored(stored))
+        self.server.stats.record(len(records), screenshots, len(body))
+        self._reply(200, {"success": True, "message": f"{len(records)} activities stored", "results": results})
+
+    @staticmethod
+    def _stored(stored: bool) -> dict:
+        if stored:
+            return {"success": True, "message": "Activity stored"}
+        return {"success": True, "duplicate": True, "message": "Activity already stored"}
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """Runs the stub API on a background thread; use as a context manager"""
+
+    def __init__(self, port: int = 0, batch: bool = True, link_bytes_per_sec: float = 0,
+                 latency: float = 0.0, error_rate: float = 0.0):
+        """
+        Args:
+            link_bytes_per_sec: > 0 simulates an uplink of that speed shared by all clients
+            latency: seconds added before every reply
+            error_rate: share of requests (0..1) answered with a 503
+        """
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.batch = batch
+        self.httpd.latency = latency
+        self.httpd.error_rate = error_rate
+        self.httpd.link = TokenBucket(link_bytes_per_sec, burst=32 * 1024) if link_bytes_per_sec > 0 else None
+        self.httpd.stats = StubStats()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> StubStats:
+        return self.httpd.stats
+
+    def reset_stats(self):
+        self.httpd.stats = StubStats()
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="argus-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-batch", action="store_true", help="answer 404 on the batch endpoint")
+    parser.add_argument("--link-kbps", type=float, default=0, help="simulated uplink speed in KiB/s (0 = unlimited)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every reply")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of requests answered with a 503")
+    args = parser.parse_args()
+    server = StubServer(args.port, batch=not args.no_batch, link_bytes_per_sec=args.link_kbps * 1024,
+                        latency=args.latency_ms / 1000, error_rate=args.error_rate)
+    print(f"Stub activity API on {server.url}/ (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(server.stats.as_dict())
+        server.httpd.server_close()
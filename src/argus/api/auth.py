@@ -1,20 +1,23 @@
 import sys
 
 import requests
+from src.argus.api.transport import transport
 from src.argus.exceptions import CustomException
 
 
 class AuthAPI:
-    BASE_URL = "https://sggsapp.co.in/etracker"
+    BASE_URL = transport.base_url
+    # Interactive calls: the user is waiting, so give up on the read sooner than uploads do
+    TIMEOUT = (transport.timeout[0], 10)
 
     @classmethod
     def login(cls, login_id: str, password: str) -> dict:
         """Handle user login"""
         try:
-            response = requests.post(
-                f"{cls.BASE_URL}/login.php",
+            response = transport.post(
+                "login.php",
                 json={"login_id": login_id, "password": password},
-                timeout=10
+                timeout=cls.TIMEOUT
             )
             data = response.json()
             if not data.get('success'):
@@ -27,10 +30,10 @@ class AuthAPI:
     def register(cls, user_data: dict) -> dict:
         """Handle new user registration"""
         try:
-            response = requests.post(
-                f"{cls.BASE_URL}/register.php",
+            response = transport.post(
+                "register.php",
                 json=user_data,
-                timeout=10
+                timeout=cls.TIMEOUT
             )
             data = response.json()
             if not data.get('success'):
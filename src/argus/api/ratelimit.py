@@ -0,0 +1,157 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from src.argus.logger import logging
+
+# Upload priorities: the capture that was just taken goes ahead of the backlog
+LIVE = 0
+BACKLOG = 1
+
+
+class TokenBucket:
+    """
+    Byte-rate limiter for the upload path.
+
+    Tokens (bytes) refill at `rate` bytes per second up to `burst`. Senders
+    call acquire() before writing each chunk of a request body. A LIVE
+    sender waiting for tokens is always served before BACKLOG senders, so
+    the freshest capture is not stuck behind a reconnect drain.
+
+    With adaptive=True the rate follows the link: the bytes actually sent
+    during each adapt_window seconds of continuous sending estimate the link
+    capacity, and the rate is set to `headroom` times that estimate so calls
+    keep part of the uplink. Because a limited sender can't see spare
+    capacity, every probe_every windows one window runs at probe_gain times
+    the estimate to find out whether the link got faster.
+    """
+
+    def __init__(self, rate: float = 0, burst: int = 256 * 1024, adaptive: bool = False,
+                 min_rate: float = 32 * 1024, max_rate: float = 0, headroom: float = 0.8,
+                 adapt_window: float = 2.0, probe_every: int = 10, probe_gain: float = 1.25):
+        """
+        Args:
+            rate: bytes per second; 0 disables limiting (in adaptive mode, the starting rate)
+            burst: bucket size in bytes (also the largest single acquire)
+            adaptive: adjust the rate to the measured link throughput
+            min_rate / max_rate: bounds for adaptive mode (max_rate 0 = unbounded)
+            headroom: share of the estimated link capacity uploads may use
+        """
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.adaptive = adaptive
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.headroom = headroom
+        self.adapt_window = adapt_window
+        self.probe_every = max(1, int(probe_every))
+        self.probe_gain = probe_gain
+        self.capacity = 0.0
+        self._probing = True  # The configured rate is the first probe
+        self._windows_since_probe = 0
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._waiting = [0, 0]
+        self._active = 0
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._window_busy = False
+        self.bytes_sent = 0
+        self.wait_seconds = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, nbytes: int, priority: int = BACKLOG):
+        """Block until nbytes may be sent"""
+        if not self.enabled:
+            self.bytes_sent += nbytes
+            return
+        while nbytes > 0:
+            # A chunk bigger than the bucket is taken in bucket-sized slices
+            part = min(nbytes, self.burst)
+            self._take(part, priority)
+            nbytes -= part
+
+    def _take(self, nbytes: int, priority: int):
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    ahead = any(self._waiting[p] for p in range(priority))
+                    if not ahead and self._tokens >= nbytes:
+                        self._tokens -= nbytes
+                        break
+                    deficit = nbytes - self._tokens
+                    self._cond.wait(deficit / self.rate if deficit > 0 and not ahead else 0.05)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+            self.bytes_sent += nbytes
+            self.wait_seconds += time.monotonic() - started
+            self._window_bytes += nbytes
+            if self.adaptive:
+                self._adapt()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    @contextmanager
+    def sending(self):
+        """Wrap one request body so adaptive mode knows when the uplink is busy"""
+        with self._cond:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                if self._active == 0:
+                    # An idle gap says nothing about the link; don't judge this window
+                    self._window_busy = False
+
+    def _adapt(self):
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.adapt_window:
+            return
+        if self._window_busy:
+            achieved = self._window_bytes / elapsed
+            previous = self.rate
+            if self._probing or achieved < self.rate * 0.9:
+                # A probe measures the link; falling short of the rate means the link got slower
+                self.capacity = achieved
+            self._windows_since_probe += 1
+            self._probing = self._windows_since_probe >= self.probe_every
+            if self._probing:
+                self._windows_since_probe = 0
+                self.rate = self.capacity * self.probe_gain
+            else:
+                self.rate = self.capacity * self.headroom
+            self.rate = max(self.min_rate, min(self.rate, self.max_rate) if self.max_rate else self.rate)
+            if abs(self.rate - previous) >= 1024:
+                logging.info(f"Upload rate adjusted {previous / 1024:.0f} -> {self.rate / 1024:.0f} KiB/s "
+                             f"(achieved {achieved / 1024:.0f} KiB/s, probing={self._probing})")
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_busy = self._active > 0
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return {
+                "rate_bytes_per_sec": self.rate,
+                "burst_bytes": self.burst,
+                "adaptive": self.adaptive,
+                "capacity_estimate": self.capacity,
+                "bytes_sent": self.bytes_sent,
+                "wait_seconds": self.wait_seconds,
+                "waiting_live": self._waiting[LIVE],
+                "waiting_backlog": self._waiting[BACKLOG],
+            }
@@ -0,0 +1,151 @@
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+
+from src.argus.logger import logging
+
+# HTTP statuses worth another attempt: throttling and transient server-side failures
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a random time in
+    [0, min(max_delay, base_delay * 2^n)], so clients that failed together
+    do not retry together.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.attempts = max(1, int(attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to sleep before retry number `attempt` (0-based); honours a server Retry-After"""
+        if retry_after is not None:
+            return min(self.max_delay, max(0.0, retry_after))
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def is_retryable(response: Optional[requests.Response] = None, error: Optional[Exception] = None) -> bool:
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response is not None and response.status_code in RETRYABLE_STATUSES
+
+    @staticmethod
+    def retry_after(response: Optional[requests.Response]) -> Optional[float]:
+        """Retry-After header in seconds, when the server sent one"""
+        if response is None:
+            return None
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Stops calling a backend that keeps failing.
+
+    closed: requests flow; failure_threshold failures in a row open the circuit.
+    open: requests are refused until reset_timeout has passed.
+    half_open: a single probe request is let through; success closes the
+    circuit, failure re-opens it with the timeout doubled (up to max_reset_timeout).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_reset_timeout: float = 300.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    @property
+    def probing(self) -> bool:
+        """True while the half-open probe request is out"""
+        with self._lock:
+            return self._probe_in_flight
+
+    def is_available(self) -> bool:
+        """Whether a request could go out now (does not take the half-open probe slot)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                return time.monotonic() - self._opened_at >= self.reset_timeout
+            return not self._probe_in_flight
+
+    def allow_request(self) -> bool:
+        """Claim permission to send one request"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                logging.info("Circuit breaker half-open, probing the server")
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logging.info("Circuit breaker closed, server is responding again")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+            self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN:
+                self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+                self._open()
+            elif self._state == self.CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logging.warning(f"Circuit breaker open after {self._failures} failure(s), "
+                        f"pausing requests for {self.reset_timeout:.0f}s")
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)) if state == self.OPEN else 0.0
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "retry_in_sec": retry_in,
+            }
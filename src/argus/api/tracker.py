@@ -1,42 +1,166 @@
+import json
 import sys
+import threading
+import time
 
 import requests
-import requests.adapters
 import os
+from typing import List, Optional
+from urllib.parse import urlparse
 
+from src.argus.api.ratelimit import BACKLOG, LIVE, TokenBucket
+from src.argus.api.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from src.argus.api.transport import MultipartBody, Transport, transport as shared_transport
 from src.argus.exceptions import CustomException
 from src.argus.logger import logging
+from src.argus.settings import settings
+from src.argus.utils.connectivity import ConnectivityMonitor, connectivity, create_monitor
 
 class ActivityTrackerAPI:
-    def __init__(self, base_url="https://sggsapp.co.in/etracker"):
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.retry = requests.adapters.HTTPAdapter(max_retries=3)
-        self.session.mount('http://', self.retry)
-        self.session.mount('https://', self.retry)
-        self.session.headers.update({
-            "User-Agent": "Argus Productivity Tracker/1.0",
-            "Accept": "application/json"
-        })
-
-    def upload_activity(self, employee_id: str, screenshot_path: str, work_seconds: int) -> bool:
-        """Upload activity data to the API"""
+    def __init__(self, base_url: Optional[str] = None, transport: Optional[Transport] = None,
+                 monitor: Optional[ConnectivityMonitor] = None):
+        """
+        Args:
+            base_url: server to talk to, the configured one by default
+            transport: HTTP transport, the shared pooled one by default
+            monitor: connectivity monitor fed by this client's requests; the app-wide one for the
+                shared transport, a private one for any other server
+        """
+        # The shared pooled transport unless a different server (e.g. a local stub) is asked for
+        if transport is None:
+            transport = shared_transport if base_url is None else Transport(base_url)
+        self.transport = transport
+        self.base_url = transport.base_url
+        self.session = transport.session
+        target = urlparse(self.base_url)
+        port = target.port or (443 if target.scheme == "https" else 80)
+        if monitor is None:
+            # Only the app's own client drives the app-wide monitor
+            monitor = connectivity if transport is shared_transport else create_monitor()
+        self.connectivity = monitor
+        self.connectivity.set_target(target.hostname, port)
+        # None until a probe request tells us whether the server has the batch endpoint
+        self.batch_supported = None
+        self._batch_probe_lock = threading.Lock()
+        self.retry_policy = RetryPolicy(
+            attempts=settings.get("api", "retry_attempts", 3),
+            base_delay=settings.get("api", "retry_base_sec", 0.5),
+            max_delay=settings.get("api", "retry_max_sec", 8.0),
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.get("api", "breaker_threshold", 5),
+            reset_timeout=settings.get("api", "breaker_reset_sec", 30.0),
+            max_reset_timeout=settings.get("api", "breaker_max_reset_sec", 300.0),
+        )
+        self.limiter = TokenBucket(
+            rate=settings.get("bandwidth", "limit_bytes_per_sec", 0),
+            burst=settings.get("bandwidth", "burst_bytes", 256 * 1024),
+            adaptive=settings.get("bandwidth", "adaptive", False),
+            min_rate=settings.get("bandwidth", "min_bytes_per_sec", 32 * 1024),
+            max_rate=settings.get("bandwidth", "max_bytes_per_sec", 0),
+            headroom=settings.get("bandwidth", "headroom", 0.8),
+        )
+
+    def is_available(self) -> bool:
+        """False while the circuit breaker is open: callers should queue instead of sending"""
+        return self.breaker.is_available()
+
+    def get_status(self) -> dict:
+        """Circuit breaker and bandwidth limiter state for the UI and session info"""
+        status = self.breaker.snapshot()
+        status["bandwidth"] = self.limiter.get_stats()
+        return status
+
+    def prewarm(self):
+        """Open the upload connection in the background before the first capture is sent"""
+        self.transport.prewarm()
+
+    def _post(self, endpoint: str, data: Optional[dict] = None, body: Optional[MultipartBody] = None,
+              priority: int = LIVE, headers: Optional[dict] = None) -> requests.Response:
+        """
+        POST with retries (exponential backoff with jitter) behind the circuit breaker.
+        Raises CircuitOpenError without touching the network while the circuit is open.
+        Multipart bodies are paced by the bandwidth limiter at the given priority.
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open, not calling {endpoint}")
+        if body is not None and self.limiter.enabled:
+            body.throttle = lambda size: self.limiter.acquire(size, priority)
+            with self.limiter.sending():
+                return self._send(endpoint, data, body, headers)
+        return self._send(endpoint, data, body, headers)
+
+    def _send(self, endpoint: str, data: Optional[dict], body: Optional[MultipartBody],
+              headers: Optional[dict]) -> requests.Response:
+        """The retry loop of _post(); feeds the circuit breaker and the connectivity monitor"""
+        # A half-open probe gets a single attempt: it only has to tell whether the server is back
+        attempts = 1 if self.breaker.probing else self.retry_policy.attempts
+        response = None
+        for attempt in range(attempts):
+            if attempt:
+                delay = self.retry_policy.delay(attempt - 1, self.retry_policy.retry_after(response))
+                logging.warning(f"Retrying {endpoint} in {delay:.1f}s (attempt {attempt + 1}/{attempts})")
+                time.sleep(delay)
+            try:
+                # A MultipartBody re-reads its files from the start on every attempt
+                response = self.transport.post(endpoint, data=data, body=body, headers=headers)
+                self.connectivity.report_success()
+            except requests.RequestException as e:
+                if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                    self.connectivity.report_failure()
+                if not self.retry_policy.is_retryable(error=e) or attempt == attempts - 1:
+                    self.breaker.record_failure()
+                    raise
+                response = None
+                continue
+            except Exception:
+                # Not the server's fault (e.g. an unreadable file), but the probe slot must be released
+                self.breaker.record_failure()
+                raise
+            if not self.retry_policy.is_retryable(response=response):
+                break
+
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def upload_activity(self, employee_id: str, screenshot_path: Optional[str], work_seconds: int,
+                        content_hash: Optional[str] = None, priority: int = LIVE,
+                        idempotency_key: Optional[str] = None, captured_at: Optional[float] = None) -> bool:
+        """
+        Upload activity data to the API (screenshot_path=None sends the time record only)
+        priority: LIVE for the capture just taken, BACKLOG for queued ones (bandwidth scheduling)
+        idempotency_key: same key on every retry, so the server stores the record (and its seconds) once
+        captured_at: capture time (epoch seconds); uploads may arrive out of order, the server sorts by this
+        """
         try:
-            if not os.path.exists(screenshot_path):
-                logging.error(f"Screenshot file not found: {screenshot_path}")
-                return False
-
-            with open(screenshot_path, 'rb') as f:
-                response = self.session.post(
-                    f"{self.base_url}/store_activity.php",
-                    files={'screenshot': f},
-                    data={
-                        'employee_id': employee_id,
-                        'time_between_screenshots_sec': work_seconds,
-                        'keyboard_clicks': "0",  # Placeholder
-                        'mouse_px_travel': "0",   # Placeholder
-                    }
-                )
+            data = {
+                'employee_id': employee_id,
+                'time_between_screenshots_sec': work_seconds,
+                'keyboard_clicks': "0",  # Placeholder
+                'mouse_px_travel': "0",   # Placeholder
+            }
+            if screenshot_path is not None and content_hash:
+                # Lets the server verify the file arrived intact
+                data['screenshot_sha256'] = content_hash
+            headers = None
+            if idempotency_key:
+                data['idempotency_key'] = idempotency_key
+                headers = {'Idempotency-Key': idempotency_key}
+            if captured_at is not None:
+                data['captured_at'] = f"{captured_at:.3f}"
+
+            if screenshot_path is None:
+                response = self._post("store_activity.php", data=data, headers=headers)
+            else:
+                if not os.path.exists(screenshot_path):
+                    logging.error(f"Screenshot file not found: {screenshot_path}")
+                    return False
+
+                body = MultipartBody(data, [('screenshot', os.path.basename(screenshot_path), screenshot_path)])
+                response = self._post("store_activity.php", body=body, priority=priority, headers=headers)
 
             if response.status_code == 200:
                 result = response.json()
@@ -48,11 +172,145 @@ class ActivityTrackerAPI:
             else:
                 logging.error(f"API request failed: {response.status_code} - {response.text}")
 
+        except CircuitOpenError as e:
+            logging.warning(f"Upload deferred: {e}")
         except Exception as e:
             logging.error(f"API communication failed: {str(e)}")
             raise CustomException(e, sys)
 
         return False
 
+    def upload_batch(self, records: List[dict], max_batch_bytes: int = 8 * 1024 * 1024,
+                     priority: int = BACKLOG) -> List[bool]:
+        """
+        Upload several activity records, packing as many as fit under max_batch_bytes into each request.
+        Falls back to one upload_activity() call per record when the server has no batch endpoint.
+        Args:
+            records: dicts with employee_id, screenshot_path (or None), work_seconds and optional
+                content_hash, idempotency_key and captured_at
+            max_batch_bytes: cap on the screenshot bytes in one request (a larger screenshot goes alone)
+        Returns:
+            per-record success flags, in the order given
+        """
+        results = []
+        for batch in self._split_batches(records, max_batch_bytes):
+            if len(batch) == 1 or not self._has_batch_endpoint():
+                results.extend(self._upload_singly(batch, priority))
+                continue
+            batch_results = self._post_batch(batch, priority)
+            if batch_results is None:
+                results.extend(self._upload_singly(batch, priority))
+            else:
+                results.extend(batch_results)
+        return results
+
+    def _has_batch_endpoint(self) -> bool:
+        """
+        Whether the server has the batch endpoint, asked once with an empty manifest and no files
+        so that a server without it never receives a full batch. False while the answer is unknown.
+        """
+        if self.batch_supported is None:
+            # Concurrent drain workers wait for one probe instead of each sending their own
+            with self._batch_probe_lock:
+                if self.batch_supported is None:
+                    self._probe_batch_endpoint()
+        return bool(self.batch_supported)
+
+    def _probe_batch_endpoint(self):
+        try:
+            response = self._post("store_activity_batch.php", data={'records': "[]"})
+        except Exception as e:
+            logging.warning(f"Could not check for batch upload support: {e}")
+            return
+        if response.status_code in (404, 405, 501):
+            logging.warning("Server has no batch upload endpoint, falling back to single uploads")
+            self.batch_supported = False
+        elif response.status_code < 500:
+            self.batch_supported = True
+
+    def _upload_singly(self, records: List[dict], priority: int) -> List[bool]:
+        results = []
+        for record in records:
+            try:
+                results.append(self.upload_activity(
+                    employee_id=record['employee_id'],
+                    screenshot_path=record.get('screenshot_path'),
+                    work_seconds=record['work_seconds'],
+                    content_hash=record.get('content_hash'),
+                    priority=priority,
+                    idempotency_key=record.get('idempotency_key'),
+                    captured_at=record.get('captured_at')
+                ))
+            except CustomException:
+                results.append(False)
+        return results
+
+    @staticmethod
+    def _split_batches(records: List[dict], max_batch_bytes: int) -> List[List[dict]]:
+        batches, current, current_bytes = [], [], 0
+        for record in records:
+            path = record.get('screenshot_path')
+            size = os.path.getsize(path) if path is not None and os.path.exists(path) else 0
+            if current and current_bytes + size > max_batch_bytes:
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append(record)
+            current_bytes += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def _post_batch(self, records: List[dict], priority: int) -> Optional[List[bool]]:
+        """One multipart request for the whole batch; None if the server does not support batching"""
+        manifest = []
+        files = []
+        try:
+            for i, record in enumerate(records):
+                entry = {
+                    'employee_id': record['employee_id'],
+                    'time_between_screenshots_sec': record['work_seconds'],
+                    'keyboard_clicks': "0",  # Placeholder
+                    'mouse_px_travel': "0",   # Placeholder
+                }
+                if record.get('idempotency_key'):
+                    entry['idempotency_key'] = record['idempotency_key']
+                if record.get('captured_at') is not None:
+                    entry['captured_at'] = f"{record['captured_at']:.3f}"
+                path = record.get('screenshot_path')
+                if path is not None:
+                    if not os.path.exists(path):
+                        logging.error(f"Screenshot file not found: {path}")
+                        return [False] * len(records)
+                    entry['screenshot'] = f"screenshot_{i}"
+                    if record.get('content_hash'):
+                        entry['screenshot_sha256'] = record['content_hash']
+                    files.append((f"screenshot_{i}", os.path.basename(path), path))
+                manifest.append(entry)
+
+            # Files are streamed from disk while the request is sent, never held in memory together
+            body = MultipartBody({'records': json.dumps(manifest)}, files)
+            response = self._post("store_activity_batch.php", body=body, priority=priority)
+
+            if response.status_code in (404, 405, 501):
+                logging.warning("Server has no batch upload endpoint, falling back to single uploads")
+                self.batch_supported = False
+                return None
+            if response.status_code != 200:
+                logging.error(f"Batch upload failed: {response.status_code} - {response.text}")
+                return [False] * len(records)
+
+            result = response.json()
+            entries = result.get('results')
+            if not isinstance(entries, list) or len(entries) != len(records):
+                logging.error(f"Unexpected batch response: {result.get('message', result)}")
+                return [False] * len(records)
+            self.batch_supported = True
+            logging.info(f"Batch of {len(records)} activities uploaded")
+            return [bool(entry.get('success')) for entry in entries]
+
+        except Exception as e:
+            logging.error(f"Batch upload failed: {str(e)}")
+            return [False] * len(records)
+
 # Singleton instance
 api_client = ActivityTrackerAPI()
\ No newline at end of file
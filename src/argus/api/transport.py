@@ -0,0 +1,156 @@
+import os
+import threading
+import uuid
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+
+import requests
+import requests.adapters
+
+from src.argus.logger import logging
+from src.argus.settings import settings
+
+DEFAULT_BASE_URL = "https://sggsapp.co.in/etracker"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class MultipartBody:
+    """
+    multipart/form-data body that streams file parts from disk in
+    STREAM_CHUNK_SIZE pieces instead of building the whole request in memory.
+
+    It has a length, so requests sends a Content-Length header rather than
+    chunked encoding (which PHP backends often reject), and it can be iterated
+    more than once, so a retry re-sends the files from the start.
+    """
+
+    def __init__(self, fields: Optional[dict] = None,
+                 files: Optional[List[Tuple[str, str, Union[str, BinaryIO]]]] = None,
+                 throttle: Optional[Callable[[int], None]] = None):
+        """
+        Args:
+            fields: form field name -> text value
+            files: (field name, file name, path or binary file object) triples
+            throttle: called with each chunk's size before it is sent (bandwidth limiting)
+        """
+        self.boundary = uuid.uuid4().hex
+        self._fields = [(name, str(value)) for name, value in (fields or {}).items()]
+        self._files = list(files or [])
+        self.throttle = throttle
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _field_part(self, name: str, value: str) -> bytes:
+        return (f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n"
+                f"{value}\r\n").encode("utf-8")
+
+    def _file_header(self, name: str, filename: str) -> bytes:
+        return (f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; "
+                f"filename=\"{filename}\"\r\nContent-Type: application/octet-stream\r\n\r\n").encode("utf-8")
+
+    def _closing(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode("utf-8")
+
+    @staticmethod
+    def _file_size(source: Union[str, BinaryIO]) -> int:
+        if isinstance(source, str):
+            return os.path.getsize(source)
+        return os.fstat(source.fileno()).st_size
+
+    def __len__(self) -> int:
+        total = sum(len(self._field_part(name, value)) for name, value in self._fields)
+        for name, filename, source in self._files:
+            total += len(self._file_header(name, filename)) + self._file_size(source) + 2
+        return total + len(self._closing())
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._parts():
+            if self.throttle is not None:
+                self.throttle(len(chunk))
+            yield chunk
+
+    def _parts(self) -> Iterator[bytes]:
+        for name, value in self._fields:
+            yield self._field_part(name, value)
+        for name, filename, source in self._files:
+            yield self._file_header(name, filename)
+            if isinstance(source, str):
+                with open(source, "rb") as f:
+                    yield from self._read(f)
+            else:
+                source.seek(0)
+                yield from self._read(source)
+            yield b"\r\n"
+        yield self._closing()
+
+    @staticmethod
+    def _read(f: BinaryIO) -> Iterator[bytes]:
+        while True:
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+class Transport:
+    """
+    One pooled keep-alive HTTP session per API host, shared by the auth and
+    activity clients. Every request gets (connect, read) timeouts so a stalled
+    server can never hang a capture or UI thread.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, pool_connections: int = 2, pool_maxsize: int = 8,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        # Retries are done by the API client's retry policy, not urllib3
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                                max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Argus Productivity Tracker/1.0",
+            "Accept": "application/json",
+        })
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}/{endpoint}"
+
+    def post(self, endpoint: str, data=None, json=None, body: Optional[MultipartBody] = None,
+             timeout: Optional[Tuple[float, float]] = None, headers: Optional[dict] = None) -> requests.Response:
+        """POST form data, JSON or a streamed multipart body"""
+        timeout = timeout or self.timeout
+        headers = dict(headers or {})
+        if body is not None:
+            headers["Content-Type"] = body.content_type
+            return self.session.post(self.url(endpoint), data=body, timeout=timeout, headers=headers)
+        return self.session.post(self.url(endpoint), data=data, json=json, timeout=timeout, headers=headers)
+
+    def prewarm(self, wait: bool = False):
+        """
+        Open (and TLS-handshake) a pooled connection ahead of the first real
+        request, e.g. while the user is typing credentials.
+        """
+        def _warm():
+            try:
+                self.session.head(self.base_url + "/", timeout=self.timeout, allow_redirects=False)
+                logging.info(f"Connection to {self.base_url} pre-warmed")
+            except requests.RequestException as e:
+                logging.warning(f"Could not pre-warm connection to {self.base_url}: {e}")
+
+        if wait:
+            _warm()
+        else:
+            threading.Thread(target=_warm, name="argus-prewarm", daemon=True).start()
+
+
+# Singleton instance shared by AuthAPI and the activity client
+transport = Transport(
+    base_url=settings.get("http", "base_url", DEFAULT_BASE_URL),
+    pool_connections=settings.get("http", "pool_connections", 2),
+    pool_maxsize=settings.get("http", "pool_maxsize", 8),
+    connect_timeout=settings.get("http", "connect_timeout_sec", 5.0),
+    read_timeout=settings.get("http", "read_timeout_sec", 30.0),
+)
@@ -5,9 +5,10 @@ from datetime import datetime
 
 
 class FileManager:
-    def __init__(self, app_name="Argus"):
+    def __init__(self, app_name="Argus", base_dir=None):
         self.app_name = app_name
-        self.base_dir = self._get_base_dir()
+        # An explicit base_dir keeps e.g. benchmark clients out of the real data folder
+        self.base_dir = base_dir or self._get_base_dir()
 
     def _get_base_dir(self) -> str:
         """Returns OS-appropriate application data directory"""
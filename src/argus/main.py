@@ -1,3 +1,4 @@
+import multiprocessing
 import platform
 import sys
 
@@ -42,6 +43,9 @@ def check_platform():
 
 def main():
     """Main entry point using existing modules"""
+    # Needed by the process encoder in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+
     # Set global exception handler
     sys.excepthook = handle_exception
 
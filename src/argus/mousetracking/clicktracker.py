@@ -1,64 +1,136 @@
+import time
 from datetime import datetime
-from pynput import mouse
+from typing import Optional
 import threading
 from src.argus.logger import logging
 
 
 class ClickTracker:
-    def __init__(self, inactivity_threshold=1800):  # 30 minutes
+    """
+    Mouse activity monitor.
+
+    on_click runs on the pynput hook thread for every click, so it only
+    stores a timestamp and bumps a counter (plain attribute writes from a
+    single writer thread, no lock). Everything else happens on transitions:
+    callback(activity=True) on the first click after inactivity or a pause,
+    and callback(activity=False) once when the inactivity threshold passes.
+    Callbacks go through dispatcher(fn, *args), which the UI points at its
+    own thread (e.g. root.after). Listeners get the coalesced click counts
+    from the inactivity monitor every check_interval seconds.
+    """
+
+    def __init__(self, inactivity_threshold=1800, check_interval=10.0, clock=time.monotonic):  # 30 minutes
         self.is_paused = False
-        self.last_click_time = datetime.now()
         self.inactivity_threshold = inactivity_threshold
+        self.check_interval = check_interval
+        self.clock = clock
         self.callback = None
+        self.dispatcher = None
         self.listener = None
         self.monitor_activity = False
         self.ignore_next_clicks = 0
+        self.activity_listeners = []
+        self.state_listeners = []
+        # Updated on every click by the hook thread
+        self.last_activity = clock()
+        self.click_count = 0
+        # Set by the monitor when the threshold passes, cleared by the next click
+        self.is_idle = False
+        self.reported_clicks = 0
+        # Set while an activity callback is on its way, so a burst of clicks sends one
+        self._activity_pending = False
+        self._stopped = threading.Event()
 
     def on_click(self, x, y, button, pressed):
-        if pressed:
-            # Ignore clicks that are from UI interaction
-            if self.ignore_next_clicks > 0:
-                self.ignore_next_clicks -= 1
-                print(f"Ignoring UI click at {datetime.now()}")
-                return
+        if not pressed:
+            return
+        # Ignore clicks that are from UI interaction
+        if self.ignore_next_clicks > 0:
+            self.ignore_next_clicks -= 1
+            return
+
+        self.last_activity = self.clock()
+        self.click_count += 1
+        if (self.is_idle or self.is_paused) and not self._activity_pending:
+            self._activity_pending = True
+            self.is_idle = False
+            self._dispatch(True)
+
+    def _dispatch(self, activity: bool):
+        if self.callback is None:
+            self._activity_pending = False
+            return
+        if self.dispatcher is None:
+            self._deliver(activity)
+        else:
+            self.dispatcher(self._deliver, activity)
+
+    def _deliver(self, activity: bool):
+        try:
+            logging.debug(f"Mouse {'activity' if activity else 'inactivity'} detected")
+            self.callback(activity=activity)
+        finally:
+            if activity:
+                self._activity_pending = False
 
-            self.last_click_time = datetime.now()
-            print(f"Real mouse activity detected at {self.last_click_time}")
-            self.callback(activity=True)  # Notify of activity
+    def add_activity_listener(self, listener):
+        """Call listener(at, count) with the real (non-UI) clicks counted since the last check"""
+        self.activity_listeners.append(listener)
+
+    def add_state_listener(self, listener):
+        """Call listener(at, active, paused) on every inactivity check"""
+        self.state_listeners.append(listener)
 
     def start_monitoring(self):
+        # Imported here: pynput needs a display, and headless users (load tests) never start monitoring
+        from pynput import mouse
         self.listener = mouse.Listener(on_click=self.on_click)
         self.listener.start()
-        self.last_click_time = datetime.now()
+        self.reset_inactivity_timer()
         logging.info("ClickTracker started")
         self.monitor_activity = True
-        threading.Thread(target=self._monitor_inactivity, daemon=True).start()
+        self._stopped.clear()
+        threading.Thread(target=self._monitor_inactivity, name="argus-inactivity", daemon=True).start()
 
     def _monitor_inactivity(self):
         while self.monitor_activity:
-            time_since_last_click = (datetime.now() - self.last_click_time).total_seconds()
-            print(f"Time since last click {time_since_last_click}")
+            self.check()
+            if self._stopped.wait(self.check_interval):
+                break
 
-            # Only trigger inactivity if we're currently active
-            if (time_since_last_click > self.inactivity_threshold
-                    and self.callback
-                    and not self.is_paused):
-                print("Triggering inactivity callback")
-                self.callback(activity=False)
+    def check(self, now: Optional[datetime] = None):
+        """One inactivity check: hand the coalesced clicks to listeners and emit an idle transition"""
+        now = now or datetime.now()
+        seconds_idle = self.clock() - self.last_activity
+        active = seconds_idle <= self.inactivity_threshold
 
-            threading.Event().wait(10)
+        count = self.click_count
+        clicks, self.reported_clicks = count - self.reported_clicks, count
+        if clicks:
+            for listener in self.activity_listeners:
+                listener(now, clicks)
+        for listener in self.state_listeners:
+            listener(now, active, self.is_paused)
+
+        if not active and not self.is_idle:
+            self.is_idle = True
+            # Only trigger inactivity if we're currently active
+            if not self.is_paused:
+                logging.debug(f"No mouse activity for {seconds_idle:.0f}s")
+                self._dispatch(False)
 
     def ignore_ui_clicks(self, count=2):
         """Ignore next N clicks as they are from UI interaction"""
         self.ignore_next_clicks = count
-        print(f"Will ignore next {count} UI clicks")
+        logging.debug(f"Will ignore next {count} UI clicks")
 
     def reset_inactivity_timer(self):
-        """Reset the last click time to prevent immediate inactivity detection"""
-        self.last_click_time = datetime.now()
-        print(f"Inactivity timer reset at {self.last_click_time}")
+        """Reset the last activity time to prevent immediate inactivity detection"""
+        self.last_activity = self.clock()
+        self.is_idle = False
 
     def stop_monitoring(self):
         if self.listener:
             self.listener.stop()
-            self.monitor_activity = False
\ No newline at end of file
+            self.monitor_activity = False
+            self._stopped.set()
@@ -0,0 +1,190 @@
+import os
+import sys
+import threading
+import zlib
+from array import array
+from datetime import date, datetime
+from typing import Optional
+
+from src.argus.logger import logging
+
+MINUTES_PER_DAY = 24 * 60
+MAX_CLICKS = 0xFFFF
+
+# Per-minute state, as last reported by the inactivity monitor
+NO_DATA = 0
+ACTIVE = 1
+IDLE = 2
+PAUSED = 3
+
+_MAGIC = b"AHM1"
+_ZERO_CLICKS = array("H", bytes(2 * MINUTES_PER_DAY))
+_ZERO_STATES = array("B", bytes(MINUTES_PER_DAY))
+
+
+def minute_of_day(moment: datetime) -> int:
+    return moment.hour * 60 + moment.minute
+
+
+class DayHeatmap:
+    """
+    One day of activity in two fixed arrays of 1440 minute bins.
+
+    clicks counts real clicks per minute (saturating at 65535) and states
+    holds the minute's ACTIVE / IDLE / PAUSED state. That is 4320 bytes per
+    day however many events arrive. Updates index straight into the arrays,
+    so they allocate nothing.
+    """
+
+    __slots__ = ("day", "clicks", "states")
+
+    def __init__(self, day: date):
+        self.day = day
+        self.clicks = array("H", _ZERO_CLICKS)
+        self.states = array("B", _ZERO_STATES)
+
+    def reset(self, day: date):
+        """Reuse the arrays for another day"""
+        self.day = day
+        self.clicks[:] = _ZERO_CLICKS
+        self.states[:] = _ZERO_STATES
+
+    def to_bytes(self) -> bytes:
+        clicks = array("H", self.clicks)
+        if sys.byteorder == "big":
+            # Files are little-endian whatever machine wrote them
+            clicks.byteswap()
+        return _MAGIC + zlib.compress(clicks.tobytes() + self.states.tobytes())
+
+    def load_bytes(self, data: bytes):
+        """Fill the arrays from to_bytes() output; raises ValueError if it is not a heatmap"""
+        if not data.startswith(_MAGIC):
+            raise ValueError("not an activity heatmap")
+        try:
+            raw = zlib.decompress(data[len(_MAGIC):])
+        except zlib.error as e:
+            raise ValueError(f"corrupt activity heatmap: {e}")
+        if len(raw) != 3 * MINUTES_PER_DAY:
+            raise ValueError(f"activity heatmap has {len(raw)} bytes, expected {3 * MINUTES_PER_DAY}")
+        clicks = array("H")
+        clicks.frombytes(raw[:2 * MINUTES_PER_DAY])
+        if sys.byteorder == "big":
+            clicks.byteswap()
+        self.clicks[:] = clicks
+        self.states[:] = array("B", raw[2 * MINUTES_PER_DAY:])
+
+    def active_minutes(self) -> int:
+        return self.states.count(ACTIVE)
+
+
+class ActivityHeatmap:
+    """
+    Today's per-minute activity heatmap for the tracked user, saved as one
+    small binary file per day (<directory>/<user>/<YYYY-MM-DD>.heat).
+
+    ClickTracker's inactivity monitor feeds it: record_click() with the
+    clicks counted since its last check and record_check() with the
+    state. Only the current day is held in memory. At midnight it is
+    saved, and its arrays are cleared and reused for the new day, so memory
+    stays constant.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.user_id = ""
+        self.current = DayHeatmap(date.today())
+        self.saves = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _path(self, user_id: str, day: date) -> str:
+        return os.path.join(self.directory, str(user_id), f"{day.isoformat()}.heat")
+
+    def open(self, user_id: str):
+        """Switch to user_id and carry on with whatever was recorded for them today"""
+        self.save()
+        with self._lock:
+            self.user_id = str(user_id)
+            self.current.reset(date.today())
+            self._read_into(self.current, self._path(self.user_id, self.current.day))
+
+    def record_click(self, at: Optional[datetime] = None, count: int = 1):
+        at = at or datetime.now()
+        with self._lock:
+            self._roll_over(at)
+            minute = minute_of_day(at)
+            self.current.clicks[minute] = min(self.current.clicks[minute] + count, MAX_CLICKS)
+            self.current.states[minute] = ACTIVE
+            self._dirty = True
+
+    def record_check(self, at: datetime, active: bool, paused: bool):
+        """ClickTracker state listener"""
+        self.record_state(at, PAUSED if paused else ACTIVE if active else IDLE)
+
+    def record_state(self, at: datetime, state: int):
+        """Mark the minute of at; a click in the same minute keeps it ACTIVE"""
+        with self._lock:
+            self._roll_over(at)
+            minute = minute_of_day(at)
+            if self.current.clicks[minute] == 0 or state == PAUSED:
+                self.current.states[minute] = state
+                self._dirty = True
+
+    def _roll_over(self, at: datetime):
+        """Start a new day when at is past the current one (lock held)"""
+        day = at.date()
+        if day != self.current.day:
+            if day < self.current.day:
+                # Clock went back across midnight; keep writing into today
+                return
+            self._write(self.current)
+            self.current.reset(day)
+
+    def save(self):
+        """Write today's heatmap if anything changed since the last save"""
+        with self._lock:
+            if self._dirty:
+                self._write(self.current)
+
+    def _write(self, heatmap: DayHeatmap):
+        if not self.user_id:
+            return
+        path = self._path(self.user_id, heatmap.day)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(heatmap.to_bytes())
+            os.replace(path + ".tmp", path)
+            self._dirty = False
+            self.saves += 1
+        except OSError as e:
+            logging.warning(f"Could not save activity heatmap {path}: {e}")
+
+    @staticmethod
+    def _read_into(heatmap: DayHeatmap, path: str) -> bool:
+        try:
+            with open(path, "rb") as f:
+                heatmap.load_bytes(f.read())
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable activity heatmap {path}: {e}")
+            heatmap.reset(heatmap.day)
+            return False
+
+    def load(self, user_id: str, day: date) -> DayHeatmap:
+        """A saved day (empty if nothing was recorded); today comes from memory"""
+        with self._lock:
+            if str(user_id) == self.user_id and day == self.current.day:
+                heatmap = DayHeatmap(day)
+                heatmap.clicks[:] = self.current.clicks
+                heatmap.states[:] = self.current.states
+                return heatmap
+        heatmap = DayHeatmap(day)
+        self._read_into(heatmap, self._path(user_id, day))
+        return heatmap
+
+    def get_stats(self) -> dict:
+        return {"day": self.current.day.isoformat(), "active_minutes": self.current.active_minutes(),
+                "clicks": sum(self.current.clicks), "saves": self.saves}
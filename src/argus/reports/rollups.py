@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import sys
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.argus.exceptions import CustomException
+from src.argus.logger import logging
+
+# Counters kept per bin
+FIELDS = ("active_seconds", "idle_seconds", "captures", "capture_bytes", "uploads", "bytes_uploaded", "clicks")
+
+_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    user_id TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    active_seconds REAL NOT NULL DEFAULT 0,
+    idle_seconds REAL NOT NULL DEFAULT 0,
+    captures INTEGER NOT NULL DEFAULT 0,
+    capture_bytes INTEGER NOT NULL DEFAULT 0,
+    uploads INTEGER NOT NULL DEFAULT 0,
+    bytes_uploaded INTEGER NOT NULL DEFAULT 0,
+    clicks INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, bucket)
+);
+"""
+
+HOUR_FORMAT = "%Y-%m-%d %H:00"
+DAY_FORMAT = "%Y-%m-%d"
+
+
+def _hour_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def split_by_hour(start: datetime, end: datetime) -> Iterator[Tuple[datetime, float]]:
+    """(hour, seconds) pieces of [start, end), for spans that cross hour boundaries"""
+    while start < end:
+        boundary = _hour_start(start) + timedelta(hours=1)
+        piece_end = min(boundary, end)
+        yield _hour_start(start), (piece_end - start).total_seconds()
+        start = piece_end
+
+
+class ActivityRollups:
+    """
+    Incremental per-hour and per-day activity totals for reports.
+
+    Fed as things happen: TimeTracker events (active / paused time),
+    clicks, captures and uploads. Counts collect in memory and flush() adds
+    them to both the hourly and the daily table with one upsert per bin, so
+    the store only grows by one row per user and hour. A week or a month is
+    then a sum over at most 31 daily rows, with no rescan of screenshots or
+    logs. Local wall-clock hours are used, like everywhere else in the app.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.user_id = ""
+        self._pending: Dict[Tuple[str, datetime], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(FIELDS, 0))
+        # Ongoing time segment: "active" or "idle" since the given moment (None while not tracking)
+        self._state: Optional[str] = None
+        self._since: Optional[datetime] = None
+        self.flushes = 0
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_TABLE.format(name="hourly") + _TABLE.format(name="daily"))
+        except sqlite3.Error as e:
+            raise CustomException(e, sys)
+
+    def on_tracker_event(self, event: str, at: datetime):
+        """TimeTracker listener: running time counts as active, paused time as idle"""
+        with self._lock:
+            self._close_segment(at)
+            if event in ("start", "resume"):
+                self._state, self._since = "active", at
+            elif event == "pause":
+                self._state, self._since = "idle", at
+            else:
+                self._state, self._since = None, None
+        if event == "reset":
+            self.flush()
+
+    def record_click(self, at: Optional[datetime] = None, count: int = 1):
+        self._add(at, clicks=count)
+
+    def record_capture(self, size: int, at: Optional[datetime] = None):
+        self._add(at, captures=1, capture_bytes=size)
+
+    def record_upload(self, size: int, at: Optional[datetime] = None):
+        self._add(at, uploads=1, bytes_uploaded=size)
+
+    def _add(self, at: Optional[datetime], **amounts):
+        with self._lock:
+            counters = self._pending[(self.user_id, _hour_start(at or datetime.now()))]
+            for field, amount in amounts.items():
+                counters[field] += amount
+
+    def _close_segment(self, until: datetime):
+        """Move the ongoing segment's time up to `until` into the pending bins (lock held)"""
+        if self._state is None or until <= self._since:
+            return
+        field = f"{self._state}_seconds"
+        for hour, seconds in split_by_hour(self._since, until):
+            self._pending[(self.user_id, hour)][field] += seconds
+        self._since = until
+
+    def flush(self, now: Optional[datetime] = None):
+        """Write everything counted so far (including the ongoing segment) to the store"""
+        with self._lock:
+            self._close_segment(now or datetime.now())
+            pending, self._pending = self._pending, defaultdict(lambda: dict.fromkeys(FIELDS, 0))
+            if not pending:
+                return
+            daily = defaultdict(lambda: dict.fromkeys(FIELDS, 0))
+            for (user_id, hour), counters in pending.items():
+                day = daily[(user_id, hour.strftime(DAY_FORMAT))]
+                for field in FIELDS:
+                    day[field] += counters[field]
+            try:
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._upsert("hourly", [((u, h.strftime(HOUR_FORMAT)), c) for (u, h), c in pending.items()])
+                    self._upsert("daily", list(daily.items()))
+                self.flushes += 1
+            except sqlite3.Error as e:
+                logging.error(f"Could not save activity rollups: {e}")
+
+    def _upsert(self, table: str, rows: List[Tuple[Tuple[str, str], Dict[str, float]]]):
+        columns = ", ".join(FIELDS)
+        updates = ", ".join(f"{field} = {field} + excluded.{field}" for field in FIELDS)
+        self._conn.executemany(
+            f"INSERT INTO {table} (user_id, bucket, {columns}) VALUES (?, ?{', ?' * len(FIELDS)}) "
+            f"ON CONFLICT (user_id, bucket) DO UPDATE SET {updates}",
+            [(user_id, bucket, *(counters[field] for field in FIELDS)) for (user_id, bucket), counters in rows]
+        )
+
+    def hourly(self, user_id: str, start: datetime, end: datetime) -> List[dict]:
+        """Hour bins in [start, end) that have data, oldest first"""
+        self.flush()
+        return self._query("hourly", user_id, start.strftime(HOUR_FORMAT), end.strftime(HOUR_FORMAT))
+
+    def daily(self, user_id: str, start: date, end: date) -> List[dict]:
+        """Day bins in [start, end) that have data, oldest first"""
+        self.flush()
+        return self._query("daily", user_id, start.strftime(DAY_FORMAT), end.strftime(DAY_FORMAT))
+
+    def summary(self, user_id: str, start: date, end: date) -> dict:
+        """Totals over the days [start, end)"""
+        totals = dict.fromkeys(FIELDS, 0)
+        days = self.daily(user_id, start, end)
+        for row in days:
+            for field in FIELDS:
+                totals[field] += row[field]
+        totals["days_active"] = sum(1 for row in days if row["active_seconds"] > 0)
+        return totals
+
+    def week(self, user_id: str, day: Optional[date] = None) -> dict:
+        """Totals for the Monday-to-Sunday week containing day (default this week)"""
+        day = day or date.today()
+        monday = day - timedelta(days=day.weekday())
+        return self.summary(user_id, monday, monday + timedelta(days=7))
+
+    def month(self, user_id: str, year: int, month: int) -> dict:
+        first = date(year, month, 1)
+        following = date(year + month // 12, month % 12 + 1, 1)
+        return self.summary(user_id, first, following)
+
+    def _query(self, table: str, user_id: str, start: str, end: str) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT bucket, {', '.join(FIELDS)} FROM {table} "
+                f"WHERE user_id = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                (str(user_id), start, end)
+            ).fetchall()
+        return [dict(zip(("bucket",) + FIELDS, row)) for row in rows]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"pending_bins": len(self._pending), "flushes": self.flushes, "tracking": self._state}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
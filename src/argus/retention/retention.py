@@ -0,0 +1,378 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Iterator, Optional
+
+from src.argus.exceptions import CustomException
+from src.argus.logger import logging
+
+# Pillow is optional: without it "compact" falls back to deleting acknowledged files
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    uploaded_at REAL,
+    compacted INTEGER NOT NULL DEFAULT 0,
+    keyframe TEXT
+);
+CREATE INDEX IF NOT EXISTS files_uploaded ON files (uploaded_at);
+CREATE INDEX IF NOT EXISTS files_created ON files (created_at);
+CREATE TABLE IF NOT EXISTS evictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    evicted_at REAL NOT NULL,
+    uploaded INTEGER NOT NULL,
+    reason TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPLOADED_ACTIONS = ("delete", "compact", "keep")
+
+# Columns added after the first release of the index, with their definitions
+_MIGRATIONS = {
+    "keyframe": "TEXT",
+}
+
+
+class RetentionManager:
+    """
+    Keeps the screenshot folder within bounds.
+
+    Every file the capture pipeline writes is registered with its size, and
+    marked when the server acknowledges it. Each tick of the background
+    thread then works through at most batch_size files:
+      - acknowledged files older than grace_sec are deleted, or re-saved as
+        small JPEG thumbnails with uploaded_action="compact";
+      - while the folder is over quota_bytes, files are evicted oldest
+        first, acknowledged ones before anything still waiting for upload.
+        A tile keyframe that never reached the server is evicted together
+        with the deltas built on it, which could not be rebuilt without it.
+    Evicting a file that was never uploaded is logged and written to the
+    evictions table (its queued work seconds are still sent, without the
+    image). The index lives in SQLite, so nothing rescans the folder;
+    files from before the index existed are adopted by a walk that is also
+    spread over the ticks. Whether those were ever uploaded is unknown, so
+    they are adopted as not uploaded: only the quota can remove them, and
+    every such eviction is recorded.
+    """
+
+    def __init__(self, path: str, root: str, quota_bytes: int = 2 * 1024 ** 3, grace_sec: float = 24 * 3600,
+                 uploaded_action: str = "delete", batch_size: int = 200, interval_sec: float = 60.0,
+                 thumbnail_width: int = 480):
+        """
+        Args:
+            path: SQLite index file
+            root: screenshot folder (for adopting files written before the index existed)
+            quota_bytes: disk budget for screenshots; 0 disables the quota
+            grace_sec: how long acknowledged files are kept as they are
+            uploaded_action: "delete", "compact" (thumbnail, needs Pillow) or "keep" (quota only)
+            batch_size: most files handled per tick
+        """
+        if uploaded_action not in UPLOADED_ACTIONS:
+            logging.warning(f"Unknown retention action '{uploaded_action}', using 'delete'")
+            uploaded_action = "delete"
+        if uploaded_action == "compact" and Image is None:
+            logging.warning("Pillow is not installed, acknowledged screenshots will be deleted instead of compacted")
+            uploaded_action = "delete"
+        self.path = path
+        self.root = root
+        self.quota_bytes = int(quota_bytes)
+        self.grace_sec = grace_sec
+        self.uploaded_action = uploaded_action
+        self.batch_size = max(1, int(batch_size))
+        self.interval_sec = interval_sec
+        self.thumbnail_width = thumbnail_width
+        self.stats = {"deleted": 0, "compacted": 0, "evicted": 0, "evicted_not_uploaded": 0, "bytes_freed": 0,
+                      "adopted": 0}
+        self._adopter: Optional[Iterator[str]] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+            self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()[0]
+            adopted = self._conn.execute("SELECT value FROM meta WHERE key = 'adopted'").fetchone()
+        except sqlite3.Error as e:
+            raise CustomException(e, sys)
+        if adopted is None:
+            self._adopter = self._walk_untracked()
+
+    def track(self, filepath: str, size: Optional[int] = None, keyframe: Optional[str] = None):
+        """
+        Register a screenshot the pipeline has just written
+        keyframe: for a tile delta, the file name of the keyframe it was taken against
+        """
+        if size is None:
+            try:
+                size = os.path.getsize(filepath)
+            except OSError:
+                return
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM files WHERE path = ?", (filepath,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, created_at, keyframe) VALUES (?, ?, ?, ?)",
+                (filepath, size, time.time(), keyframe)
+            )
+            self.total_bytes += size - (previous[0] if previous else 0)
+
+    def mark_uploaded(self, filepath: Optional[str]):
+        """The server has acknowledged this screenshot; it may be removed after the grace period"""
+        if filepath is None:
+            return
+        with self._lock:
+            self._conn.execute("UPDATE files SET uploaded_at = ? WHERE path = ? AND uploaded_at IS NULL",
+                               (time.time(), filepath))
+
+    def forget(self, filepath: str):
+        """Drop a file deleted by someone else (e.g. backlog compaction) from the index"""
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM files WHERE path = ?", (filepath,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM files WHERE path = ?", (filepath,))
+            self.total_bytes -= row[0]
+
+    def start(self):
+        """Run ticks in the background (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="argus-retention", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(10)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_sec):
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.error(f"Retention pass failed: {e}")
+
+    def run_once(self, now: Optional[float] = None) -> dict:
+        """One tick: adopt, expire and enforce the quota, each bounded by batch_size; returns the counts"""
+        now = time.time() if now is None else now
+        before = dict(self.stats)
+        if self._adopter is not None:
+            self._adopt_some()
+        self._expire_uploaded(now)
+        self._enforce_quota(now)
+        return {key: self.stats[key] - before[key] for key in self.stats}
+
+    def _expire_uploaded(self, now: float):
+        if self.uploaded_action == "keep":
+            return
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, created_at FROM files WHERE uploaded_at IS NOT NULL AND uploaded_at <= ? "
+                "AND compacted = 0 ORDER BY uploaded_at LIMIT ?",
+                (now - self.grace_sec, self.batch_size)
+            ).fetchall()
+        for path, size, created_at in rows:
+            if self.uploaded_action == "compact":
+                self._compact(path, size, created_at)
+            else:
+                self._remove(path, size, created_at, uploaded=True, reason="expired", now=now)
+
+    def _enforce_quota(self, now: float):
+        if not self.quota_bytes:
+            return
+        handled = 0
+        while self.total_bytes > self.quota_bytes and handled < self.batch_size * 10:
+            # Acknowledged files go first; among each group, the oldest
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT path, size, created_at, uploaded_at IS NOT NULL FROM files "
+                    "ORDER BY uploaded_at IS NULL, created_at LIMIT ?",
+                    (self.batch_size,)
+                ).fetchall()
+            if not rows:
+                break
+            for path, size, created_at, uploaded in rows:
+                if self.total_bytes <= self.quota_bytes:
+                    break
+                handled += self._evict(path, size, created_at, bool(uploaded), now)
+
+    def _evict(self, path: str, size: int, created_at: float, uploaded: bool, now: float) -> int:
+        """Quota eviction of one file, plus the tile deltas of a keyframe the server never got; returns the count"""
+        if not self._remove(path, size, created_at, uploaded=uploaded, reason="quota", now=now):
+            return 0
+        if uploaded:
+            # The server has the keyframe, so the deltas still rebuild there
+            return 1
+        with self._lock:
+            dependents = self._conn.execute(
+                "SELECT path, size, created_at, uploaded_at IS NOT NULL FROM files WHERE keyframe = ?",
+                (os.path.basename(path),)
+            ).fetchall()
+        for dependent, dependent_size, dependent_created_at, dependent_uploaded in dependents:
+            self._remove(dependent, dependent_size, dependent_created_at, uploaded=bool(dependent_uploaded),
+                         reason="quota", now=now)
+        return 1 + len(dependents)
+
+    def _remove(self, path: str, size: int, created_at: float, uploaded: bool, reason: str, now: float) -> bool:
+        """Delete a file and its index entry; False if the file could not be deleted"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Could not delete screenshot {path}: {e}")
+            return False
+        self._remove_empty_dir(os.path.dirname(path))
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                if not self._conn.execute("DELETE FROM files WHERE path = ?", (path,)).rowcount:
+                    # Already removed along with its keyframe
+                    return True
+                if reason != "expired":
+                    self._conn.execute(
+                        "INSERT INTO evictions (path, size, created_at, evicted_at, uploaded, reason) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (path, size, created_at, now, int(uploaded), reason)
+                    )
+            self.total_bytes -= size
+            self.stats["bytes_freed"] += size
+            if reason == "expired":
+                self.stats["deleted"] += 1
+            else:
+                self.stats["evicted"] += 1
+                if not uploaded:
+                    self.stats["evicted_not_uploaded"] += 1
+        if not uploaded:
+            logging.warning(f"Disk quota reached: evicted screenshot that was not uploaded yet: {path}")
+        return True
+
+    def _compact(self, path: str, size: int, created_at: float):
+        """Replace an acknowledged screenshot by a small JPEG thumbnail next to it"""
+        thumbnail = os.path.splitext(path)[0] + ".thumb.jpg"
+        try:
+            with Image.open(path) as image:
+                image = image.convert("RGB")
+                image.thumbnail((self.thumbnail_width, self.thumbnail_width))
+                image.save(thumbnail, "JPEG", quality=50)
+            new_size = os.path.getsize(thumbnail)
+            os.remove(path)
+        except FileNotFoundError:
+            new_size = 0
+            thumbnail = None
+        except Exception as e:
+            logging.warning(f"Could not compact screenshot {path}: {e}")
+            return
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                if thumbnail is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO files (path, size, created_at, uploaded_at, compacted) "
+                        "VALUES (?, ?, ?, ?, 1)",
+                        (thumbnail, new_size, created_at, time.time())
+                    )
+            self.total_bytes += new_size - size
+            self.stats["compacted"] += 1
+            self.stats["bytes_freed"] += size - new_size
+
+    def _walk_untracked(self) -> Iterator[str]:
+        """Files under root, one directory listing at a time"""
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                yield os.path.join(directory, filename)
+
+    def _adopt_some(self):
+        """Register up to batch_size files written before the index existed"""
+        adopted = 0
+        for filepath in self._adopter:
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            # Not being queued proves nothing (older versions dropped failed uploads), so the upload
+            # state is unknown and the file is never expired. Thumbnails only exist for acknowledged files.
+            thumbnail = filepath.endswith(".thumb.jpg")
+            uploaded_at = stat.st_mtime if thumbnail else None
+            with self._lock:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO files (path, size, created_at, uploaded_at, compacted) VALUES (?, ?, ?, ?, ?)",
+                    (filepath, stat.st_size, stat.st_mtime, uploaded_at, int(thumbnail))
+                )
+                if cursor.rowcount:
+                    self.total_bytes += stat.st_size
+                    self.stats["adopted"] += 1
+            adopted += 1
+            if adopted >= self.batch_size:
+                return
+
+        self._adopter = None
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('adopted', ?)", (str(time.time()),))
+        if self.stats["adopted"]:
+            logging.info(f"Retention index now covers {self.stats['adopted']} older screenshot(s)")
+
+    def _migrate(self):
+        """Add columns to indexes created before they existed"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        for column, definition in _MIGRATIONS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE files ADD COLUMN {column} {definition}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS files_keyframe ON files (keyframe)")
+
+    def _remove_empty_dir(self, directory: str):
+        # Hourly folders are left behind once their last file is gone
+        if os.path.abspath(directory) == os.path.abspath(self.root):
+            return
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            files, not_uploaded = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(uploaded_at IS NULL), 0) FROM files"
+            ).fetchone()
+            evicted_not_uploaded = self._conn.execute(
+                "SELECT COUNT(*) FROM evictions WHERE uploaded = 0"
+            ).fetchone()[0]
+            return {
+                "files": files,
+                "not_uploaded": not_uploaded,
+                "total_bytes": self.total_bytes,
+                "quota_bytes": self.quota_bytes,
+                "evicted_not_uploaded_total": evicted_not_uploaded,
+                **self.stats,
+            }
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                self._conn.close()
@@ -1,32 +1,139 @@
 import os
 import sys
-from collections import deque
+import threading
+import time
 from datetime import datetime, timedelta
+from typing import List, Optional
 
-import mss
-import mss.tools
-
-from src.argus.api.tracker import api_client
+from src.argus.api.ratelimit import BACKLOG
+from src.argus.api.tracker import ActivityTrackerAPI, api_client
 from src.argus.exceptions import CustomException
-from src.argus.filemanager.file_manager import file_manager
+from src.argus.filemanager.file_manager import FileManager, file_manager
 from src.argus.logger import logging
 from src.argus.mousetracking.clicktracker import ClickTracker
+from src.argus.reports.heatmap import ActivityHeatmap
+from src.argus.reports.rollups import ActivityRollups
+from src.argus.retention.retention import RetentionManager
+from src.argus.screenshot.codecs import create_codec
+from src.argus.screenshot.fingerprint import block_fingerprint, fingerprint_difference
+from src.argus.screenshot.grabber import Frame, ScreenGrabber
+from src.argus.screenshot.pipeline import CaptureJob, CapturePipeline
+from src.argus.screenshot.process_encoder import ProcessPoolEncoder, encode_frame
+from src.argus.screenshot.tiles import TileDeltaEncoder, tile_metadata
+from src.argus.settings import settings
+from src.argus.timetracker.journal import RecoveredSession, SessionJournal
 from src.argus.timetracker.time_tracker import TimeTracker
-from src.argus.utils.utils import has_internet_connection
+from src.argus.uploadqueue.compaction import BacklogCompactor
+from src.argus.uploadqueue.drainer import BacklogDrainer
+from src.argus.uploadqueue.idempotency import make_idempotency_key
+from src.argus.uploadqueue.persistent_queue import PendingUpload, PersistentUploadQueue
 
 
 class ScreenshotCapture:
-    def __init__(self, clicktracker: ClickTracker):
+    def __init__(self, clicktracker: Optional[ClickTracker], api: Optional[ActivityTrackerAPI] = None,
+                 grabber: Optional[ScreenGrabber] = None, files: Optional[FileManager] = None):
+        """
+        Args:
+            clicktracker: activity monitor; None runs without one (headless, e.g. load tests)
+            api: activity API client, the shared api_client by default
+            grabber: anything with grab() / close() / get_stats(), a ScreenGrabber by default
+            files: where screenshots and the pending queue live, the app data folder by default
+        """
         self.is_running = False
         self.is_paused = False
         self.user_id = ""
         self.screenshot_dir = ""
         self.click_tracker = clicktracker
-        self.file_manager = file_manager
+        self.api = api or api_client
+        # The monitor fed by this client's requests (the app-wide one for the shared client)
+        self.connectivity = self.api.connectivity
+        self.file_manager = files or file_manager
         self.last_capture_time = None
         self.session_start_time = None
-        self.pending_uploads = deque()
+        # Survives restarts; anything left from a previous run is replayed when tracking starts
+        self.pending_uploads = PersistentUploadQueue(
+            os.path.join(self.file_manager.get_path("queue"), "pending_uploads.db")
+        )
+        self.backlog_drainer = BacklogDrainer(
+            self.pending_uploads,
+            self._upload_pending_item,
+            concurrency=settings.get("backlog", "concurrency", 4),
+            retry_base_sec=settings.get("backlog", "retry_base_sec", 5.0),
+            retry_max_sec=settings.get("backlog", "retry_max_sec", 300.0),
+            # Stop draining as soon as the server's circuit breaker opens
+            should_continue=lambda: self.api.is_available() and self.connectivity.is_online,
+            upload_batch_fn=self._upload_pending_batch,
+            batch_size=settings.get("backlog", "batch_size", 10),
+        )
+        # Uploaded screenshots are cleaned up after a grace period and the folder is kept under quota
+        self.retention = RetentionManager(
+            os.path.join(self.file_manager.get_path("queue"), "retention.db"),
+            root=self.file_manager.get_path("screenshots"),
+            quota_bytes=settings.get("retention", "quota_bytes", 2 * 1024 ** 3),
+            grace_sec=settings.get("retention", "grace_sec", 24 * 3600),
+            uploaded_action=settings.get("retention", "uploaded_action", "delete"),
+            batch_size=settings.get("retention", "batch_size", 200),
+            interval_sec=settings.get("retention", "interval_sec", 60.0),
+        )
+        # Re-encodes and thins the backlog when the server stays unreachable for long
+        self.compactor = BacklogCompactor(
+            self.pending_uploads,
+            self.backlog_drainer,
+            codec_options=settings.section("compaction"),
+            reencode_after_items=settings.get("compaction", "reencode_after_items", 500),
+            reencode_after_sec=settings.get("compaction", "reencode_after_sec", 6 * 3600),
+            thin_after_items=settings.get("compaction", "thin_after_items", 2000),
+            thin_after_sec=settings.get("compaction", "thin_after_sec", 24 * 3600),
+            keep_one_in=settings.get("compaction", "keep_one_in", 4),
+            batch_size=settings.get("compaction", "batch_size", 50),
+            interval_sec=settings.get("compaction", "interval_sec", 300.0),
+            file_added=self.retention.track,
+            file_removed=self.retention.forget,
+        )
         self.time_tracker = TimeTracker()
+        # Lets a session interrupted by a crash carry on with its worked time on the next start
+        self.journal = SessionJournal(
+            os.path.join(self.file_manager.get_path("state"), "session.journal"),
+            sync_interval_sec=settings.get("journal", "sync_interval_sec", 5.0),
+            heartbeat_sec=settings.get("journal", "heartbeat_sec", 30.0),
+        )
+        self.time_tracker.add_listener(self.journal.on_tracker_event)
+        # Hourly / daily totals for reports, kept up to date as the session runs
+        self.rollups = ActivityRollups(os.path.join(self.file_manager.get_path("state"), "rollups.db"))
+        self.time_tracker.add_listener(self.rollups.on_tracker_event)
+        # Per-minute view of today's activity for the main window
+        self.heatmap = ActivityHeatmap(self.file_manager.get_path("state", "heatmap"))
+        if self.click_tracker is not None:
+            self.click_tracker.add_activity_listener(self.rollups.record_click)
+            self.click_tracker.add_activity_listener(self.heatmap.record_click)
+            self.click_tracker.add_state_listener(self.heatmap.record_check)
+        self.connectivity.subscribe(self._on_connectivity_change)
+        self.upload_callback = None
+        self.pipeline = self._create_pipeline()
+        self.grabber = grabber or ScreenGrabber(
+            mode=settings.get("capture", "mode", "virtual"),
+            output=settings.get("capture", "output", "composite"),
+            layout_check_sec=settings.get("capture", "layout_check_sec", 5.0),
+        )
+        self.codec = create_codec(settings.section("codec"))
+        processes = settings.get("pipeline", "encoder_processes", 0)
+        self.process_encoder = ProcessPoolEncoder(processes) if processes > 0 else None
+        self.tile_settings = settings.section("tiles")
+        self.tile_encoders = {}
+        self.change_detection = settings.section("change_detection")
+        self.last_fingerprint = None
+        self.skipped_in_a_row = 0
+        self.skipped_frames = 0
+
+    def _create_pipeline(self) -> CapturePipeline:
+        return CapturePipeline(
+            encode_fn=self._encode_job,
+            upload_fn=self._upload_job,
+            overflow_fn=self._queue_pending,
+            encoder_workers=settings.get("pipeline", "encoder_workers", 2),
+            encode_queue_size=settings.get("pipeline", "encode_queue_size", 4),
+            upload_queue_size=settings.get("pipeline", "upload_queue_size", 8),
+        )
 
     def start(self, user_id: str):
         """Start the tracking session"""
@@ -37,22 +144,58 @@ class ScreenshotCapture:
         self.is_paused = False
         self.session_start_time = datetime.now()
         self.last_capture_time = None  # Reset for new session
-
-        # Start time tracker
-        self.time_tracker.start()
+        self.last_fingerprint = None
+        self.skipped_in_a_row = 0
+        self.tile_encoders = {}
+
+        # Start encoder and upload workers
+        self.pipeline.start()
+        self.connectivity.start()
+        self.retention.start()
+        self.compactor.start()
+
+        if self.pending_uploads:
+            # Replay captures left over from an earlier session or a crash
+            threading.Thread(target=self._upload_pending_screenshots, name="argus-replay", daemon=True).start()
+
+        # Start time tracker, or pick up a session that was cut short by a crash
+        self.journal.user_id = str(user_id)
+        self.rollups.user_id = str(user_id)
+        self.heatmap.open(user_id)
+        recovered = self.journal.recover(user_id)
+        if recovered is not None:
+            self._restore_session(recovered)
+        else:
+            self.time_tracker.start()
 
         # Start click tracker
-        self.click_tracker.is_paused = False
-        self.click_tracker.start_monitoring()
+        if self.click_tracker is not None:
+            self.click_tracker.is_paused = False
+            self.click_tracker.start_monitoring()
 
         logging.info(f"Tracking started for user {user_id} at {self.session_start_time}")
 
+    def _restore_session(self, recovered: RecoveredSession):
+        """Continue an interrupted session; the time the app was down counts as paused"""
+        now = datetime.now()
+        downtime_start = recovered.paused_since or recovered.last_seen
+        self.time_tracker.restore(recovered.start_time, recovered.pauses + [(downtime_start, now)])
+        self.journal.reopen(recovered, now)
+        # restore() does not notify listeners; the downtime itself is left out of the rollups
+        self.rollups.on_tracker_event("start", now)
+        self.session_start_time = recovered.start_time
+        # Work up to the last capture was already handed to the uploader
+        self.last_capture_time = recovered.last_capture
+        logging.info(f"Resumed interrupted session started {recovered.start_time} "
+                     f"(down since {downtime_start}, worked {self.time_tracker.get_formatted_time()})")
+
     def pause(self):
         """Pause the tracking"""
         if self.is_running and not self.is_paused:
             self.is_paused = True
             self.time_tracker.pause()
-            self.click_tracker.is_paused = True
+            if self.click_tracker is not None:
+                self.click_tracker.is_paused = True
             logging.info("Tracking paused")
         else:
             logging.warning("Cannot pause - not running or already paused")
@@ -62,7 +205,8 @@ class ScreenshotCapture:
         if self.is_running and self.is_paused:
             self.is_paused = False
             self.time_tracker.resume()
-            self.click_tracker.is_paused = False
+            if self.click_tracker is not None:
+                self.click_tracker.is_paused = False
             logging.info("Tracking resumed")
         else:
             logging.warning("Cannot resume - not running or not paused")
@@ -74,7 +218,17 @@ class ScreenshotCapture:
             self.is_paused = False
 
             # Stop click tracker
-            self.click_tracker.stop_monitoring()
+            if self.click_tracker is not None:
+                self.click_tracker.stop_monitoring()
+
+            # Let captures already grabbed finish encoding and uploading
+            self.pipeline.stop(timeout=settings.get("pipeline", "stop_timeout_sec", 60))
+            self.grabber.close()
+            self.compactor.stop()
+            self.retention.stop()
+            self.pending_uploads.checkpoint()
+            if self.process_encoder is not None:
+                self.process_encoder.shutdown()
 
             # Log final statistics
             total_work_time = self.time_tracker.get_formatted_time()
@@ -84,15 +238,16 @@ class ScreenshotCapture:
             debug_info = self.time_tracker.get_debug_info()
             logging.info(f"Session debug info: {debug_info}")
 
-            # Reset trackers
+            # Reset trackers (this also writes the session's last rollups)
             self.time_tracker.reset_all_time()
+            self.heatmap.save()
             self.last_capture_time = None
             self.session_start_time = None
         else:
             logging.warning("Tracking is not running")
 
     def capture(self) -> bool:
-        """Capture screenshot and calculate accurate time gap"""
+        """Grab a screenshot and hand it to the pipeline for encoding and upload"""
         if not self.is_running:
             logging.warning("Cannot capture - tracking not running")
             return False
@@ -119,99 +274,239 @@ class ScreenshotCapture:
 
         # Update last capture time
         self.last_capture_time = current_time
+        self.journal.record("capture", current_time)
+        self.rollups.flush(current_time)
+        self.heatmap.save()
 
         # Generate filename and filepath
-        filename = f"screenshot_{current_time.strftime('%Y%m%d_%H%M%S')}.png"
+        filename = f"screenshot_{current_time.strftime('%Y%m%d_%H%M%S')}"
         filepath = os.path.join(self.screenshot_dir, filename)
 
         try:
-            # Capture screenshot
-            success = self._take_screenshot(filepath)
-            if not success:
+            # Grab stage runs on the calling thread; encode and upload happen on the pipeline workers
+            grab_start = time.monotonic()
+            frames = self.grabber.grab()
+            if not frames:
                 return False
+            grab_seconds = time.monotonic() - grab_start
+
+            if self._is_unchanged(frames):
+                # Near-identical to the last encoded frame: send only the time record
+                logging.info(f"Screen unchanged, skipping screenshot ({self.skipped_in_a_row} in a row)")
+                job = CaptureJob(self.user_id, None, time_gap_seconds, current_time)
+                return self.pipeline.submit(job, grab_seconds=grab_seconds)
+
+            # Separate per-monitor images each become a job; only the first carries the work seconds
+            submitted = True
+            for index, frame in enumerate(frames):
+                suffix = f"_m{index + 1}" if len(frames) > 1 else ""
+                frame_meta = None
+                if self.tile_settings.get("enabled", False):
+                    # Tile deltas are lossless PNG whatever the configured codec
+                    frame_path = f"{filepath}{suffix}.png"
+                    frame, frame_meta = self._tile_encoder(index).process(frame, os.path.basename(frame_path))
+                else:
+                    frame_path = f"{filepath}{suffix}{self.codec.extension}"
 
-            # Upload activity data
-            logging.info(f"Uploading activity - Work seconds: {time_gap_seconds:.2f}")
-            if has_internet_connection():
-                upload_success = api_client.upload_activity(
+                job = CaptureJob(
                     employee_id=self.user_id,
-                    screenshot_path=filepath,
-                    work_seconds=str(time_gap_seconds)
+                    filepath=frame_path,
+                    work_seconds=time_gap_seconds if index == 0 else 0.0,
+                    captured_at=current_time,
+                    frame=frame
                 )
-                if upload_success:
-                    logging.info("Screenshot and activity uploaded successfully")
-                    # Try uploading any pending screenshots
-                    self._upload_pending_screenshots()
-                    return True
-                else:
-                    logging.warning("Failed to upload current screenshot, queued for later")
-                    self.pending_uploads.append((filepath, time_gap_seconds))
-                    return False
-            else:
-                logging.warning("No internet: storing screenshot in pending queue")
-                self.pending_uploads.append((filepath, time_gap_seconds))
-                return False
-
+                job.frame_meta = frame_meta
+                submitted = self.pipeline.submit(job, grab_seconds=grab_seconds if index == 0 else 0.0) and submitted
+            return submitted
 
         except Exception as e:
             logging.error(f"Error during capture: {str(e)}")
             raise CustomException(e, sys)
 
-    def _upload_pending_screenshots(self):
-        """Try uploading any stored screenshots"""
-        logging.info("Checking for pending uploads...")
-        while self.pending_uploads and has_internet_connection():
-            filepath, work_seconds = self.pending_uploads.popleft()
+    def _tile_encoder(self, index: int) -> TileDeltaEncoder:
+        """Delta state is kept per monitor image"""
+        if index not in self.tile_encoders:
+            self.tile_encoders[index] = TileDeltaEncoder(
+                tile_size=self.tile_settings.get("tile_size", 64),
+                keyframe_interval=self.tile_settings.get("keyframe_interval", 10),
+            )
+        return self.tile_encoders[index]
+
+    def _is_unchanged(self, frames: List[Frame]) -> bool:
+        """Compare the fingerprint of the grabbed frames with the last encoded one"""
+        if not self.change_detection.get("enabled", True):
+            return False
+
+        grid = self.change_detection.get("grid_size", 16)
+        fingerprint = b"".join(
+            block_fingerprint(frame.raw, frame.width, frame.height, grid=grid) for frame in frames
+        )
+        difference = fingerprint_difference(
+            self.last_fingerprint, fingerprint,
+            tolerance=self.change_detection.get("block_tolerance", 8)
+        )
+        # Still send a full screenshot every so often even on a static screen
+        if (difference <= self.change_detection.get("threshold", 0.01)
+                and self.skipped_in_a_row < self.change_detection.get("max_consecutive_skips", 5)):
+            self.skipped_in_a_row += 1
+            self.skipped_frames += 1
+            return True
+
+        self.last_fingerprint = fingerprint
+        self.skipped_in_a_row = 0
+        return False
+
+    def _encode_job(self, job: CaptureJob) -> bool:
+        """Encoder stage: write the grabbed frame to disk and fix the record's idempotency key"""
+        if job.frame is None:
+            # Time-only record, nothing to encode
+            job.idempotency_key = make_idempotency_key(job.employee_id, job.captured_at)
+            return True
+
+        text = tile_metadata(job.frame_meta) if job.frame_meta is not None else None
+        try:
+            if self.process_encoder is not None:
+                result = self.process_encoder.encode(job.frame, job.filepath, self.codec, text)
+            else:
+                result = encode_frame(job.frame, job.filepath, self.codec, text)
+        except Exception as e:
+            # Keep the work seconds even if the image is lost
+            logging.error(f"Failed to encode {job.filepath}, sending time record only: {e}")
+            job.idempotency_key = make_idempotency_key(job.employee_id, job.captured_at, filepath=job.filepath)
+            job.filepath = None
+            return True
+
+        job.encoded_bytes = result.size
+        job.content_hash = result.sha256
+        # A tile delta is useless without its keyframe; retention evicts them together
+        keyframe = job.frame_meta.get("keyframe") if job.frame_meta is not None else None
+        self.retention.track(job.filepath, job.encoded_bytes, keyframe=keyframe)
+        self.rollups.record_capture(job.encoded_bytes, job.captured_at)
+        # The same key goes with the live upload and any retry from the backlog
+        job.idempotency_key = make_idempotency_key(job.employee_id, job.captured_at, job.content_hash, job.filepath)
+        logging.info(f"Screenshot captured and saved: {job.filepath} ({job.encoded_bytes} bytes, {self.codec.describe()})")
+        return True
+
+    def _upload_job(self, job: CaptureJob) -> bool:
+        """Upload stage: send the encoded screenshot and its work seconds"""
+        logging.info(f"Uploading activity - Work seconds: {job.work_seconds:.2f}")
+        if not self.connectivity.is_online:
+            logging.warning("No internet: storing screenshot in pending queue")
+            self._notify_upload(False)
+            return False
+        if not self.api.is_available():
+            # Server marked as failing; queue without waiting on a doomed request
+            logging.warning("Server unavailable (circuit open): storing screenshot in pending queue")
+            self._notify_upload(False)
+            return False
+
+        job.upload_attempted = True
+        upload_success = self.api.upload_activity(
+            employee_id=job.employee_id,
+            screenshot_path=job.filepath,
+            work_seconds=str(job.work_seconds),
+            content_hash=job.content_hash,
+            idempotency_key=job.idempotency_key,
+            captured_at=job.captured_at.timestamp()
+        )
+        self._notify_upload(upload_success)
+        if not upload_success:
+            logging.warning("Failed to upload current screenshot, queued for later")
+            return False
+
+        logging.info("Screenshot and activity uploaded successfully")
+        self.retention.mark_uploaded(job.filepath)
+        self.rollups.record_upload(job.encoded_bytes)
+        # Try uploading any pending screenshots
+        self._upload_pending_screenshots()
+        return True
+
+    def _queue_pending(self, job: CaptureJob):
+        """Keep a capture that could not be uploaded right now for a later retry"""
+        self.pending_uploads.put(job.employee_id, job.filepath, job.work_seconds, job.content_hash,
+                                 idempotency_key=job.idempotency_key, attempts=int(job.upload_attempted),
+                                 captured_at=job.captured_at.timestamp())
+
+    def _notify_upload(self, success: bool):
+        if self.upload_callback:
             try:
-                success = api_client.upload_activity(
-                    employee_id=self.user_id,
-                    screenshot_path=filepath,
-                    work_seconds=str(work_seconds)
-                )
-                if success:
-                    logging.info(f"Pending screenshot uploaded: {filepath}")
-                else:
-                    logging.warning(f"Retrying later: {filepath}")
-                    self.pending_uploads.appendleft((filepath, work_seconds))
-                    break  # Stop trying if one fails
+                self.upload_callback(success=success)
             except Exception as e:
-                logging.error(f"Error uploading pending screenshot: {e}")
-                self.pending_uploads.appendleft((filepath, work_seconds))
-                break
+                logging.warning(f"Upload callback failed: {e}")
 
-    def _take_screenshot(self, filepath: str) -> bool:
-        """Take screenshot of all monitors"""
+    def _upload_pending_screenshots(self):
+        """Try uploading any stored screenshots"""
+        # The uploader and the UI's connectivity check may both trigger this; the drainer runs one drain at a time
+        logging.info("Checking for pending uploads...")
+        self.backlog_drainer.drain()
+
+    @staticmethod
+    def _pending_screenshot_path(item: PendingUpload):
+        if item.filepath is not None and not os.path.exists(item.filepath):
+            # The image is gone (e.g. cleaned up while offline); the work seconds still count
+            logging.warning(f"Pending screenshot missing, sending time record only: {item.filepath}")
+            return None
+        return item.filepath
+
+    @staticmethod
+    def _file_size(filepath: Optional[str]) -> int:
         try:
-            with mss.mss() as sct:
-                # Get all monitor areas (excluding monitor 0 which is virtual combined)
-                if len(sct.monitors) <= 1:
-                    logging.error("No monitors detected")
-                    return False
-
-                monitor_areas = [sct.monitors[i] for i in range(1, len(sct.monitors))]
-
-                # Calculate combined screen area
-                left = min(m["left"] for m in monitor_areas)
-                top = min(m["top"] for m in monitor_areas)
-                right = max(m["left"] + m["width"] for m in monitor_areas)
-                bottom = max(m["top"] + m["height"] for m in monitor_areas)
-
-                # Capture the entire virtual screen
-                screenshot = sct.grab({
-                    "left": left,
-                    "top": top,
-                    "width": right - left,
-                    "height": bottom - top
-                })
-
-                # Save screenshot
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=filepath)
-                logging.info(f"Screenshot captured and saved: {filepath}")
-                return True
+            return os.path.getsize(filepath) if filepath else 0
+        except OSError:
+            return 0
+
+    def _upload_pending_batch(self, items: List[PendingUpload]) -> List[bool]:
+        """Upload several backlog items in as few requests as the size cap allows"""
+        records = [
+            {
+                "employee_id": item.employee_id,
+                "screenshot_path": self._pending_screenshot_path(item),
+                "work_seconds": str(item.work_seconds),
+                "content_hash": item.content_hash,
+                "idempotency_key": item.idempotency_key,
+                "captured_at": item.captured_at,
+            }
+            for item in items
+        ]
+        results = self.api.upload_batch(
+            records,
+            max_batch_bytes=settings.get("backlog", "max_batch_bytes", 8 * 1024 * 1024),
+            priority=BACKLOG
+        )
+        for item, success in zip(items, results):
+            if success:
+                self.retention.mark_uploaded(item.filepath)
+                self.rollups.record_upload(self._file_size(item.filepath))
+        return results
+
+    def _on_connectivity_change(self, online: bool):
+        """Drain the backlog as soon as the server is reachable again"""
+        if online and self.is_running and self.pending_uploads:
+            threading.Thread(target=self._upload_pending_screenshots, name="argus-replay", daemon=True).start()
+
+    def _upload_pending_item(self, item: PendingUpload) -> bool:
+        """Upload one backlog item for the drainer"""
+        filepath = self._pending_screenshot_path(item)
+        success = self.api.upload_activity(
+            employee_id=item.employee_id,
+            screenshot_path=filepath,
+            work_seconds=str(item.work_seconds),
+            content_hash=item.content_hash,
+            priority=BACKLOG,
+            idempotency_key=item.idempotency_key,
+            captured_at=item.captured_at
+        )
+        if success:
+            self.retention.mark_uploaded(item.filepath)
+            self.rollups.record_upload(self._file_size(filepath))
+            logging.info(f"Pending screenshot uploaded: {filepath}")
+        else:
+            logging.warning(f"Retrying later: {filepath}")
+        return success
 
-        except Exception as e:
-            logging.error(f"Screenshot capture failed: {str(e)}")
-            return False
+    def get_pipeline_stats(self) -> dict:
+        """Per-stage queue depth and latency of the capture pipeline"""
+        return self.pipeline.get_stats()
 
     def get_work_hours(self) -> str:
         """Get formatted work hours for current session"""
@@ -231,5 +526,17 @@ class ScreenshotCapture:
             "last_capture_time": self.last_capture_time,
             "work_hours": self.get_work_hours(),
             "work_seconds": self.get_work_seconds(),
-            "time_tracker_debug": self.time_tracker.get_debug_info()
+            "time_tracker_debug": self.time_tracker.get_debug_info(),
+            "pending_uploads": len(self.pending_uploads),
+            "last_backlog_drain": self.backlog_drainer.last_report.as_dict() if self.backlog_drainer.last_report else None,
+            "skipped_frames": self.skipped_frames,
+            "pipeline": self.get_pipeline_stats(),
+            "grabber": self.grabber.get_stats(),
+            "api": self.api.get_status(),
+            "connectivity": self.connectivity.get_stats(),
+            "retention": self.retention.get_stats(),
+            "compaction": self.compactor.get_stats(),
+            "journal": self.journal.get_stats(),
+            "rollups": self.rollups.get_stats(),
+            "heatmap": self.heatmap.get_stats()
         }
\ No newline at end of file
@@ -0,0 +1,156 @@
+import math
+
+from src.argus.logger import logging
+from src.argus.screenshot.grabber import Frame
+from src.argus.screenshot.output import EncodeResult, HashingWriter
+from src.argus.screenshot.png import write_frame_png
+
+# Pillow is optional: without it only PNG is available and downscaling uses plain decimation
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def downscale_factor(width: int, height: int, max_width: int, max_height: int) -> float:
+    """Factor (>= 1) the frame must shrink by to fit the max resolution (0 = unlimited)"""
+    factor = 1.0
+    if max_width and width > max_width:
+        factor = max(factor, width / max_width)
+    if max_height and height > max_height:
+        factor = max(factor, height / max_height)
+    return factor
+
+
+def decimate(frame: Frame, step: int) -> Frame:
+    """Keep every step-th pixel of every step-th row (no Pillow needed)"""
+    if step <= 1:
+        return frame
+
+    width = frame.width // step
+    height = frame.height // step
+    stride = frame.width * 4
+    row_bytes = width * 4
+    raw = bytearray(width * height * 4)
+    dst = bytearray(row_bytes)
+    for y in range(height):
+        row = bytes(frame.raw[y * step * stride:y * step * stride + stride])
+        for channel in range(4):
+            dst[channel::4] = row[channel::4 * step][:width]
+        raw[y * row_bytes:(y + 1) * row_bytes] = dst
+    return Frame(raw, width, height, frame.left, frame.top)
+
+
+class ImageCodec:
+    """Base class for screenshot encoders"""
+
+    name = ""
+    extension = ""
+    requires_pillow = False
+
+    def __init__(self, quality: int = 80, zlib_level: int = 6, max_width: int = 0, max_height: int = 0):
+        self.quality = quality
+        self.zlib_level = zlib_level
+        self.max_width = max_width
+        self.max_height = max_height
+
+    @classmethod
+    def available(cls) -> bool:
+        return not cls.requires_pillow or Image is not None
+
+    def encode(self, frame: Frame, filepath: str) -> EncodeResult:
+        """Encode the frame into filepath; returns its size and SHA-256"""
+        raise NotImplementedError
+
+    def options(self) -> dict:
+        """Settings that rebuild this codec through create_codec()"""
+        return {
+            "format": self.name,
+            "quality": self.quality,
+            "zlib_level": self.zlib_level,
+            "max_width": self.max_width,
+            "max_height": self.max_height,
+        }
+
+    def describe(self) -> str:
+        limit = f", max {self.max_width or '-'}x{self.max_height or '-'}" if self.max_width or self.max_height else ""
+        return f"{self.name}{limit}"
+
+    def _to_image(self, frame: Frame):
+        """Pillow image of the frame, downscaled to the configured max resolution"""
+        # BGRX raw mode reads the mss buffer directly instead of building an RGB copy first
+        image = Image.frombuffer("RGB", frame.size, frame.raw, "raw", "BGRX", 0, 1)
+        factor = downscale_factor(frame.width, frame.height, self.max_width, self.max_height)
+        if factor > 1:
+            resampling = getattr(Image, "Resampling", Image)
+            size = (max(1, int(frame.width / factor)), max(1, int(frame.height / factor)))
+            image = image.resize(size, resampling.BOX, reducing_gap=2.0)
+        return image
+
+
+class PngCodec(ImageCodec):
+    name = "png"
+    extension = ".png"
+
+    def encode(self, frame: Frame, filepath: str) -> EncodeResult:
+        factor = downscale_factor(frame.width, frame.height, self.max_width, self.max_height)
+        if factor > 1:
+            frame = decimate(frame, math.ceil(factor))
+        return write_frame_png(frame, filepath, level=self.zlib_level)
+
+    def describe(self) -> str:
+        return f"{super().describe()} (zlib {self.zlib_level})"
+
+
+class JpegCodec(ImageCodec):
+    name = "jpeg"
+    extension = ".jpg"
+    requires_pillow = True
+
+    def encode(self, frame: Frame, filepath: str) -> EncodeResult:
+        with HashingWriter(filepath) as out:
+            self._to_image(frame).save(out, "JPEG", quality=self.quality, optimize=False)
+        return out.close()
+
+    def describe(self) -> str:
+        return f"{super().describe()} (q{self.quality})"
+
+
+class WebpCodec(ImageCodec):
+    name = "webp"
+    extension = ".webp"
+    requires_pillow = True
+
+    def encode(self, frame: Frame, filepath: str) -> EncodeResult:
+        with HashingWriter(filepath) as out:
+            # method=4 is Pillow's default speed/size trade-off
+            self._to_image(frame).save(out, "WEBP", quality=self.quality, method=4)
+        return out.close()
+
+    def describe(self) -> str:
+        return f"{super().describe()} (q{self.quality})"
+
+
+CODECS = {codec.name: codec for codec in (PngCodec, JpegCodec, WebpCodec)}
+
+
+def create_codec(options: dict) -> ImageCodec:
+    """Build the codec described by the 'codec' settings section"""
+    name = str(options.get("format", "png")).lower()
+    if name == "jpg":
+        name = "jpeg"
+
+    codec_class = CODECS.get(name)
+    if codec_class is None:
+        logging.warning(f"Unknown screenshot format '{name}', using png")
+        codec_class = PngCodec
+    elif not codec_class.available():
+        logging.warning(f"Screenshot format '{name}' needs Pillow, which is not installed; using png")
+        codec_class = PngCodec
+
+    return codec_class(
+        quality=int(options.get("quality", 80)),
+        zlib_level=int(options.get("zlib_level", 6)),
+        max_width=int(options.get("max_width", 0) or 0),
+        max_height=int(options.get("max_height", 0) or 0),
+    )
@@ -0,0 +1,56 @@
+from typing import Optional
+
+
+def block_fingerprint(raw, width: int, height: int, grid: int = 16, samples: int = 4) -> bytes:
+    """
+    Cheap perceptual fingerprint of a BGRA frame.
+    Args:
+        raw: BGRA pixel buffer as returned by mss
+        width, height: frame size in pixels
+        grid: the frame is split into grid x grid blocks
+        samples: pixels sampled per block along each axis
+    Returns:
+        grid * grid bytes, each the mean luminance of one block
+    """
+    if width <= 0 or height <= 0:
+        return b""
+
+    view = memoryview(raw)
+    stride = width * 4
+    block_w = width / grid
+    block_h = height / grid
+    step_x = block_w / samples
+    step_y = block_h / samples
+    per_block = samples * samples
+
+    # Pixel offsets are computed once per column/row rather than per sample
+    columns = [
+        [int(gx * block_w + (sx + 0.5) * step_x) * 4 for sx in range(samples)]
+        for gx in range(grid)
+    ]
+    rows = [
+        [int(gy * block_h + (sy + 0.5) * step_y) * stride for sy in range(samples)]
+        for gy in range(grid)
+    ]
+
+    fingerprint = bytearray(grid * grid)
+    for gy in range(grid):
+        row_offsets = rows[gy]
+        for gx in range(grid):
+            total = 0
+            for row_offset in row_offsets:
+                for column_offset in columns[gx]:
+                    i = row_offset + column_offset
+                    # ITU-R BT.601 luma from B, G, R
+                    total += view[i] * 29 + view[i + 1] * 150 + view[i + 2] * 77
+            fingerprint[gy * grid + gx] = (total // per_block) >> 8
+    return bytes(fingerprint)
+
+
+def fingerprint_difference(previous: Optional[bytes], current: bytes, tolerance: int = 8) -> float:
+    """Fraction of blocks whose luminance moved by more than tolerance (1.0 if not comparable)"""
+    if not previous or len(previous) != len(current):
+        return 1.0
+
+    changed = sum(1 for a, b in zip(previous, current) if abs(a - b) > tolerance)
+    return changed / len(current)
@@ -0,0 +1,251 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import mss
+
+from src.argus.logger import logging
+
+CAPTURE_MODES = ("virtual", "per_monitor")
+OUTPUT_MODES = ("composite", "separate")
+
+
+class Frame:
+    """BGRA pixels of one captured area (mirrors the parts of mss.ScreenShot we use)"""
+
+    __slots__ = ("raw", "width", "height", "left", "top")
+
+    def __init__(self, raw, width: int, height: int, left: int = 0, top: int = 0):
+        self.raw = raw
+        self.width = width
+        self.height = height
+        self.left = left
+        self.top = top
+
+    @classmethod
+    def from_screenshot(cls, shot) -> "Frame":
+        """Wrap an mss screenshot without copying its pixels"""
+        return cls(shot.raw, shot.width, shot.height, shot.left, shot.top)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+    @property
+    def rgb(self) -> bytes:
+        """RGB copy of the BGRA pixels"""
+        # Extended slices of a memoryview (e.g. shared memory) cannot be assigned directly
+        raw = self.raw.tobytes() if isinstance(self.raw, memoryview) else self.raw
+        rgb = bytearray(self.width * self.height * 3)
+        rgb[0::3] = raw[2::4]
+        rgb[1::3] = raw[1::4]
+        rgb[2::3] = raw[0::4]
+        return bytes(rgb)
+
+
+def virtual_region(monitors: List[dict]) -> dict:
+    """Bounding rectangle covering every monitor"""
+    left = min(m["left"] for m in monitors)
+    top = min(m["top"] for m in monitors)
+    right = max(m["left"] + m["width"] for m in monitors)
+    bottom = max(m["top"] + m["height"] for m in monitors)
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+def _pack_columns(sizes: List[Tuple[int, int]], positions: List[int]) -> Tuple[int, int, List[Tuple[int, int]]]:
+    """Shelf-pack (width, height) boxes into columns as tall as the tallest box"""
+    height = max(h for _, h in sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], positions[i]))
+
+    offsets = [(0, 0)] * len(sizes)
+    x = y = column_width = 0
+    for i in order:
+        w, h = sizes[i]
+        if y + h > height:
+            # Start a new column
+            x += column_width
+            y = column_width = 0
+        offsets[i] = (x, y)
+        y += h
+        column_width = max(column_width, w)
+    return x + column_width, height, offsets
+
+
+def pack_layout(monitors: List[dict]) -> Tuple[int, int, List[Tuple[int, int]]]:
+    """
+    Pack monitors into a composite with as little dead area as possible
+    Returns:
+        (width, height, [(x, y) offset of each monitor in the composite])
+    """
+    sizes = [(m["width"], m["height"]) for m in monitors]
+    columns = _pack_columns(sizes, [m["left"] for m in monitors])
+
+    # Same packing on the transposed layout gives rows instead of columns
+    height, width, offsets = _pack_columns([(h, w) for w, h in sizes], [m["top"] for m in monitors])
+    rows = (width, height, [(x, y) for y, x in offsets])
+
+    return min(columns, rows, key=lambda layout: layout[0] * layout[1])
+
+
+def compose(frames: List[Frame], width: int, height: int, offsets: List[Tuple[int, int]]) -> Frame:
+    """Copy per-monitor frames into one packed BGRA frame"""
+    raw = bytearray(width * height * 4)
+    stride = width * 4
+    for frame, (x, y) in zip(frames, offsets):
+        row_bytes = frame.width * 4
+        src = memoryview(frame.raw)
+        for row in range(frame.height):
+            dst = (y + row) * stride + x * 4
+            raw[dst:dst + row_bytes] = src[row * row_bytes:(row + 1) * row_bytes]
+    return Frame(raw, width, height)
+
+
+class ScreenGrabber:
+    """
+    Grabs the screen either as one bounding box of the virtual screen (the
+    original behaviour) or monitor by monitor, which skips the dead areas of
+    mixed-resolution and offset layouts.
+
+    The mss handle and the monitor geometry are kept between grabs. mss
+    handles belong to the thread that opened them, so grabs run on a
+    dedicated session thread. Monitors are grabbed one after another: mss
+    serialises every grab behind a module-wide lock, so grabbing them from
+    several threads would gain nothing. mss caches the monitor list for the
+    life of a handle, so the layout is re-checked (at most every
+    layout_check_sec) by opening a fresh handle. The derived regions are
+    only rebuilt when the layout actually changed, and a failed grab reopens
+    the session.
+    """
+
+    def __init__(self, mode: str = "virtual", output: str = "composite", layout_check_sec: float = 5.0):
+        if mode not in CAPTURE_MODES:
+            logging.warning(f"Unknown capture mode '{mode}', using 'virtual'")
+            mode = "virtual"
+        if output not in OUTPUT_MODES:
+            logging.warning(f"Unknown capture output '{output}', using 'composite'")
+            output = "composite"
+        self.mode = mode
+        self.output = output
+        self.layout_check_sec = layout_check_sec
+
+        self.monitors: List[dict] = []
+        self._region = None
+        self._packing = None
+        self._last_layout_check = 0.0
+        self._sct = None
+        self._session = None
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "grabs": 0,
+            "handles_opened": 0,
+            "setup_ms": 0.0,
+            "layout_changes": 0,
+            "recoveries": 0,
+        }
+
+    def grab(self) -> List[Frame]:
+        """Grab the screen; returns an empty list when nothing could be captured"""
+        if self._session is None:
+            self._session = ThreadPoolExecutor(max_workers=1, thread_name_prefix="argus-grabber")
+        try:
+            return self._session.submit(self._grab_with_recovery).result()
+        except Exception as e:
+            logging.error(f"Screenshot capture failed: {str(e)}")
+            return []
+
+    def close(self):
+        """Release the backend handles; the next grab opens a new session"""
+        if self._session is not None:
+            self._session.submit(self._close_handle).result()
+            self._session.shutdown()
+            self._session = None
+        self.monitors = []
+        logging.info(f"Grabber session closed: {self.get_stats()}")
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["monitors"] = len(self.monitors)
+        return stats
+
+    def _grab_with_recovery(self) -> List[Frame]:
+        try:
+            return self._grab()
+        except Exception as e:
+            # Typically a monitor was unplugged or changed resolution since the last layout check
+            logging.warning(f"Grab failed ({e}), rebuilding capture session")
+            with self._stats_lock:
+                self.stats["recoveries"] += 1
+            self._close_handle()
+            self.monitors = []
+            return self._grab()
+
+    def _grab(self) -> List[Frame]:
+        self._refresh_layout()
+        sct = self._handle()
+        if not self.monitors:
+            logging.error("No monitors detected")
+            return []
+
+        with self._stats_lock:
+            self.stats["grabs"] += 1
+
+        if self.mode == "virtual" or len(self.monitors) == 1:
+            # Capture the entire virtual screen
+            return [Frame.from_screenshot(sct.grab(self._region))]
+
+        frames = [Frame.from_screenshot(sct.grab(m)) for m in self.monitors]
+
+        if self.output == "separate":
+            return frames
+
+        width, height, offsets = self._packing
+        return [compose(frames, width, height, offsets)]
+
+    def _handle(self):
+        """mss handle of the session thread, opened on first use"""
+        if self._sct is None:
+            started = time.perf_counter()
+            self._sct = mss.mss()
+            with self._stats_lock:
+                self.stats["handles_opened"] += 1
+                self.stats["setup_ms"] += (time.perf_counter() - started) * 1000
+        return self._sct
+
+    def _close_handle(self):
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception as e:
+                logging.warning(f"Error closing capture handle: {e}")
+            self._sct = None
+
+    def _refresh_layout(self):
+        """Re-enumerate monitors and rebuild the cached geometry only if it changed"""
+        now = time.monotonic()
+        if self.monitors and now - self._last_layout_check < self.layout_check_sec:
+            return
+        self._last_layout_check = now
+
+        if self.monitors:
+            # The monitor list is cached per handle; a new one asks the backend again
+            self._close_handle()
+        monitors = [dict(m) for m in self._handle().monitors[1:]]
+        if monitors == self.monitors:
+            return
+
+        if self.monitors:
+            logging.info(f"Monitor layout changed: {self.monitors} -> {monitors}")
+            with self._stats_lock:
+                self.stats["layout_changes"] += 1
+        started = time.perf_counter()
+        self.monitors = monitors
+        self._region = virtual_region(monitors) if monitors else None
+        self._packing = pack_layout(monitors) if len(monitors) > 1 else None
+        with self._stats_lock:
+            self.stats["setup_ms"] += (time.perf_counter() - started) * 1000
@@ -0,0 +1,65 @@
+import hashlib
+import os
+
+
+class EncodeResult:
+    """Size and content hash of an encoded screenshot file"""
+
+    __slots__ = ("size", "sha256")
+
+    def __init__(self, size: int, sha256: str):
+        self.size = size
+        self.sha256 = sha256
+
+    def __repr__(self):
+        return f"EncodeResult(size={self.size}, sha256={self.sha256[:12]}...)"
+
+
+class HashingWriter:
+    """
+    Write-only file that hashes and counts bytes as they go to disk, so the
+    upload hash comes out of the same pass as the encode.
+
+    It deliberately has no fileno(): Pillow would otherwise write to the
+    descriptor directly and bypass the hash.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self._file.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self) -> EncodeResult:
+        """Flush to disk and return the size and hash of everything written"""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        return EncodeResult(self.size, self._hash.hexdigest())
+
+    def abort(self):
+        """Close and remove a partially written file"""
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
@@ -0,0 +1,212 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from src.argus.logger import logging
+
+# Sentinel telling a stage worker to exit once the queue ahead of it is drained
+_STOP = object()
+
+
+class CaptureJob:
+    """A single capture travelling through the grab -> encode -> upload stages"""
+
+    def __init__(self, employee_id: str, filepath: str, work_seconds: float, captured_at: datetime, frame=None):
+        self.employee_id = employee_id
+        self.filepath = filepath
+        self.work_seconds = work_seconds
+        self.captured_at = captured_at
+        self.frame = frame
+        self.frame_meta = None
+        self.encoded_bytes = 0
+        self.content_hash = None
+        self.idempotency_key = None
+        # An upload request went out, so the server may have the record even if it failed
+        self.upload_attempted = False
+        self.enqueued_at = time.monotonic()
+
+    def __repr__(self):
+        return f"CaptureJob({self.filepath!r}, work_seconds={self.work_seconds:.2f})"
+
+
+class StageStats:
+    """Queue depth and latency counters for one pipeline stage"""
+
+    def __init__(self, name: str, work_queue: Optional[queue.Queue] = None):
+        self.name = name
+        self.work_queue = work_queue
+        self.processed = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, wait: float = 0.0, ok: bool = True):
+        """Record one processed item (latency = time spent working, wait = time spent queued)"""
+        with self._lock:
+            self.processed += 1
+            if not ok:
+                self.failed += 1
+            self.total_latency += latency
+            self.total_wait += wait
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            processed = self.processed or 1
+            return {
+                "queue_depth": self.work_queue.qsize() if self.work_queue is not None else 0,
+                "processed": self.processed,
+                "failed": self.failed,
+                "avg_latency_ms": self.total_latency / processed * 1000,
+                "max_latency_ms": self.max_latency * 1000,
+                "last_latency_ms": self.last_latency * 1000,
+                "avg_wait_ms": self.total_wait / processed * 1000,
+            }
+
+
+class CapturePipeline:
+    """
+    Grab -> encode -> upload pipeline connected by bounded queues.
+
+    The grab stage runs on the caller's thread and blocks in submit() when the
+    encoders fall behind (backpressure). The encoder pool never blocks on the
+    uploader: when the upload queue is full the job is handed to overflow_fn
+    (the pending backlog) so a slow upload cannot delay the next grab.
+    """
+
+    def __init__(
+            self,
+            encode_fn: Callable[[CaptureJob], bool],
+            upload_fn: Callable[[CaptureJob], bool],
+            overflow_fn: Callable[[CaptureJob], None],
+            encoder_workers: int = 2,
+            encode_queue_size: int = 4,
+            upload_queue_size: int = 8,
+    ):
+        self.encode_fn = encode_fn
+        self.upload_fn = upload_fn
+        self.overflow_fn = overflow_fn
+        self.encoder_workers = max(1, int(encoder_workers))
+        self.encode_queue = queue.Queue(maxsize=max(1, int(encode_queue_size)))
+        self.upload_queue = queue.Queue(maxsize=max(1, int(upload_queue_size)))
+        self.stats = {
+            "grab": StageStats("grab"),
+            "encode": StageStats("encode", self.encode_queue),
+            "upload": StageStats("upload", self.upload_queue),
+        }
+        self.overflowed = 0
+        self.is_running = False
+        self._encoders = []
+        self._uploader = None
+
+    def start(self):
+        """Start the encoder pool and the uploader"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._encoders = [
+            threading.Thread(target=self._encode_worker, name=f"argus-encoder-{i}", daemon=True)
+            for i in range(self.encoder_workers)
+        ]
+        for worker in self._encoders:
+            worker.start()
+        self._uploader = threading.Thread(target=self._upload_worker, name="argus-uploader", daemon=True)
+        self._uploader.start()
+        logging.info(f"Capture pipeline started with {self.encoder_workers} encoder worker(s)")
+
+    def submit(self, job: CaptureJob, grab_seconds: float = 0.0) -> bool:
+        """Hand a grabbed frame to the encoders, blocking while the encode queue is full"""
+        if not self.is_running:
+            logging.warning("Cannot submit capture - pipeline not running")
+            return False
+
+        wait_start = time.monotonic()
+        self.encode_queue.put(job)
+        self.stats["grab"].record(grab_seconds, wait=time.monotonic() - wait_start)
+        job.enqueued_at = time.monotonic()
+        return True
+
+    def stop(self, timeout: Optional[float] = None):
+        """Flush queued jobs through every stage and stop the workers"""
+        if not self.is_running:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        for _ in self._encoders:
+            self.encode_queue.put(_STOP)
+        for worker in self._encoders:
+            worker.join(self._remaining(deadline))
+
+        self.upload_queue.put(_STOP)
+        if self._uploader is not None:
+            self._uploader.join(self._remaining(deadline))
+
+        if any(w.is_alive() for w in self._encoders) or (self._uploader and self._uploader.is_alive()):
+            logging.warning("Capture pipeline did not drain before timeout")
+        self.is_running = False
+        logging.info(f"Capture pipeline stopped: {self.get_stats()}")
+
+    def get_stats(self) -> dict:
+        """Per-stage queue depth and latency, used to spot the bottleneck stage"""
+        stats = {name: stage.snapshot() for name, stage in self.stats.items()}
+        stats["overflowed"] = self.overflowed
+        return stats
+
+    def _encode_worker(self):
+        while True:
+            job = self.encode_queue.get()
+            if job is _STOP:
+                break
+
+            wait = time.monotonic() - job.enqueued_at
+            started = time.monotonic()
+            try:
+                ok = self.encode_fn(job)
+            except Exception as e:
+                logging.error(f"Error encoding {job.filepath}: {e}")
+                ok = False
+            finally:
+                # The raw frame is no longer needed once encoded
+                job.frame = None
+            self.stats["encode"].record(time.monotonic() - started, wait=wait, ok=ok)
+
+            if not ok:
+                continue
+
+            job.enqueued_at = time.monotonic()
+            try:
+                self.upload_queue.put_nowait(job)
+            except queue.Full:
+                logging.warning("Upload stage saturated, moving capture to pending queue")
+                self.overflowed += 1
+                self.overflow_fn(job)
+
+    def _upload_worker(self):
+        while True:
+            job = self.upload_queue.get()
+            if job is _STOP:
+                break
+
+            wait = time.monotonic() - job.enqueued_at
+            started = time.monotonic()
+            try:
+                ok = self.upload_fn(job)
+            except Exception as e:
+                logging.error(f"Error uploading {job.filepath}: {e}")
+                ok = False
+            self.stats["upload"].record(time.monotonic() - started, wait=wait, ok=ok)
+
+            if not ok:
+                self.overflow_fn(job)
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
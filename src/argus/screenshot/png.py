@@ -0,0 +1,193 @@
+import os
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+from src.argus.screenshot.output import EncodeResult, HashingWriter
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_CHUNK_SIZE = 64 * 1024
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF)
+
+
+def _header(width: int, height: int, text: Optional[Dict[str, str]]) -> list:
+    """Signature, IHDR (8-bit RGB) and tEXt chunks"""
+    parts = [PNG_SIGNATURE, _chunk(b"IHDR", struct.pack(">2I5B", width, height, 8, 2, 0, 0, 0))]
+    for keyword, value in (text or {}).items():
+        parts.append(_chunk(b"tEXt", keyword.encode("latin-1") + b"\x00" + value.encode("latin-1")))
+    return parts
+
+
+def encode_png(rgb: bytes, size: Tuple[int, int], level: int = 6, text: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Encode 8-bit RGB pixels as PNG (same layout as mss.tools.to_png, plus optional tEXt chunks)
+    Args:
+        rgb: RGBRGB... pixel data
+        size: (width, height)
+        level: zlib compression level
+        text: keyword -> value pairs stored as tEXt chunks
+    """
+    width, height = size
+    line = width * 3
+    scanlines = b"".join(b"\x00" + rgb[y * line:(y + 1) * line] for y in range(height))
+
+    parts = _header(width, height, text)
+    parts.append(_chunk(b"IDAT", zlib.compress(scanlines, level)))
+    parts.append(_chunk(b"IEND", b""))
+    return b"".join(parts)
+
+
+def _write_chunk(out, tag: bytes, data) -> None:
+    """Write one chunk piece by piece instead of concatenating it first"""
+    out.write(struct.pack(">I", len(data)))
+    out.write(tag)
+    out.write(data)
+    out.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF))
+
+
+def write_frame_png(frame, output: str, level: int = 6, text: Optional[Dict[str, str]] = None,
+                    chunk_size: int = IDAT_CHUNK_SIZE) -> EncodeResult:
+    """
+    Stream a BGRA frame to disk as an RGB PNG.
+
+    Rows are read from the grab buffer one at a time, converted to RGB,
+    compressed and flushed as IDAT chunks of about chunk_size bytes while
+    the SHA-256 of the file is computed in the same pass. Peak memory is one
+    row plus one chunk whatever the frame size.
+    """
+    width, height = frame.size
+    stride = width * 4
+    view = memoryview(frame.raw)
+    line = bytearray(1 + width * 3)  # leading 0 = filter type None
+    compressor = zlib.compressobj(level)
+
+    with HashingWriter(output) as out:
+        for part in _header(width, height, text):
+            out.write(part)
+
+        pending = bytearray()
+        for y in range(height):
+            row = view[y * stride:(y + 1) * stride].tobytes()
+            line[1::3] = row[2::4]
+            line[2::3] = row[1::4]
+            line[3::3] = row[0::4]
+            pending += compressor.compress(line)
+            if len(pending) >= chunk_size:
+                _write_chunk(out, b"IDAT", pending)
+                pending.clear()
+
+        pending += compressor.flush()
+        _write_chunk(out, b"IDAT", pending)
+        _write_chunk(out, b"IEND", b"")
+    return out.close()
+
+
+def _write(data: bytes, output: str) -> int:
+    with open(output, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(data)
+
+
+def write_png(rgb: bytes, size: Tuple[int, int], output: str, level: int = 6,
+              text: Optional[Dict[str, str]] = None) -> int:
+    """Write RGB pixels as a PNG file; returns the number of bytes written"""
+    return _write(encode_png(rgb, size, level=level, text=text), output)
+
+
+def _unfilter(filter_type: int, line: bytearray, previous: bytes, bpp: int):
+    """Undo one PNG scanline filter in place"""
+    if filter_type == 0:
+        return
+    length = len(line)
+    if filter_type == 1:
+        for i in range(bpp, length):
+            line[i] = (line[i] + line[i - bpp]) & 0xFF
+    elif filter_type == 2:
+        for i in range(length):
+            line[i] = (line[i] + previous[i]) & 0xFF
+    elif filter_type == 3:
+        for i in range(length):
+            left = line[i - bpp] if i >= bpp else 0
+            line[i] = (line[i] + ((left + previous[i]) >> 1)) & 0xFF
+    elif filter_type == 4:
+        for i in range(length):
+            a = line[i - bpp] if i >= bpp else 0
+            b = previous[i]
+            c = previous[i - bpp] if i >= bpp else 0
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+            line[i] = (line[i] + predictor) & 0xFF
+    else:
+        raise ValueError(f"Unknown PNG filter type {filter_type}")
+
+
+def read_png_text(path: str) -> Dict[str, str]:
+    """tEXt chunks of a PNG, read without decoding the image (stops at the first IDAT)"""
+    text = {}
+    with open(path, "rb") as f:
+        if f.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+            raise ValueError(f"Not a PNG file: {path}")
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, tag = struct.unpack(">I4s", header)
+            if tag in (b"IDAT", b"IEND"):
+                break
+            if tag == b"tEXt":
+                keyword, _, value = f.read(length).partition(b"\x00")
+                text[keyword.decode("latin-1")] = value.decode("latin-1")
+                f.seek(4, os.SEEK_CUR)
+            else:
+                f.seek(length + 4, os.SEEK_CUR)
+    return text
+
+
+def read_png(path: str) -> Tuple[int, int, bytes, Dict[str, str]]:
+    """
+    Read an 8-bit RGB PNG such as the ones Argus writes
+    Returns:
+        (width, height, RGB pixel data, tEXt chunks)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"Not a PNG file: {path}")
+
+    width = height = 0
+    text = {}
+    compressed = []
+    offset = len(PNG_SIGNATURE)
+    while offset < len(data):
+        length, tag = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if tag == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">2I5B", body)
+            if depth != 8 or color_type != 2 or interlace:
+                raise ValueError(f"Unsupported PNG format in {path}: only 8-bit RGB is supported")
+        elif tag == b"tEXt":
+            keyword, _, value = body.partition(b"\x00")
+            text[keyword.decode("latin-1")] = value.decode("latin-1")
+        elif tag == b"IDAT":
+            compressed.append(body)
+        elif tag == b"IEND":
+            break
+
+    raw = zlib.decompress(b"".join(compressed))
+    line = width * 3
+    rgb = bytearray(line * height)
+    previous = bytes(line)
+    for y in range(height):
+        start = y * (line + 1)
+        scanline = bytearray(raw[start + 1:start + 1 + line])
+        _unfilter(raw[start], scanline, previous, 3)
+        rgb[y * line:(y + 1) * line] = scanline
+        previous = scanline
+    return width, height, bytes(rgb), text
@@ -0,0 +1,129 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from src.argus.logger import logging
+from src.argus.screenshot.codecs import ImageCodec, create_codec
+from src.argus.screenshot.grabber import Frame
+from src.argus.screenshot.output import EncodeResult
+from src.argus.screenshot.png import write_frame_png
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+def encode_frame(frame: Frame, filepath: str, codec: ImageCodec, text: Optional[Dict[str, str]] = None) -> EncodeResult:
+    """Encode in the current thread (tile deltas carry text and are always PNG)"""
+    if text is not None:
+        return write_frame_png(frame, filepath, level=codec.zlib_level, text=text)
+    return codec.encode(frame, filepath)
+
+
+def _encode_shared(shm_name: str, width: int, height: int, filepath: str, codec_options: dict,
+                   text: Optional[Dict[str, str]]):
+    """Worker process entry point: encode a frame that lives in shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = shm.buf[:width * height * 4]
+        error = None
+        try:
+            result = encode_frame(Frame(view, width, height), filepath, create_codec(codec_options), text)
+        except Exception as e:
+            # The traceback's frames hold slices of the buffer; drop them so the error is raised, not a BufferError
+            error = e.with_traceback(None)
+        # Every export of shm.buf must be released before the segment can be closed
+        view.release()
+        if error is not None:
+            raise error
+        return result.size, result.sha256
+    finally:
+        shm.close()
+
+
+class ProcessPoolEncoder:
+    """
+    Encodes frames in worker processes so CPU-bound compression does not
+    compete with the Tk thread and the pynput listener for the GIL.
+
+    Frames are handed over through multiprocessing.shared_memory (one copy
+    of the grab buffer, no pickling of pixel data). A pool that cannot start
+    or breaks (a worker died) is disabled and frames are encoded in the
+    calling thread from then on. An error raised while encoding (e.g. the
+    disk is full) fails only that frame, as it would in-thread.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, int(workers))
+        self.enabled = shared_memory is not None
+        self._pool = None
+        self._lock = threading.Lock()
+        if not self.enabled:
+            logging.warning("shared_memory unavailable, encoding in-thread")
+
+    def encode(self, frame: Frame, filepath: str, codec: ImageCodec,
+               text: Optional[Dict[str, str]] = None) -> EncodeResult:
+        """Encode in a worker process, falling back to the calling thread"""
+        pool = self._get_pool() if self.enabled else None
+        if pool is None:
+            return encode_frame(frame, filepath, codec, text)
+
+        size = frame.width * frame.height * 4
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+        except OSError as e:
+            logging.warning(f"No shared memory for this frame ({e}), encoding in-thread")
+            return encode_frame(frame, filepath, codec, text)
+        try:
+            shm.buf[:size] = frame.raw
+            try:
+                future = pool.submit(_encode_shared, shm.name, frame.width, frame.height, filepath,
+                                     codec.options(), text)
+            except (RuntimeError, OSError) as e:
+                # Workers are spawned by submit(): an OSError means they could not start. A plain
+                # RuntimeError means the pool was shut down after _get_pool(); the next frame gets a new one.
+                logging.warning(f"Process encoder unavailable ({e}), encoding in-thread")
+                if isinstance(e, (BrokenProcessPool, OSError)):
+                    self._disable()
+                return encode_frame(frame, filepath, codec, text)
+            # Anything the worker raised while encoding is re-raised here for the caller
+            encoded_size, sha256 = future.result()
+            return EncodeResult(encoded_size, sha256)
+        except BrokenProcessPool as e:
+            logging.warning(f"Process encoder failed ({e}), falling back to in-thread encoding")
+            self._disable()
+            return encode_frame(frame, filepath, codec, text)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._pool is None and self.enabled:
+                try:
+                    # spawn: forking a process that runs Tk and pynput threads is not safe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                    logging.info(f"Process encoder started with {self.workers} worker(s)")
+                except (OSError, ValueError, NotImplementedError) as e:
+                    logging.warning(f"Cannot start process encoder ({e}), encoding in-thread")
+                    self.enabled = False
+            return self._pool
+
+    def _disable(self):
+        with self._lock:
+            self.enabled = False
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
@@ -0,0 +1,175 @@
+import json
+import math
+import os
+from typing import List, Optional, Tuple
+
+from src.argus.screenshot.grabber import Frame
+from src.argus.screenshot.png import read_png, write_png
+
+# tEXt keywords carrying the tile metadata inside the PNG files
+KEYFRAME_KEY = "argus:keyframe"
+DELTA_KEY = "argus:delta"
+
+
+class TileDeltaEncoder:
+    """
+    Splits frames into tiles and keeps only the tiles that differ from the
+    last keyframe. Every keyframe_interval frames (or when the frame size
+    changes) a full keyframe is emitted instead.
+
+    Deltas are always taken against the keyframe, never the previous delta,
+    so any frame can be rebuilt from its keyframe plus a single delta file.
+    """
+
+    def __init__(self, tile_size: int = 64, keyframe_interval: int = 10):
+        self.tile_size = max(8, int(tile_size))
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.keyframe: Optional[Frame] = None
+        self.keyframe_id = ""
+        self.frames_since_keyframe = 0
+
+    def reset(self):
+        """Force the next frame to be a keyframe"""
+        self.keyframe = None
+        self.keyframe_id = ""
+        self.frames_since_keyframe = 0
+
+    def process(self, frame: Frame, frame_id: str) -> Tuple[Frame, dict]:
+        """
+        Decide between keyframe and delta for one grabbed frame
+        Args:
+            frame: the grabbed BGRA frame
+            frame_id: file name the frame will be stored under
+        Returns:
+            (frame to encode, metadata stored alongside it)
+        """
+        if (self.keyframe is None
+                or self.keyframe.size != frame.size
+                or self.frames_since_keyframe >= self.keyframe_interval):
+            # The mss buffer is not reused after the grab, so the keyframe can keep it without copying
+            self.keyframe = frame
+            self.keyframe_id = frame_id
+            self.frames_since_keyframe = 0
+            return frame, {"type": "keyframe", "id": frame_id}
+
+        self.frames_since_keyframe += 1
+        changed = self.changed_tiles(frame)
+        tile_map = {
+            "type": "delta",
+            "keyframe": self.keyframe_id,
+            "width": frame.width,
+            "height": frame.height,
+            "tile": self.tile_size,
+            "tiles": changed,
+        }
+        return self.pack_tiles(frame, changed), tile_map
+
+    def changed_tiles(self, frame: Frame) -> List[int]:
+        """Indices (row-major) of tiles that differ from the keyframe"""
+        size = self.tile_size
+        stride = frame.width * 4
+        columns = math.ceil(frame.width / size)
+        current = frame.raw
+        reference = self.keyframe.raw
+
+        changed = []
+        for ty in range(math.ceil(frame.height / size)):
+            band = set()
+            for y in range(ty * size, min((ty + 1) * size, frame.height)):
+                offset = y * stride
+                # Most rows are untouched; one whole-row compare rules out every tile on it
+                if current[offset:offset + stride] == reference[offset:offset + stride]:
+                    continue
+                for tx in range(columns):
+                    if tx in band:
+                        continue
+                    start = offset + tx * size * 4
+                    end = offset + min((tx + 1) * size, frame.width) * 4
+                    if current[start:end] != reference[start:end]:
+                        band.add(tx)
+                if len(band) == columns:
+                    break
+            changed.extend(ty * columns + tx for tx in sorted(band))
+        return changed
+
+    def pack_tiles(self, frame: Frame, tiles: List[int]) -> Frame:
+        """Copy the given tiles into a near-square grid image"""
+        size = self.tile_size
+        if not tiles:
+            # A 1x1 placeholder keeps the file a valid image
+            return Frame(bytearray(4), 1, 1)
+
+        columns = math.ceil(frame.width / size)
+        grid = math.ceil(math.sqrt(len(tiles)))
+        grid_rows = math.ceil(len(tiles) / grid)
+        packed_width = grid * size
+        packed = bytearray(packed_width * grid_rows * size * 4)
+        src_stride = frame.width * 4
+        dst_stride = packed_width * 4
+        src = memoryview(frame.raw)
+
+        for slot, tile in enumerate(tiles):
+            tx, ty = tile % columns, tile // columns
+            x_start = tx * size
+            width = min(size, frame.width - x_start) * 4
+            dst_x = (slot % grid) * size * 4
+            dst_y = (slot // grid) * size
+            for row in range(min(size, frame.height - ty * size)):
+                src_offset = (ty * size + row) * src_stride + x_start * 4
+                dst_offset = (dst_y + row) * dst_stride + dst_x
+                packed[dst_offset:dst_offset + width] = src[src_offset:src_offset + width]
+        return Frame(packed, packed_width, grid_rows * size)
+
+
+def tile_metadata(meta: dict) -> dict:
+    """tEXt chunks for a keyframe or delta PNG"""
+    if meta["type"] == "keyframe":
+        return {KEYFRAME_KEY: meta["id"]}
+    return {DELTA_KEY: json.dumps(meta, separators=(",", ":"))}
+
+
+def reconstruct(delta_path: str, keyframe_path: Optional[str] = None) -> Tuple[int, int, bytes]:
+    """
+    Rebuild the full frame stored as a tile delta
+    Args:
+        delta_path: delta PNG (a keyframe or a plain screenshot is returned as-is)
+        keyframe_path: keyframe PNG; defaults to the keyframe named in the delta, next to it
+    Returns:
+        (width, height, RGB pixel data)
+    """
+    width, height, rgb, text = read_png(delta_path)
+    if DELTA_KEY not in text:
+        return width, height, rgb
+
+    meta = json.loads(text[DELTA_KEY])
+    if keyframe_path is None:
+        keyframe_path = os.path.join(os.path.dirname(delta_path), meta["keyframe"])
+    key_width, key_height, key_rgb, _ = read_png(keyframe_path)
+    if (key_width, key_height) != (meta["width"], meta["height"]):
+        raise ValueError(f"Keyframe {keyframe_path} does not match delta {delta_path}")
+
+    size = meta["tile"]
+    columns = math.ceil(meta["width"] / size)
+    grid = width // size
+    out = bytearray(key_rgb)
+    out_stride = meta["width"] * 3
+    packed_stride = width * 3
+
+    for slot, tile in enumerate(meta["tiles"]):
+        tx, ty = tile % columns, tile // columns
+        x_start = tx * size
+        tile_width = min(size, meta["width"] - x_start) * 3
+        src_x = (slot % grid) * size * 3
+        src_y = (slot // grid) * size
+        for row in range(min(size, meta["height"] - ty * size)):
+            dst_offset = (ty * size + row) * out_stride + x_start * 3
+            src_offset = (src_y + row) * packed_stride + src_x
+            out[dst_offset:dst_offset + tile_width] = rgb[src_offset:src_offset + tile_width]
+    return meta["width"], meta["height"], bytes(out)
+
+
+def reconstruct_to_file(delta_path: str, output: str, keyframe_path: Optional[str] = None) -> str:
+    """Rebuild a delta into a standalone PNG at output"""
+    width, height, rgb = reconstruct(delta_path, keyframe_path)
+    write_png(rgb, (width, height), output)
+    return output
@@ -0,0 +1,165 @@
+import json
+import os
+from copy import deepcopy
+
+from src.argus.filemanager.file_manager import file_manager
+from src.argus.logger import logging
+
+# Built-in defaults; a fleet can override any option through config/settings.json
+DEFAULT_SETTINGS = {
+    "pipeline": {
+        "encoder_workers": 2,
+        # >0 moves encoding into that many worker processes (frames shared, not pickled); 0 encodes in-thread
+        "encoder_processes": 0,
+        "encode_queue_size": 4,
+        "upload_queue_size": 8,
+        "stop_timeout_sec": 60,
+    },
+    "http": {
+        "base_url": "https://sggsapp.co.in/etracker",
+        # Keep-alive connections kept per host; should cover backlog.concurrency
+        "pool_connections": 2,
+        "pool_maxsize": 8,
+        "connect_timeout_sec": 5.0,
+        "read_timeout_sec": 30.0,
+    },
+    "api": {
+        # Attempts per request for connection errors, timeouts, 429 and 5xx (backoff with full jitter)
+        "retry_attempts": 3,
+        "retry_base_sec": 0.5,
+        "retry_max_sec": 8.0,
+        # Failed requests in a row that open the circuit breaker, and how long it stays open
+        "breaker_threshold": 5,
+        "breaker_reset_sec": 30.0,
+        "breaker_max_reset_sec": 300.0,
+    },
+    "bandwidth": {
+        # Opt-in upload budget in bytes/s (0 = unlimited) and burst size; live captures go ahead of the backlog
+        "limit_bytes_per_sec": 0,
+        "burst_bytes": 256 * 1024,
+        # Follow the measured link throughput between min and max (max 0 = no cap),
+        # using at most `headroom` of it
+        "adaptive": False,
+        "headroom": 0.8,
+        "min_bytes_per_sec": 32 * 1024,
+        "max_bytes_per_sec": 0,
+    },
+    "connectivity": {
+        # Probe connection to the API host: timeout, retry interval while offline,
+        # and how long without any traffic before the cached state is re-checked
+        "probe_timeout_sec": 3.0,
+        "offline_probe_sec": 5.0,
+        "stale_after_sec": 60.0,
+    },
+    "backlog": {
+        # Uploads in flight while draining the pending queue
+        "concurrency": 4,
+        # A failed item waits retry_base_sec * 2^(attempts-1), capped at retry_max_sec
+        "retry_base_sec": 5.0,
+        "retry_max_sec": 300.0,
+        # Items per request when the server supports batch uploads (1 disables batching)
+        "batch_size": 10,
+        # Screenshot bytes per batch request
+        "max_batch_bytes": 8 * 1024 * 1024,
+    },
+    "compaction": {
+        # Past this backlog size or item age, queued screenshots are re-encoded with the codec below
+        "reencode_after_items": 500,
+        "reencode_after_sec": 6 * 3600,
+        "format": "jpeg",
+        "quality": 60,
+        "max_width": 1280,
+        "max_height": 0,
+        # Past this size or age, runs of never-sent records are merged into one of every keep_one_in
+        # (work seconds are summed into the kept record; 0 disables a trigger)
+        "thin_after_items": 2000,
+        "thin_after_sec": 24 * 3600,
+        "keep_one_in": 4,
+        "interval_sec": 300.0,
+        "batch_size": 50,
+    },
+    "retention": {
+        # Disk budget for screenshots; the oldest files are evicted, uploaded ones first (0 = no quota)
+        "quota_bytes": 2 * 1024 ** 3,
+        # Uploaded screenshots are kept this long, then "delete"d, "compact"ed to thumbnails (Pillow) or "keep"
+        "grace_sec": 24 * 3600,
+        "uploaded_action": "delete",
+        # Background pass interval and the most files one pass touches
+        "interval_sec": 60.0,
+        "batch_size": 200,
+    },
+    "journal": {
+        # Session events are flushed on every append; fsync is batched over this interval
+        "sync_interval_sec": 5.0,
+        # How often the "still running" mark is refreshed (bounds the time a crash can lose)
+        "heartbeat_sec": 30.0,
+    },
+    "capture": {
+        # "virtual" grabs the bounding box of all monitors, "per_monitor" grabs each one
+        "mode": "virtual",
+        # per_monitor only: "composite" packs monitors into one image, "separate" uploads one per monitor
+        "output": "composite",
+        # How often the monitor layout is re-checked for hot-plug and resolution changes
+        "layout_check_sec": 5.0,
+    },
+    "codec": {
+        # "png", or "jpeg"/"webp" when Pillow is installed
+        "format": "png",
+        "quality": 80,
+        "zlib_level": 6,
+        # 0 keeps the captured resolution
+        "max_width": 0,
+        "max_height": 0,
+    },
+    "tiles": {
+        # Upload only tiles that changed since the last keyframe (stored as PNG)
+        "enabled": False,
+        "tile_size": 64,
+        "keyframe_interval": 10,
+    },
+    "change_detection": {
+        "enabled": True,
+        "grid_size": 16,
+        "block_tolerance": 8,
+        "threshold": 0.01,
+        "max_consecutive_skips": 5,
+    },
+}
+
+
+class Settings:
+    def __init__(self, filename="settings.json"):
+        self.path = os.path.join(file_manager.get_path("config"), filename)
+        self.values = self._load()
+
+    def _load(self) -> dict:
+        """Merge the settings file over the built-in defaults"""
+        values = deepcopy(DEFAULT_SETTINGS)
+        if not os.path.exists(self.path):
+            return values
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable settings file {self.path}: {e}")
+            return values
+
+        for section, options in overrides.items():
+            if isinstance(options, dict):
+                values.setdefault(section, {}).update(options)
+            else:
+                logging.warning(f"Ignoring settings section '{section}': expected an object")
+        return values
+
+    def get(self, section: str, key: str, default=None):
+        """Get a single option from a settings section"""
+        return self.values.get(section, {}).get(key, default)
+
+    def section(self, name: str) -> dict:
+        """Get a copy of a whole settings section"""
+        return dict(self.values.get(name, {}))
+
+
+# Singleton instance
+settings = Settings()
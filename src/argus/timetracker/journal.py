@@ -0,0 +1,215 @@
+import os
+import threading
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.argus.logger import logging
+
+EVENTS = ("start", "pause", "resume", "capture", "stop")
+
+
+class RecoveredSession:
+    """State of a session that ended without a clean stop, as replayed from the journal"""
+
+    __slots__ = ("user_id", "start_time", "pauses", "paused_since", "last_capture", "last_seen")
+
+    def __init__(self, user_id: str, start_time: datetime):
+        self.user_id = user_id
+        self.start_time = start_time
+        self.pauses: List[Tuple[datetime, datetime]] = []
+        self.paused_since: Optional[datetime] = None
+        self.last_capture: Optional[datetime] = None
+        self.last_seen = start_time
+
+    def __repr__(self):
+        return (f"RecoveredSession(user={self.user_id!r}, started={self.start_time}, pauses={len(self.pauses)}, "
+                f"last_seen={self.last_seen})")
+
+
+class SessionJournal:
+    """
+    Append-only log of the tracking session, so a crash doesn't lose the day.
+
+    One short text line per event ("<event> <ISO time> [<user>]"): start,
+    pause, resume, capture and stop. Each append is flushed to the OS at
+    once, which survives an application crash. fsync is batched: a
+    background thread syncs every sync_interval_sec if anything was
+    written, so appends never wait on the disk. A power loss can lose at
+    most the last sync interval. The same thread writes the current time
+    to a small .alive file every heartbeat_sec, which tells recovery when
+    the app was last running.
+
+    The journal is wired to TimeTracker as a listener. recover() replays it
+    on the next launch: the time between the last sign of life and the
+    restart counts as a pause, so the restored active time is exact up to
+    one heartbeat.
+    """
+
+    def __init__(self, path: str, sync_interval_sec: float = 5.0, heartbeat_sec: float = 30.0):
+        self.path = path
+        self.alive_path = path + ".alive"
+        self.sync_interval_sec = sync_interval_sec
+        self.heartbeat_sec = heartbeat_sec
+        self.user_id = ""
+        self.appends = 0
+        self.syncs = 0
+        self._file = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def on_tracker_event(self, event: str, at: datetime):
+        """TimeTracker listener"""
+        if event == "start":
+            self.begin(at)
+        elif event == "reset":
+            self.end(at)
+        else:
+            self.record(event, at)
+
+    def begin(self, at: datetime):
+        """Start a new journal for self.user_id (any previous one is discarded)"""
+        with self._lock:
+            self._close_file()
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write(f"start {at.isoformat()} {self.user_id}")
+            self._sync()
+        self._write_alive()
+        self._start_thread()
+
+    def reopen(self, session: RecoveredSession, now: datetime):
+        """Continue a recovered session's journal, recording the downtime as a pause"""
+        with self._lock:
+            self._close_file()
+            self._file = open(self.path, "a", encoding="utf-8")
+            if session.paused_since is None:
+                self._write(f"pause {session.last_seen.isoformat()}")
+            self._write(f"resume {now.isoformat()}")
+            self._sync()
+        self._write_alive()
+        self._start_thread()
+
+    def record(self, event: str, at: datetime):
+        """Append one event; cheap enough to call on every capture"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._write(f"{event} {at.isoformat()}")
+
+    def end(self, at: datetime):
+        """Clean end of the session: nothing is left to recover"""
+        self._stopped.set()
+        with self._lock:
+            if self._file is None:
+                return
+            self._write(f"stop {at.isoformat()}")
+            self._sync()
+            self._close_file()
+        for path in (self.path, self.alive_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _write(self, line: str):
+        self._file.write(line + "\n")
+        self._file.flush()
+        self._dirty = True
+        self.appends += 1
+
+    def _sync(self):
+        if self._file is not None and self._dirty:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+            self.syncs += 1
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_alive(self):
+        try:
+            with open(self.alive_path, "w", encoding="utf-8") as f:
+                f.write(datetime.now().isoformat())
+        except OSError as e:
+            logging.warning(f"Could not write session heartbeat: {e}")
+
+    def _start_thread(self):
+        self._stopped.clear()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="argus-journal", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        waited = 0.0
+        while not self._stopped.wait(self.sync_interval_sec):
+            with self._lock:
+                try:
+                    self._sync()
+                except (OSError, ValueError) as e:
+                    logging.warning(f"Session journal sync failed: {e}")
+            waited += self.sync_interval_sec
+            if waited >= self.heartbeat_sec:
+                waited = 0.0
+                self._write_alive()
+
+    def recover(self, user_id: str) -> Optional[RecoveredSession]:
+        """Replay an interrupted session of this user; None if the last session ended cleanly"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.warning(f"Could not read session journal {self.path}: {e}")
+            return None
+
+        session = None
+        for line in lines:
+            parts = line.split()
+            if len(parts) < 2 or parts[0] not in EVENTS:
+                continue
+            try:
+                at = datetime.fromisoformat(parts[1])
+            except ValueError:
+                # A torn last line from the crash
+                continue
+            event = parts[0]
+            if event == "start":
+                session = RecoveredSession(parts[2] if len(parts) > 2 else "", at)
+                continue
+            if session is None:
+                continue
+            if event == "stop":
+                session = None
+                continue
+            if event == "pause":
+                if session.paused_since is None:
+                    session.paused_since = at
+            elif event == "resume":
+                if session.paused_since is not None:
+                    session.pauses.append((session.paused_since, at))
+                    session.paused_since = None
+            elif event == "capture":
+                session.last_capture = at
+            session.last_seen = max(session.last_seen, at)
+
+        if session is None:
+            return None
+        if session.user_id != str(user_id):
+            logging.info(f"Discarding interrupted session of another user ({session.user_id})")
+            return None
+        try:
+            with open(self.alive_path, "r", encoding="utf-8") as f:
+                session.last_seen = max(session.last_seen, datetime.fromisoformat(f.read().strip()))
+        except (OSError, ValueError):
+            pass
+        logging.info(f"Recovered interrupted session from {self.path}: {session}")
+        return session
+
+    def get_stats(self) -> dict:
+        return {"appends": self.appends, "syncs": self.syncs, "open": self._file is not None}
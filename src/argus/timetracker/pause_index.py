@@ -0,0 +1,87 @@
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Tuple
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class PauseIndex:
+    """
+    Completed pause intervals, sorted and array-backed, with prefix sums.
+
+    Times are stored as integer microseconds from the first pause (exact,
+    unlike float timestamps), in parallel arrays of starts and ends plus
+    prefix[i] = total length of the first i intervals. The paused time
+    before any instant is then one binary search away, so overlap with any
+    range costs O(log n) however long the session has been running.
+    Intervals must not overlap; they normally arrive in time order
+    (append is O(1)), an out-of-order one is inserted in place.
+    """
+
+    def __init__(self):
+        self._origin: Optional[datetime] = None
+        self._starts = array("q")
+        self._ends = array("q")
+        self._prefix = array("q", [0])
+
+    def _offset(self, moment: datetime) -> int:
+        return (moment - self._origin) // _MICROSECOND
+
+    def _moment(self, offset: int) -> datetime:
+        return self._origin + offset * _MICROSECOND
+
+    def add(self, start: datetime, end: datetime):
+        """Record a completed pause [start, end)"""
+        if end <= start:
+            return
+        if self._origin is None:
+            self._origin = start
+        start_us, end_us = self._offset(start), self._offset(end)
+        if not self._starts or start_us >= self._starts[-1]:
+            self._starts.append(start_us)
+            self._ends.append(end_us)
+            self._prefix.append(self._prefix[-1] + end_us - start_us)
+            return
+
+        # Clock moved back: insert in order and rebuild the sums from there
+        position = bisect_right(self._starts, start_us)
+        self._starts.insert(position, start_us)
+        self._ends.insert(position, end_us)
+        self._prefix.append(0)
+        for i in range(position, len(self._starts)):
+            self._prefix[i + 1] = self._prefix[i] + self._ends[i] - self._starts[i]
+
+    def _paused_before(self, offset: int) -> int:
+        """Microseconds of pause between the first interval and offset"""
+        count = bisect_right(self._starts, offset)
+        if count and self._ends[count - 1] > offset:
+            # offset falls inside interval count-1: only part of it counts
+            return self._prefix[count - 1] + offset - self._starts[count - 1]
+        return self._prefix[count]
+
+    def overlap(self, start: datetime, end: datetime) -> timedelta:
+        """Total paused time inside [start, end)"""
+        if self._origin is None or end <= start:
+            return timedelta()
+        return (self._paused_before(self._offset(end)) - self._paused_before(self._offset(start))) * _MICROSECOND
+
+    @property
+    def total(self) -> timedelta:
+        return self._prefix[-1] * _MICROSECOND
+
+    def clear(self):
+        self._origin = None
+        self._starts = array("q")
+        self._ends = array("q")
+        self._prefix = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[Tuple[datetime, datetime]]:
+        for start, end in zip(self._starts, self._ends):
+            yield self._moment(start), self._moment(end)
+
+    def __getitem__(self, index: int) -> Tuple[datetime, datetime]:
+        return self._moment(self._starts[index]), self._moment(self._ends[index])
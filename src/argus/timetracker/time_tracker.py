@@ -1,6 +1,8 @@
 from src.argus.logger import logging
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from src.argus.timetracker.pause_index import PauseIndex
 
 
 class TimeTracker:
@@ -8,8 +10,21 @@ class TimeTracker:
         self.start_time = None
         self.is_paused = False
         self.current_pause_start = None
-        self.pause_sessions: List[Tuple[datetime, datetime]] = []
+        # Completed pauses; auto-pause adds one per idle period, so lookups must not scan them
+        self.pause_sessions = PauseIndex()
         self.total_paused_time = timedelta()
+        # Called with (event, time) on "start", "pause", "resume" and "reset" (e.g. the session journal)
+        self._listeners: List[Callable[[str, datetime], None]] = []
+
+    def add_listener(self, callback: Callable[[str, datetime], None]):
+        self._listeners.append(callback)
+
+    def _emit(self, event: str, at: datetime):
+        for callback in self._listeners:
+            try:
+                callback(event, at)
+            except Exception as e:
+                logging.warning(f"Time tracker listener failed on {event}: {e}")
 
     def start(self):
         """Start tracking for the first time"""
@@ -17,6 +32,7 @@ class TimeTracker:
             self.start_time = datetime.now()
             self.is_paused = False
             logging.info(f"Time tracker started at {self.start_time}")
+            self._emit("start", self.start_time)
         else:
             logging.warning("Time tracker already started. Use resume() to continue after pause.")
 
@@ -26,6 +42,7 @@ class TimeTracker:
             self.current_pause_start = datetime.now()
             self.is_paused = True
             logging.info(f"Time tracker paused at {self.current_pause_start}")
+            self._emit("pause", self.current_pause_start)
         else:
             logging.warning("Time tracker is already paused or not started")
 
@@ -35,7 +52,7 @@ class TimeTracker:
             pause_end = datetime.now()
             # Record this pause session
             pause_duration = pause_end - self.current_pause_start
-            self.pause_sessions.append((self.current_pause_start, pause_end))
+            self.pause_sessions.add(self.current_pause_start, pause_end)
             self.total_paused_time += pause_duration
 
             # Reset pause state
@@ -43,6 +60,7 @@ class TimeTracker:
             self.current_pause_start = None
 
             logging.info(f"Time tracker resumed at {pause_end}. Pause duration: {pause_duration}")
+            self._emit("resume", pause_end)
         else:
             logging.warning("Time tracker is not paused or not started")
 
@@ -54,6 +72,23 @@ class TimeTracker:
         self.pause_sessions.clear()
         self.total_paused_time = timedelta()
         logging.info("Time tracker reset")
+        self._emit("reset", datetime.now())
+
+    def restore(self, start_time: datetime, pauses: Iterable[Tuple[datetime, datetime]],
+                paused_since: Optional[datetime] = None):
+        """
+        Rebuild an interrupted session (see SessionJournal.recover); listeners are not told.
+        The tracker is running again, or paused since paused_since.
+        """
+        self.start_time = start_time
+        self.pause_sessions.clear()
+        for pause_start, pause_end in pauses:
+            self.pause_sessions.add(pause_start, pause_end)
+        self.total_paused_time = self.pause_sessions.total
+        self.is_paused = paused_since is not None
+        self.current_pause_start = paused_since
+        logging.info(f"Time tracker restored: started {start_time}, {len(self.pause_sessions)} pause(s), "
+                     f"worked {self.get_formatted_time()}")
 
     def get_elapsed_time(self) -> timedelta:
         """Get actual worked time (excluding all paused time)"""
@@ -92,16 +127,8 @@ class TimeTracker:
         if not self.start_time or start_time >= end_time:
             return timedelta()
 
-        total_paused = timedelta()
-
-        # Check completed pause sessions
-        for pause_start, pause_end in self.pause_sessions:
-            # Find overlap between pause session and time range
-            overlap_start = max(pause_start, start_time)
-            overlap_end = min(pause_end, end_time)
-
-            if overlap_start < overlap_end:
-                total_paused += overlap_end - overlap_start
+        # Completed pause sessions: binary search over the prefix sums
+        total_paused = self.pause_sessions.overlap(start_time, end_time)
 
         # Check current pause session if active
         if self.is_paused and self.current_pause_start:
@@ -3,6 +3,7 @@ import sys
 import customtkinter as ctk
 
 from src.argus.api.auth import AuthAPI
+from src.argus.api.transport import transport
 from src.argus.exceptions import CustomException
 from src.argus.ui.main_window import MainAppUI
 from src.argus.ui.register_window import RegisterWindow
@@ -32,6 +33,9 @@ class LoginAppUI:
         # Initialize variables for input validation
         self.is_logging_in = False
 
+        # Handshake with the server while the user types, so login doesn't pay for it
+        transport.prewarm()
+
     def _center_window(self):
         """Center the window on the screen"""
         self.root.update_idletasks()
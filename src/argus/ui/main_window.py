@@ -1,16 +1,20 @@
 import sys
 import threading
 import time
+import tkinter as tk
 from datetime import datetime
 from tkinter import messagebox
 
 import customtkinter as ctk
 
+from src.argus.api.tracker import api_client
 from src.argus.exceptions import CustomException
 from src.argus.logger import logging
 from src.argus.mousetracking.clicktracker import ClickTracker
+from src.argus.reports.heatmap import ACTIVE, IDLE, MINUTES_PER_DAY, PAUSED, DayHeatmap
 from src.argus.screenshot.capture import ScreenshotCapture
-from src.argus.utils.utils import get_random_interval, show_temp_dialog, has_internet_connection, ask_yes_no_dialog
+from src.argus.utils.connectivity import connectivity
+from src.argus.utils.utils import get_random_interval, show_temp_dialog, ask_yes_no_dialog
 
 
 class ModernProgressBar(ctk.CTkFrame):
@@ -78,6 +82,54 @@ class StatusIndicator(ctk.CTkFrame):
         self._animating = False
 
 
+class ActivityHeatmapView(ctk.CTkFrame):
+    """Today's activity as a 24 x 60 grid of minute cells (one row per hour)"""
+
+    CELL_WIDTH = 8
+    CELL_HEIGHT = 4
+    EMPTY_COLOR = "#2b2b2b"
+    STATE_COLORS = {IDLE: "#7f8c8d", PAUSED: "#f39c12"}
+    # Active minutes get brighter with the number of clicks in them
+    CLICK_COLORS = ((10, "#a9f5c1"), (3, "#2ecc71"), (1, "#27ae60"), (0, "#1e5631"))
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.canvas = tk.Canvas(
+            self,
+            width=60 * self.CELL_WIDTH,
+            height=24 * self.CELL_HEIGHT,
+            bg=self.EMPTY_COLOR,
+            highlightthickness=0
+        )
+        self.canvas.pack()
+        # One rectangle per minute, created once; refreshes only recolour the ones that changed
+        self.cells = []
+        for minute in range(MINUTES_PER_DAY):
+            hour, column = divmod(minute, 60)
+            x, y = column * self.CELL_WIDTH, hour * self.CELL_HEIGHT
+            self.cells.append(self.canvas.create_rectangle(
+                x, y, x + self.CELL_WIDTH - 1, y + self.CELL_HEIGHT - 1, fill=self.EMPTY_COLOR, width=0
+            ))
+        self.colors = [self.EMPTY_COLOR] * MINUTES_PER_DAY
+
+    def _color(self, state: int, clicks: int) -> str:
+        if state != ACTIVE:
+            return self.STATE_COLORS.get(state, self.EMPTY_COLOR)
+        for threshold, color in self.CLICK_COLORS:
+            if clicks >= threshold:
+                return color
+        return self.EMPTY_COLOR
+
+    def render(self, heatmap: DayHeatmap):
+        """Draw a day straight from its minute arrays"""
+        states, clicks = heatmap.states, heatmap.clicks
+        for minute in range(MINUTES_PER_DAY):
+            color = self._color(states[minute], clicks[minute])
+            if color != self.colors[minute]:
+                self.colors[minute] = color
+                self.canvas.itemconfigure(self.cells[minute], fill=color)
+
+
 class MainAppUI:
 
     def __init__(self, user_id_num: str, username: str):
@@ -89,7 +141,10 @@ class MainAppUI:
         try:
             self.click_tracker = ClickTracker(inactivity_threshold=120)
             self.click_tracker.callback = self._handle_inactivity
+            # Activity transitions are detected off the Tk thread; widgets are only touched on it
+            self.click_tracker.dispatcher = self._call_on_ui
             self.capture = ScreenshotCapture(self.click_tracker)
+            self.capture.upload_callback = self._handle_upload_result
         except Exception as e:
             logging.error(f"Failed to initialize tracking components: {e}")
             messagebox.showerror("Initialization Error", f"Failed to initialize tracking: {e}")
@@ -109,7 +164,7 @@ class MainAppUI:
         """Setup main window with modern styling"""
         self.root = ctk.CTk()
         self.root.title("Argus Work Tracker v1.0")
-        self.root.geometry("600x500")
+        self.root.geometry("600x630")
         self.root.resizable(False, False)
 
         # Modern dark theme
@@ -120,7 +175,7 @@ class MainAppUI:
         self.root.update_idletasks()
         x = (self.root.winfo_screenwidth() // 2) - (500 // 2)
         y = (self.root.winfo_screenheight() // 2) - (400 // 2)
-        self.root.geometry(f"600x500+{x}+{y}")
+        self.root.geometry(f"600x630+{x}+{y}")
 
         # Setup window close handler
         self.root.protocol("WM_DELETE_WINDOW", self._on_window_close)
@@ -144,6 +199,9 @@ class MainAppUI:
         # Progress and time section
         self._create_progress_section(main_container)
 
+        # Today's activity heatmap
+        self._create_heatmap_section(main_container)
+
         # Footer section
         self._create_footer_section(main_container)
 
@@ -269,6 +327,35 @@ class MainAppUI:
         )
         self.session_label.pack()
 
+    def _create_heatmap_section(self, parent):
+        """Create today's activity heatmap"""
+        heatmap_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        heatmap_frame.pack(fill="x", pady=(0, 20))
+
+        heatmap_label = ctk.CTkLabel(
+            heatmap_frame,
+            text="🔥 Today's activity (00:00 - 23:59, one row per hour)",
+            font=("Arial", 11),
+            text_color="#7f8c8d"
+        )
+        heatmap_label.pack()
+
+        self.heatmap_view = ActivityHeatmapView(heatmap_frame)
+        self.heatmap_view.pack()
+
+    def _update_heatmap(self):
+        """Redraw today's heatmap from the live minute arrays"""
+        try:
+            heatmap = self.capture.heatmap
+            if heatmap.user_id:
+                self.heatmap_view.render(heatmap.current)
+            else:
+                # Nothing tracked yet in this run: show what was saved for today
+                self.heatmap_view.render(heatmap.load(self.user_id_num, datetime.now().date()))
+        except Exception as e:
+            logging.error(f"Error updating activity heatmap: {e}")
+        self.root.after(30000, self._update_heatmap)
+
     def _create_footer_section(self, parent):
         """Create footer with additional info"""
         footer_frame = ctk.CTkFrame(parent, height=60, fg_color="#34495e")
@@ -286,7 +373,7 @@ class MainAppUI:
     def _safe_start_capture(self):
         """Safely start capture with error handling"""
         try:
-            if has_internet_connection():
+            if connectivity.is_online:
                 self.start_capture()
             else:
                 self.is_internet_connected = False
@@ -324,6 +411,9 @@ class MainAppUI:
             if not response:
                 return
 
+        # Have a warm connection ready for the first upload
+        api_client.prewarm()
+
         # Start capture
         self.capture.start(self.user_id_num)
         self.work_session_start = datetime.now()
@@ -335,10 +425,7 @@ class MainAppUI:
         self.session_label.configure(text=f"📊 Session started: {self.work_session_start.strftime('%H:%M:%S')}")
         self.info_label.configure(text="🏁 Session running")
 
-        # Capture initial screenshot
-        self.capture.capture()
-
-        # Start background tasks
+        # Start background tasks (the capture loop takes the initial screenshot)
         threading.Thread(target=self._run_capture_loop, daemon=True).start()
         self._update_work_time()
 
@@ -382,23 +469,44 @@ class MainAppUI:
                 f"Work session completed!\nDuration: {hours:02d}:{minutes:02d}:{seconds:02d}"
             )
 
+        self._start_finishing()
+
+    def _start_finishing(self, on_done=None):
+        """Show the stopping state and flush the session in the background"""
         self.session_label.configure(text="Stopping, please wait!")
         self.info_label.configure(text="Uploading screenshot")
-        # Upload last image
-        self.capture.capture()
+        self._update_button_states(start=False, pause=False, stop=False)
+        self.status_indicator.stop_animation()
+
+        # Final capture and pipeline flush run off the Tk thread so the window stays responsive
+        threading.Thread(target=self._finish_session, args=(on_done,), daemon=True).start()
 
+    def _finish_session(self, on_done=None):
+        """Upload the last image and stop the capture pipeline, then run on_done on the Tk thread"""
+        try:
+            self.capture.capture()
+            self.capture.stop()
+        except Exception as e:
+            logging.error(f"Error finishing session: {e}")
+        self.root.after(0, on_done or self._on_capture_stopped)
+
+    def _on_capture_stopped(self):
+        """Update the UI once the session has been flushed"""
         self._update_button_states(start=True, pause=False, stop=False)
         self.status_indicator.set_status("stopped", "#e74c3c")
-        self.capture.stop()
-        self.status_indicator.stop_animation()
         self.session_label.configure(text="Last Session Completed")
         self.info_label.configure(text="Screenshot Uploaded")
 
-
         logging.info("Capture stopped")
 
+    def _handle_upload_result(self, success: bool):
+        """Called from the upload worker once a capture has been sent or queued"""
+        status_text = "✅ Upload successful" if success else "❌ Upload failed"
+        color = "#2ecc71" if success else "#e74c3c"
+        self.root.after(0, lambda: self.info_label.configure(text=status_text, text_color=color))
+
     def _handle_inactivity(self, activity: bool):
-        """Enhanced inactivity handling with better logging"""
+        """Auto-pause / auto-resume on activity transitions (runs on the Tk thread)"""
         logging.debug(f"Inactivity handler called: activity={activity}")
 
         try:
@@ -424,6 +532,12 @@ class MainAppUI:
 
     def _run_capture_loop(self):
         """Enhanced capture loop with better error handling"""
+        # Initial screenshot
+        try:
+            self.capture.capture()
+        except Exception as e:
+            logging.error(f"Error taking initial capture: {e}")
+
         while self.capture.is_running:
             try:
                 if not self.capture.is_paused:
@@ -431,13 +545,9 @@ class MainAppUI:
                     logging.debug(f"Next capture in {random_time} seconds")
                     time.sleep(random_time)
 
-                    if self.capture.is_running:
-                        success = self.capture.capture()
-                        status_text = "✅ Upload successful" if success else "❌ Upload failed"
-                        color = "#2ecc71" if success else "#e74c3c"
-
+                    if self.capture.is_running and not self.capture.capture():
                         self.root.after(0, lambda: self.info_label.configure(
-                            text=status_text, text_color=color
+                            text="❌ Capture failed", text_color="#e74c3c"
                         ))
                 else:
                     time.sleep(1)  # Check every second when paused
@@ -466,42 +576,48 @@ class MainAppUI:
                 logging.error(f"Error updating work time: {e}")
                 self.root.after(5000, self._update_work_time)  # Retry in 5 seconds
 
-    def _check_internet_periodically(self):
-        """Enhanced internet checking with better UI feedback"""
+    def _call_on_ui(self, fn, *args):
+        """Run fn(*args) on the Tk thread"""
         try:
-            self.is_internet_connected = has_internet_connection()
-
-            if self.is_internet_connected and self.capture.is_running:
-                try:
-                    self.capture._upload_pending_screenshots()
-                except Exception as e:
-                    logging.warning(f"Error uploading pending screenshots: {e}")
-            self.last_internet_check = datetime.now()
-
-            if self.is_internet_connected:
-                self.internet_label.configure(
-                    text="🌐 Connected",
-                    text_color="#2ecc71"
-                )
-            else:
-                self.internet_label.configure(
-                    text="📡 Offline",
-                    text_color="#e74c3c"
-                )
+            self.root.after(0, fn, *args)
+        except RuntimeError:
+            pass  # Window already destroyed
 
-        except Exception as e:
-            logging.warning(f"Error checking internet: {e}")
+    def _on_connectivity_change(self, online: bool):
+        """Connectivity monitor callback (runs off the Tk thread)"""
+        try:
+            self.root.after(0, self._show_connectivity, online)
+        except RuntimeError:
+            pass  # Window already destroyed
+
+    def _show_connectivity(self, online):
+        """Reflect the cached connectivity state in the UI"""
+        self.is_internet_connected = online is not False
+        self.last_internet_check = datetime.now()
+
+        if online is None:
             self.internet_label.configure(
                 text="❓ Unknown",
                 text_color="#f39c12"
             )
-
-        # Schedule next check
-        self.root.after(4000, self._check_internet_periodically)
+        elif online:
+            self.internet_label.configure(
+                text="🌐 Connected",
+                text_color="#2ecc71"
+            )
+        else:
+            self.internet_label.configure(
+                text="📡 Offline",
+                text_color="#e74c3c"
+            )
 
     def _start_background_tasks(self):
         """Start all background tasks"""
-        self._check_internet_periodically()
+        # Pushed updates instead of polling: no network call ever runs on the Tk thread
+        connectivity.subscribe(self._on_connectivity_change)
+        connectivity.start()
+        self._show_connectivity(connectivity.state)
+        self._update_heatmap()
 
     def _update_button_states(self, start: bool, pause: bool, stop: bool):
         """Update button states consistently"""
@@ -539,8 +655,9 @@ class MainAppUI:
                 "Tracking is still active. Stop tracking and exit?"
             )
             if response:
-                self.stop_capture()
-                self.root.destroy()
+                # Same off-thread flush as Stop; the window closes once it is done
+                self.root.protocol("WM_DELETE_WINDOW", lambda: None)
+                self._start_finishing(on_done=self.root.destroy)
         else:
             self.root.destroy()
 
@@ -564,6 +681,7 @@ class MainAppUI:
 
         finally:
             # Cleanup
+            connectivity.unsubscribe(self._on_connectivity_change)
             if hasattr(self, 'capture') and self.capture.is_running:
                 self.capture.stop()
             logging.info("Application cleanup completed")
@@ -0,0 +1,219 @@
+import os
+import struct
+import threading
+import time
+from itertools import groupby
+from typing import Callable, List, Optional
+
+from src.argus.logger import logging
+from src.argus.screenshot.codecs import create_codec
+from src.argus.screenshot.grabber import Frame
+from src.argus.screenshot.png import read_png, read_png_text
+from src.argus.screenshot.tiles import DELTA_KEY, KEYFRAME_KEY
+from src.argus.uploadqueue.drainer import BacklogDrainer
+from src.argus.uploadqueue.idempotency import merge_idempotency_keys
+from src.argus.uploadqueue.persistent_queue import PendingUpload, PersistentUploadQueue
+
+# Pillow is optional: without it only Argus' own PNGs can be decoded for re-encoding
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class BacklogCompactor:
+    """
+    Bounds the pending backlog while the server stays out of reach.
+
+    Two stages, each applied to the oldest items once the backlog is past a
+    size or an age, at most batch_size items per pass:
+      - thin: runs of keep_one_in never-sent items of one employee collapse
+        into one record. The latest screenshot of the run is kept, the
+        others are deleted, and their work seconds are added to the kept
+        record, so the total is unchanged. The merged record gets a new key
+        derived from the old ones.
+      - re-encode: the screenshot is re-encoded with the compaction codec
+        (lower resolution / quality). The item keeps its idempotency key.
+    Items an upload was already attempted for are never merged (the server
+    may have stored them), and passes only run while no drain is in
+    progress. Tile keyframes and deltas are left as they are by both
+    stages: deltas reference their keyframe by file name, so dropping or
+    re-encoding a keyframe would leave its deltas undecodable. Thinning
+    runs stop at them.
+    """
+
+    def __init__(self, queue: PersistentUploadQueue, drainer: BacklogDrainer, codec_options: dict,
+                 reencode_after_items: int = 500, reencode_after_sec: float = 6 * 3600,
+                 thin_after_items: int = 2000, thin_after_sec: float = 24 * 3600, keep_one_in: int = 4,
+                 batch_size: int = 50, interval_sec: float = 300.0,
+                 file_added: Optional[Callable[[str, int], None]] = None,
+                 file_removed: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            codec_options: 'codec'-style settings for re-encoded screenshots
+            reencode_after_items / reencode_after_sec: backlog size or item age that triggers re-encoding
+            thin_after_items / thin_after_sec: backlog size or item age that triggers thinning (0 items = never)
+            keep_one_in: thinning keeps one record out of this many
+            file_added / file_removed: told about screenshots written and deleted (retention index)
+        """
+        self.queue = queue
+        self.drainer = drainer
+        self.codec = create_codec(codec_options)
+        self.reencode_after_items = reencode_after_items
+        self.reencode_after_sec = reencode_after_sec
+        self.thin_after_items = thin_after_items
+        self.thin_after_sec = thin_after_sec
+        self.keep_one_in = max(2, int(keep_one_in))
+        self.batch_size = max(1, int(batch_size))
+        self.interval_sec = interval_sec
+        self.file_added = file_added
+        self.file_removed = file_removed
+        self.stats = {"reencoded": 0, "bytes_saved": 0, "records_merged": 0, "files_dropped": 0, "passes": 0}
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Run passes in the background (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="argus-compaction", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(30)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_sec):
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.error(f"Backlog compaction failed: {e}")
+
+    def run_once(self, now: Optional[float] = None) -> dict:
+        """One pass of both stages; returns what it changed (nothing while a drain is running)"""
+        now = time.time() if now is None else now
+        before = dict(self.stats)
+        with self.drainer.idle() as idle:
+            if not idle:
+                return {}
+            # Thin first so no time is spent re-encoding screenshots that are about to be dropped
+            self._thin(now)
+            self._reencode(now)
+            self.stats["passes"] += 1
+        changes = {key: self.stats[key] - before[key] for key in self.stats if key != "passes"}
+        if any(changes.values()):
+            logging.info(f"Backlog compacted: {changes} ({len(self.queue)} item(s) pending)")
+        return changes
+
+    def _reencode(self, now: float):
+        items = self.queue.old_items(
+            self.batch_size,
+            created_before=now - self.reencode_after_sec,
+            oldest_count=max(0, len(self.queue) - self.reencode_after_items),
+            with_file=True,
+        )
+        for item in items:
+            if self._stopped.is_set():
+                return
+            try:
+                self._reencode_item(item)
+            except Exception as e:
+                logging.warning(f"Cannot re-encode {item.filepath}: {e}")
+                self.queue.replace_file(item.id, item.filepath, item.content_hash)
+
+    def _reencode_item(self, item: PendingUpload):
+        frame = self._load(item.filepath)
+        if frame is None:
+            # Missing or a tile keyframe/delta: leave it as it is and don't look at it again
+            self.queue.replace_file(item.id, item.filepath, item.content_hash)
+            return
+
+        target = f"{os.path.splitext(item.filepath)[0]}.c{self.codec.extension}"
+        old_size = os.path.getsize(item.filepath)
+        result = self.codec.encode(frame, target)
+        if result.size >= old_size or not self.queue.replace_file(item.id, target, result.sha256):
+            # No gain (or the item was sent meanwhile): keep the original
+            os.remove(target)
+            self.queue.replace_file(item.id, item.filepath, item.content_hash)
+            return
+
+        self._delete(item.filepath)
+        if self.file_added is not None:
+            self.file_added(target, result.size)
+        self.stats["reencoded"] += 1
+        self.stats["bytes_saved"] += old_size - result.size
+
+    @staticmethod
+    def _is_tile_frame(filepath: Optional[str]) -> bool:
+        """A tile keyframe or delta (always PNG, marked by a tEXt chunk)"""
+        if filepath is None or not filepath.endswith(".png"):
+            return False
+        try:
+            text = read_png_text(filepath)
+        except (OSError, ValueError, struct.error):
+            return False
+        return KEYFRAME_KEY in text or DELTA_KEY in text
+
+    def _load(self, filepath: str) -> Optional[Frame]:
+        """BGRX frame of a queued screenshot; None for tile keyframes/deltas and missing files"""
+        if not os.path.exists(filepath) or self._is_tile_frame(filepath):
+            return None
+        if Image is not None:
+            with Image.open(filepath) as image:
+                image = image.convert("RGB")
+                return Frame(image.tobytes("raw", "BGRX"), image.width, image.height)
+
+        if not filepath.endswith(".png"):
+            return None
+        width, height, rgb, _ = read_png(filepath)
+        raw = bytearray(width * height * 4)
+        raw[0::4] = rgb[2::3]
+        raw[1::4] = rgb[1::3]
+        raw[2::4] = rgb[0::3]
+        return Frame(raw, width, height)
+
+    def _thin(self, now: float):
+        if not self.thin_after_items and not self.thin_after_sec:
+            return
+        items = self.queue.old_items(
+            self.batch_size * self.keep_one_in,
+            created_before=now - self.thin_after_sec if self.thin_after_sec else 0,
+            oldest_count=max(0, len(self.queue) - self.thin_after_items) if self.thin_after_items else 0,
+            never_sent=True,
+        )
+        for _, employee_items in groupby(items, key=lambda item: item.employee_id):
+            # Tile keyframes/deltas are never merged away; they split the runs
+            for is_tile, run in groupby(employee_items, key=lambda item: self._is_tile_frame(item.filepath)):
+                if is_tile:
+                    continue
+                run = list(run)
+                # Only full groups: a short tail waits for the next pass
+                for start in range(0, len(run) - self.keep_one_in + 1, self.keep_one_in):
+                    self._merge(run[start:start + self.keep_one_in])
+
+    def _merge(self, group: List[PendingUpload]):
+        with_file = [item for item in group if item.filepath is not None]
+        kept = with_file[-1] if with_file else group[-1]
+        others = [item for item in group if item is not kept]
+        key = merge_idempotency_keys(item.idempotency_key for item in group)
+        if not self.queue.merge(kept, others, key):
+            return
+        self.stats["records_merged"] += len(others)
+        for item in others:
+            if item.filepath is not None:
+                self._delete(item.filepath)
+                self.stats["files_dropped"] += 1
+
+    def _delete(self, filepath: str):
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+        if self.file_removed is not None:
+            self.file_removed(filepath)
+
+    def get_stats(self) -> dict:
+        return dict(self.stats)
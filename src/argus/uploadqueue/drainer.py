@@ -0,0 +1,155 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from src.argus.logger import logging
+from src.argus.uploadqueue.persistent_queue import PendingUpload, PersistentUploadQueue
+
+
+class DrainReport:
+    """Outcome and throughput of one backlog drain"""
+
+    def __init__(self):
+        self.uploaded = 0
+        self.failed = 0
+        self.requests = 0
+        self.work_seconds = 0.0
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+        self.stopped_early = False
+
+    @property
+    def throughput(self) -> float:
+        """Uploaded items per second"""
+        return self.uploaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "uploaded": self.uploaded,
+            "failed": self.failed,
+            "requests": self.requests,
+            "work_seconds": self.work_seconds,
+            "elapsed_sec": self.elapsed,
+            "items_per_sec": self.throughput,
+            "stopped_early": self.stopped_early,
+        }
+
+    def __repr__(self):
+        return (f"DrainReport(uploaded={self.uploaded}, failed={self.failed}, "
+                f"{self.throughput:.2f} items/s in {self.elapsed:.1f}s)")
+
+
+class BacklogDrainer:
+    """
+    Uploads the persistent backlog with a bounded number of requests in flight.
+
+    Items are dispatched oldest first. Requests in flight can complete in
+    any order, so every record carries its capture time (captured_at) and
+    the server orders work-seconds records by that, not by arrival. A
+    failed item keeps its place in the queue but is held back with
+    exponential backoff while the rest keep draining. The drain gives up
+    when `concurrency` requests in a row fail (the link or the server is
+    down) or should_continue() turns false.
+
+    With upload_batch_fn and batch_size > 1 each request carries up to
+    batch_size consecutive items; upload_batch_fn returns one success flag
+    per item.
+    """
+
+    def __init__(
+            self,
+            queue: PersistentUploadQueue,
+            upload_fn: Callable[[PendingUpload], bool],
+            concurrency: int = 4,
+            retry_base_sec: float = 5.0,
+            retry_max_sec: float = 300.0,
+            should_continue: Optional[Callable[[], bool]] = None,
+            upload_batch_fn: Optional[Callable[[List[PendingUpload]], List[bool]]] = None,
+            batch_size: int = 1,
+    ):
+        self.queue = queue
+        self.upload_fn = upload_fn
+        self.concurrency = max(1, int(concurrency))
+        self.retry_base_sec = retry_base_sec
+        self.retry_max_sec = retry_max_sec
+        self.should_continue = should_continue or (lambda: True)
+        self.upload_batch_fn = upload_batch_fn
+        self.batch_size = max(1, int(batch_size)) if upload_batch_fn is not None else 1
+        self.last_report: Optional[DrainReport] = None
+        self._lock = threading.Lock()
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before the next attempt of an item that has failed `attempts` times"""
+        return min(self.retry_max_sec, self.retry_base_sec * (2 ** max(0, attempts - 1)))
+
+    @contextmanager
+    def idle(self):
+        """Keep drains from starting while the backlog is rewritten; yields False if one is running"""
+        acquired = self._lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._lock.release()
+
+    def drain(self) -> Optional[DrainReport]:
+        """Upload every ready item; returns None if another drain is already running"""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            report = self._drain()
+        finally:
+            self._lock.release()
+        self.last_report = report
+        if report.uploaded or report.failed:
+            logging.info(f"Backlog drain finished: {report.as_dict()}")
+        return report
+
+    def _drain(self) -> DrainReport:
+        report = DrainReport()
+        in_flight = {}
+        failures_in_a_row = 0
+
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="argus-drain") as pool:
+            while True:
+                can_dispatch = failures_in_a_row < self.concurrency and self.should_continue()
+                if can_dispatch and len(in_flight) < self.concurrency:
+                    busy = [item.id for items in in_flight.values() for item in items]
+                    ready = self.queue.ready((self.concurrency - len(in_flight)) * self.batch_size, exclude=busy)
+                    for start in range(0, len(ready), self.batch_size):
+                        items = ready[start:start + self.batch_size]
+                        in_flight[pool.submit(self._upload, items)] = items
+                if not in_flight:
+                    report.stopped_early = not can_dispatch
+                    break
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    items = in_flight.pop(future)
+                    outcomes = future.result()
+                    for item, (ok, error) in zip(items, outcomes):
+                        if ok:
+                            self.queue.remove(item.id)
+                            report.uploaded += 1
+                            report.work_seconds += item.work_seconds
+                        else:
+                            self.queue.mark_failed(item.id, error, self.retry_delay(item.attempts + 1))
+                            report.failed += 1
+                    report.requests += 1
+                    failures_in_a_row = 0 if any(ok for ok, _ in outcomes) else failures_in_a_row + 1
+
+        report.elapsed = time.monotonic() - report.started
+        return report
+
+    def _upload(self, items: List[PendingUpload]):
+        """Upload one request's worth of items; returns (ok, error) per item"""
+        try:
+            if self.batch_size > 1:
+                flags = self.upload_batch_fn(items)
+            else:
+                flags = [self.upload_fn(items[0])]
+            return [(True, None) if ok else (False, "rejected by server") for ok in flags]
+        except Exception as e:
+            return [(False, str(e))] * len(items)
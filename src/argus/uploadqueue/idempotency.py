@@ -0,0 +1,26 @@
+import hashlib
+import os
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+
+def make_idempotency_key(employee_id: str, captured_at: Union[datetime, float, str],
+                         content_hash: Optional[str] = None, filepath: Optional[str] = None) -> str:
+    """
+    Stable key identifying one activity record across retries and restarts.
+
+    Built from who, when and what: the capture timestamp, the screenshot's
+    content hash (absent for time-only records) and the file name (which
+    tells apart the per-monitor files of one capture). The server keeps the
+    first record it sees for a key, so re-sending the same item can never
+    count its work seconds twice.
+    """
+    if isinstance(captured_at, datetime):
+        captured_at = captured_at.isoformat()
+    parts = [str(employee_id), str(captured_at), content_hash or "", os.path.basename(filepath) if filepath else ""]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def merge_idempotency_keys(keys: Iterable[str]) -> str:
+    """Key for a record that replaces several never-sent ones (same inputs, same key)"""
+    return hashlib.sha256("\x1f".join(sorted(keys)).encode("utf-8")).hexdigest()[:32]
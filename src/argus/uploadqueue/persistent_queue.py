@@ -0,0 +1,260 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from src.argus.exceptions import CustomException
+from src.argus.logger import logging
+from src.argus.uploadqueue.idempotency import make_idempotency_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id TEXT NOT NULL,
+    filepath TEXT,
+    work_seconds REAL NOT NULL,
+    content_hash TEXT,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    idempotency_key TEXT,
+    compacted INTEGER NOT NULL DEFAULT 0,
+    merged INTEGER NOT NULL DEFAULT 0,
+    captured_at REAL
+);
+"""
+
+# Columns added after the first release of the queue, with their definitions
+_MIGRATIONS = {
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "next_attempt_at": "REAL NOT NULL DEFAULT 0",
+    "last_error": "TEXT",
+    "idempotency_key": "TEXT",
+    "compacted": "INTEGER NOT NULL DEFAULT 0",
+    "merged": "INTEGER NOT NULL DEFAULT 0",
+    "captured_at": "REAL",
+}
+
+_COLUMNS = ("id, employee_id, filepath, work_seconds, content_hash, created_at, attempts, next_attempt_at, "
+            "last_error, idempotency_key, compacted, merged, captured_at")
+
+
+class PendingUpload:
+    """One capture waiting in the persistent queue"""
+
+    __slots__ = ("id", "employee_id", "filepath", "work_seconds", "content_hash", "created_at",
+                 "attempts", "next_attempt_at", "last_error", "idempotency_key", "compacted", "merged",
+                 "captured_at")
+
+    def __init__(self, id: int, employee_id: str, filepath: Optional[str], work_seconds: float,
+                 content_hash: Optional[str], created_at: float, attempts: int = 0,
+                 next_attempt_at: float = 0.0, last_error: Optional[str] = None,
+                 idempotency_key: Optional[str] = None, compacted: int = 0, merged: int = 0,
+                 captured_at: Optional[float] = None):
+        self.id = id
+        self.employee_id = employee_id
+        self.filepath = filepath
+        self.work_seconds = work_seconds
+        self.content_hash = content_hash
+        self.created_at = created_at
+        self.attempts = attempts
+        self.next_attempt_at = next_attempt_at
+        self.last_error = last_error
+        self.idempotency_key = idempotency_key
+        # Re-encoded smaller by the compactor / number of other records folded into this one
+        self.compacted = compacted
+        self.merged = merged
+        # Sent with the record so the server can order records whatever order they arrive in
+        self.captured_at = created_at if captured_at is None else captured_at
+
+    def __repr__(self):
+        return (f"PendingUpload(id={self.id}, {self.filepath!r}, work_seconds={self.work_seconds:.2f}, "
+                f"attempts={self.attempts})")
+
+
+class PersistentUploadQueue:
+    """
+    FIFO of captures that still have to reach the server, kept in SQLite so
+    screenshots and their work seconds survive crashes, kills and restarts.
+
+    The database runs in WAL mode with synchronous=NORMAL: an enqueue is a
+    single append to the write-ahead log and fsyncs are batched at
+    checkpoints, so the capture path never waits on the disk. A committed
+    row survives an application crash; only an OS crash or power loss can
+    drop the last few un-checkpointed rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Shared by the uploader, the encoder pool and the UI thread; every use holds _lock
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+        except sqlite3.Error as e:
+            raise CustomException(e, sys)
+
+        count = len(self)
+        if count:
+            logging.info(f"Recovered {count} pending upload(s) from {path}")
+
+    def put(self, employee_id: str, filepath: Optional[str], work_seconds: float,
+            content_hash: Optional[str] = None, idempotency_key: Optional[str] = None, attempts: int = 0,
+            captured_at: Optional[float] = None) -> int:
+        """
+        Append a capture; returns its queue id (a key defaults to one derived from the enqueue time)
+        attempts: uploads already tried before queueing (the server may have stored the record)
+        captured_at: wall-clock time of the capture, the enqueue time by default
+        """
+        created_at = time.time()
+        if idempotency_key is None:
+            idempotency_key = make_idempotency_key(employee_id, created_at, content_hash, filepath)
+        if captured_at is None:
+            captured_at = created_at
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO pending_uploads "
+                "(employee_id, filepath, work_seconds, content_hash, created_at, idempotency_key, attempts, "
+                "captured_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (employee_id, filepath, float(work_seconds), content_hash, created_at, idempotency_key, attempts,
+                 captured_at)
+            )
+            return cursor.lastrowid
+
+    def ready(self, limit: int, exclude: Iterable[int] = (), now: Optional[float] = None) -> List[PendingUpload]:
+        """
+        Oldest captures whose retry delay has passed
+        Args:
+            limit: maximum number of items
+            exclude: ids already being uploaded
+            now: wall-clock time to compare retry deadlines against
+        """
+        now = time.time() if now is None else now
+        exclude = list(exclude)
+        placeholders = ",".join("?" * len(exclude))
+        skip = f"AND id NOT IN ({placeholders}) " if exclude else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM pending_uploads WHERE next_attempt_at <= ? {skip}ORDER BY id LIMIT ?",
+                (now, *exclude, limit)
+            ).fetchall()
+        return [PendingUpload(*row) for row in rows]
+
+    def mark_failed(self, item_id: int, error: str, retry_delay: float):
+        """Record a failed attempt and hold the item back for retry_delay seconds"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pending_uploads SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? "
+                "WHERE id = ?",
+                (time.time() + retry_delay, error, item_id)
+            )
+
+    def remove(self, item_id: int):
+        """Drop a capture once the server has accepted it"""
+        with self._lock:
+            self._conn.execute("DELETE FROM pending_uploads WHERE id = ?", (item_id,))
+
+    def old_items(self, limit: int, created_before: float, oldest_count: int = 0,
+                  with_file: bool = False, never_sent: bool = False) -> List[PendingUpload]:
+        """
+        Oldest items that are past an age or beyond a backlog size, for compaction
+        Args:
+            created_before: items queued before this wall-clock time qualify
+            oldest_count: the oldest this many items qualify whatever their age
+            with_file: only items with a screenshot that has not been re-encoded yet
+            never_sent: only unmerged items no upload was ever attempted for
+        """
+        conditions = ["(created_at <= ? OR id IN (SELECT id FROM pending_uploads ORDER BY id LIMIT ?))"]
+        if with_file:
+            conditions.append("filepath IS NOT NULL AND compacted = 0")
+        if never_sent:
+            conditions.append("attempts = 0 AND merged = 0")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM pending_uploads WHERE {' AND '.join(conditions)} ORDER BY id LIMIT ?",
+                (created_before, oldest_count, limit)
+            ).fetchall()
+        return [PendingUpload(*row) for row in rows]
+
+    def replace_file(self, item_id: int, filepath: str, content_hash: Optional[str]) -> bool:
+        """Point an item at its re-encoded screenshot; False if the item is gone"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE pending_uploads SET filepath = ?, content_hash = ?, compacted = 1 WHERE id = ?",
+                (filepath, content_hash, item_id)
+            )
+            return cursor.rowcount == 1
+
+    def merge(self, kept: PendingUpload, others: List[PendingUpload], idempotency_key: str) -> bool:
+        """
+        Fold the work seconds of `others` into `kept` and drop them, in one transaction.
+        Only never-sent items are merged; if any of them was sent or removed meanwhile nothing changes.
+        """
+        ids = [item.id for item in [kept] + others]
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                total, count = self._conn.execute(
+                    f"SELECT SUM(work_seconds), COUNT(*) FROM pending_uploads "
+                    f"WHERE id IN ({placeholders}) AND attempts = 0",
+                    ids
+                ).fetchone()
+                if count != len(ids):
+                    return False
+                self._conn.execute(
+                    "UPDATE pending_uploads SET work_seconds = ?, idempotency_key = ?, merged = merged + ? WHERE id = ?",
+                    (total, idempotency_key, len(others), kept.id)
+                )
+                self._conn.execute(
+                    f"DELETE FROM pending_uploads WHERE id IN ({','.join('?' * len(others))})",
+                    [item.id for item in others]
+                )
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pending_uploads").fetchone()[0]
+
+    def __bool__(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM pending_uploads LIMIT 1").fetchone() is not None
+
+    def _migrate(self):
+        """Bring queues written by older versions up to the current schema"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(pending_uploads)")}
+        for column, definition in _MIGRATIONS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE pending_uploads ADD COLUMN {column} {definition}")
+
+        # Rows queued before keys existed get one now, so their retries are deduplicated too
+        rows = self._conn.execute(
+            "SELECT id, employee_id, created_at, content_hash, filepath FROM pending_uploads "
+            "WHERE idempotency_key IS NULL"
+        ).fetchall()
+        for item_id, employee_id, created_at, content_hash, filepath in rows:
+            self._conn.execute(
+                "UPDATE pending_uploads SET idempotency_key = ? WHERE id = ?",
+                (make_idempotency_key(employee_id, created_at, content_hash, filepath), item_id)
+            )
+        # Left by versions that also kept a local list of acknowledged keys
+        self._conn.execute("DROP TABLE IF EXISTS acknowledged")
+
+    def checkpoint(self):
+        """Flush the write-ahead log into the database file (one fsync for every enqueue since the last one)"""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                self._conn.close()
@@ -0,0 +1,166 @@
+import socket
+import threading
+import time
+from typing import Callable, List, Optional
+
+from src.argus.logger import logging
+from src.argus.settings import settings
+
+
+class ConnectivityMonitor:
+    """
+    Cached view of whether the API host is reachable, kept up to date in the background.
+
+    Real traffic is the main signal: the API client reports every response
+    (reachable) and every connection error or timeout (suspect). The monitor
+    thread only opens a probe connection to the API host when there is no
+    recent evidence: at startup, after a reported failure, every
+    offline_probe_sec while offline, and after stale_after_sec without
+    traffic. Readers never block; subscribers are told about changes.
+    """
+
+    def __init__(self, host: str = "", port: int = 443, probe_timeout: float = 3.0,
+                 offline_probe_interval: float = 5.0, stale_after: float = 60.0):
+        self.host = host
+        self.port = port
+        self.probe_timeout = probe_timeout
+        self.offline_probe_interval = offline_probe_interval
+        self.stale_after = stale_after
+        self.probes = 0
+        self._online: Optional[bool] = None
+        self._last_evidence = 0.0
+        self._suspect = False
+        self._subscribers: List[Callable[[bool], None]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def is_online(self) -> bool:
+        """Last known state; optimistic until the first probe or request has completed"""
+        return self._online is not False
+
+    @property
+    def state(self) -> Optional[bool]:
+        """True / False, or None while still unknown"""
+        return self._online
+
+    def set_target(self, host: str, port: int = 443):
+        """Host and port the probe connects to (the API server)"""
+        self.host = host
+        self.port = port
+
+    def start(self):
+        """Start the background probe thread (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="argus-connectivity", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(self.probe_timeout + 1)
+
+    def subscribe(self, callback: Callable[[bool], None]):
+        """Call callback(online) on every change; it runs on the monitor or a request thread"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[bool], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def report_success(self):
+        """A request reached the server"""
+        with self._lock:
+            self._last_evidence = time.monotonic()
+            self._suspect = False
+        self._set_online(True)
+
+    def report_failure(self):
+        """A request failed to connect or timed out; have the monitor confirm with a probe"""
+        with self._lock:
+            self._suspect = True
+        self._wake.set()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "online": self._online,
+                "probes": self.probes,
+                "seconds_since_evidence": time.monotonic() - self._last_evidence if self._last_evidence else None,
+            }
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # Cleared before looking at the state, so a wake-up that lands after this point is never lost
+            self._wake.clear()
+            if self._needs_probe():
+                self._probe()
+            self._wake.wait(self._next_check())
+
+    def _needs_probe(self) -> bool:
+        with self._lock:
+            return (self._online is not True
+                    or self._suspect
+                    or time.monotonic() - self._last_evidence >= self.stale_after)
+
+    def _next_check(self) -> float:
+        with self._lock:
+            if self._online is not True:
+                return self.offline_probe_interval
+            return max(0.5, self.stale_after - (time.monotonic() - self._last_evidence))
+
+    def _probe(self):
+        if not self.host:
+            return
+        with self._lock:
+            self.probes += 1
+        try:
+            # Closing the socket matters: the probe runs for the whole life of the app
+            with socket.create_connection((self.host, self.port), timeout=self.probe_timeout):
+                pass
+            reachable = True
+        except OSError:
+            reachable = False
+
+        with self._lock:
+            self._suspect = False
+            if reachable:
+                self._last_evidence = time.monotonic()
+        self._set_online(reachable)
+
+    def _set_online(self, online: bool):
+        with self._lock:
+            changed = self._online != online
+            self._online = online
+            subscribers = list(self._subscribers) if changed else []
+        if not changed:
+            return
+        logging.info(f"Connectivity changed: {'online' if online else 'offline'}")
+        for callback in subscribers:
+            try:
+                callback(online)
+            except Exception as e:
+                logging.warning(f"Connectivity subscriber failed: {e}")
+
+
+def create_monitor(host: str = "", port: int = 443) -> ConnectivityMonitor:
+    """A monitor configured from the 'connectivity' settings"""
+    return ConnectivityMonitor(
+        host,
+        port,
+        probe_timeout=settings.get("connectivity", "probe_timeout_sec", 3.0),
+        offline_probe_interval=settings.get("connectivity", "offline_probe_sec", 5.0),
+        stale_after=settings.get("connectivity", "stale_after_sec", 60.0),
+    )
+
+
+# Singleton instance; the shared API client sets the target host and feeds it request outcomes
+connectivity = create_monitor()
@@ -1,5 +1,4 @@
 import random
-import socket
 import customtkinter as ctk
 
 def get_random_interval() -> int:
@@ -7,16 +6,6 @@ def get_random_interval() -> int:
 
 
 
-def has_internet_connection(timeout=3) -> bool:
-    try:
-        # Try to connect to Google's DNS server
-        socket.create_connection(("8.8.8.8", 53), timeout=timeout)
-        return True
-    except OSError:
-        return False
-
-
-
 def show_temp_dialog(parent, title: str = "Notice", message="Processing...", duration=2000):
     def _show():
         dialog = ctk.CTkToplevel(parent)
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from src.argus.api.tracker import ActivityTrackerAPI
+from src.argus.screenshot.png import write_png
+
+
+@pytest.fixture
+def records(tmp_path):
+    records = []
+    for i in range(5):
+        path = str(tmp_path / f"shot_{i}.png")
+        # Noise does not compress, so the screenshot bytes dominate every request
+        write_png(os.urandom(64 * 64 * 3), (64, 64), path)
+        records.append({"employee_id": "e1", "screenshot_path": path if i != 2 else None,
+                        "work_seconds": "60", "idempotency_key": f"key-{i}", "captured_at": 1_700_000_000.0 + i})
+    return records
+
+
+def test_batch_endpoint_sends_records_in_one_request(records):
+    with StubServer(batch=True) as server:
+        api = ActivityTrackerAPI(base_url=f"{server.url}/")
+
+        assert api.upload_batch(records) == [True] * 5
+        assert api.batch_supported is True
+        stats = server.stats.as_dict()
+        # A probe without files, then the whole batch in one request
+        assert (stats["requests"], stats["items"], stats["screenshots"]) == (2, 5, 4)
+        assert stats["work_seconds"] == 300.0
+        assert server.stats.captured_at == [1_700_000_000.0 + i for i in range(5)]
+
+
+def test_missing_batch_endpoint_falls_back_to_single_uploads(records):
+    with StubServer(batch=False) as server:
+        api = ActivityTrackerAPI(base_url=f"{server.url}/")
+
+        assert api.upload_batch(records) == [True] * 5
+        assert api.batch_supported is False
+        # One rejected probe, then one request per record
+        stats = server.stats.as_dict()
+        assert stats["requests"] == 6
+        # The probe carried no screenshots: each file was sent once, by its single upload
+        screenshot_bytes = sum(os.path.getsize(r["screenshot_path"]) for r in records if r["screenshot_path"])
+        assert stats["bytes_received"] < screenshot_bytes + 8 * 1024
+
+        # Once known to be missing, the batch endpoint is not tried again
+        server.reset_stats()
+        again = [dict(record, idempotency_key=f"again-{i}") for i, record in enumerate(records)]
+        assert api.upload_batch(again) == [True] * 5
+        stats = server.stats.as_dict()
+        assert (stats["requests"], stats["items"], stats["work_seconds"]) == (5, 5, 300.0)
+        assert server.stats.captured_at == [1_700_000_000.0 + i for i in range(5)]
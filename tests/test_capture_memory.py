@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks.bench_capture_memory import PEAK_BOUND_BYTES, traced_peak
+from benchmarks.frames import synthetic_frame
+from src.argus.screenshot.codecs import PngCodec
+from src.argus.screenshot.png import read_png
+
+
+@pytest.mark.parametrize("width, height", [(1920, 1080), (3840, 2160)])
+def test_png_encode_peak_stays_under_bound(tmp_path, width, height):
+    frame = synthetic_frame(width, height)
+    path = str(tmp_path / "capture.png")
+
+    peak = traced_peak(lambda: PngCodec().encode(frame, path))
+
+    assert peak <= PEAK_BOUND_BYTES, f"{peak} bytes traced at {width}x{height}"
+    # The bound must not come from skipping work: the file holds the whole frame
+    decoded_width, decoded_height, rgb, _ = read_png(path)
+    assert (decoded_width, decoded_height) == (width, height)
+    assert rgb == bytes(frame.rgb)
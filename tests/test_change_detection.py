@@ -0,0 +1,63 @@
+from benchmarks.frames import synthetic_frame
+from src.argus.api.tracker import ActivityTrackerAPI
+from src.argus.filemanager.file_manager import FileManager
+from src.argus.screenshot.capture import ScreenshotCapture
+from src.argus.screenshot.fingerprint import block_fingerprint, fingerprint_difference
+from src.argus.screenshot.grabber import Frame
+
+WIDTH, HEIGHT = 640, 360
+
+
+def _capture(tmp_path, **change_detection) -> ScreenshotCapture:
+    # Nothing is uploaded: only the skip decision is exercised, and start() is never called
+    capture = ScreenshotCapture(None, api=ActivityTrackerAPI(base_url="http://127.0.0.1:9/"),
+                                files=FileManager(base_dir=str(tmp_path)))
+    capture.change_detection = {"enabled": True, "grid_size": 16, "block_tolerance": 8, "threshold": 0.01,
+                                "max_consecutive_skips": 5, **change_detection}
+    return capture
+
+
+def _cursor_blink(frame: Frame) -> Frame:
+    """Copy of frame with a 2x16 px caret drawn"""
+    blinked = Frame(bytearray(frame.raw), frame.width, frame.height)
+    for row in range(100, 116):
+        offset = (row * frame.width + 200) * 4
+        blinked.raw[offset:offset + 8] = b"\x00\x00\x00\xff" * 2
+    return blinked
+
+
+def test_fingerprint_ignores_a_blinking_cursor_but_not_a_new_window():
+    frame = synthetic_frame(WIDTH, HEIGHT)
+    base = block_fingerprint(frame.raw, WIDTH, HEIGHT)
+
+    assert len(base) == 16 * 16
+    assert fingerprint_difference(base, block_fingerprint(_cursor_blink(frame).raw, WIDTH, HEIGHT)) == 0.0
+    other = synthetic_frame(WIDTH, HEIGHT, seed=1)
+    assert fingerprint_difference(base, block_fingerprint(other.raw, WIDTH, HEIGHT)) > 0.01
+    assert fingerprint_difference(None, base) == 1.0
+
+
+def test_static_screen_is_skipped_up_to_max_consecutive_skips(tmp_path):
+    capture = _capture(tmp_path, max_consecutive_skips=3)
+    frame = synthetic_frame(WIDTH, HEIGHT)
+
+    skipped = [capture._is_unchanged([_cursor_blink(frame) if i % 2 else frame]) for i in range(9)]
+
+    # The first frame is always sent, then a full screenshot after every three skips
+    assert skipped == [False, True, True, True, False, True, True, True, False]
+    assert capture.skipped_frames == 6
+
+
+def test_changed_screen_is_never_skipped(tmp_path):
+    capture = _capture(tmp_path)
+    frames = [synthetic_frame(WIDTH, HEIGHT, seed=seed) for seed in range(4)]
+
+    assert [capture._is_unchanged([frame]) for frame in frames] == [False] * 4
+
+
+def test_change_detection_can_be_disabled(tmp_path):
+    capture = _capture(tmp_path, enabled=False)
+    frame = synthetic_frame(WIDTH, HEIGHT)
+
+    assert [capture._is_unchanged([frame]) for _ in range(3)] == [False] * 3
+    assert capture.skipped_frames == 0
@@ -0,0 +1,76 @@
+import os
+import time
+
+from src.argus.screenshot.grabber import Frame
+from src.argus.screenshot.png import write_frame_png
+from src.argus.screenshot.tiles import TileDeltaEncoder, reconstruct, tile_metadata
+from src.argus.uploadqueue.compaction import BacklogCompactor
+from src.argus.uploadqueue.drainer import BacklogDrainer
+from src.argus.uploadqueue.persistent_queue import PersistentUploadQueue
+
+WIDTH, HEIGHT = 128, 96
+
+
+def _frame(seed: int) -> Frame:
+    """BGRA frame with one 32x32 block whose colour depends on seed"""
+    raw = bytearray(b"\x30\x40\x50\xff" * (WIDTH * HEIGHT))
+    for y in range(32, 64):
+        for x in range(seed * 8 % 96, seed * 8 % 96 + 32):
+            offset = (y * WIDTH + x) * 4
+            raw[offset:offset + 3] = bytes(((seed * 40) % 256, 200, (seed * 90) % 256))
+    return Frame(raw, WIDTH, HEIGHT)
+
+
+def _rgb(frame: Frame) -> bytes:
+    rgb = bytearray(WIDTH * HEIGHT * 3)
+    rgb[0::3] = frame.raw[2::4]
+    rgb[1::3] = frame.raw[1::4]
+    rgb[2::3] = frame.raw[0::4]
+    return bytes(rgb)
+
+
+def _compactor(queue: PersistentUploadQueue) -> BacklogCompactor:
+    # Thin everything, never re-encode
+    return BacklogCompactor(queue, BacklogDrainer(queue, lambda item: True), {"format": "png"},
+                            reencode_after_items=10 ** 6, reencode_after_sec=10 ** 9,
+                            thin_after_items=0, thin_after_sec=1, keep_one_in=2, batch_size=50)
+
+
+def test_thinning_keeps_tile_keyframes_and_deltas_decodable(tmp_path):
+    queue = PersistentUploadQueue(str(tmp_path / "queue.db"))
+    encoder = TileDeltaEncoder(tile_size=16, keyframe_interval=10)
+    originals = {}
+
+    def put(name: str, frame: Frame, meta=None):
+        path = str(tmp_path / name)
+        write_frame_png(frame, path, text=tile_metadata(meta) if meta is not None else None)
+        queue.put("e1", path, 60.0)
+        originals[path] = frame
+
+    put("plain_0.png", _frame(0))
+    put("plain_1.png", _frame(1))
+    for i in range(4):
+        frame = _frame(2 + i)
+        packed, meta = encoder.process(frame, f"tile_{i}.png")
+        put(f"tile_{i}.png", packed, meta)
+        originals[str(tmp_path / f"tile_{i}.png")] = frame
+    put("plain_2.png", _frame(7))
+    put("plain_3.png", _frame(8))
+
+    changes = _compactor(queue).run_once(now=time.time() + 60)
+
+    # The two plain pairs were thinned, the keyframe run was left alone
+    assert changes["records_merged"] == 2
+    remaining = {item.filepath for item in queue.ready(100)}
+    assert remaining == {str(tmp_path / name) for name in
+                         ("plain_1.png", "tile_0.png", "tile_1.png", "tile_2.png", "tile_3.png", "plain_3.png")}
+    assert sum(item.work_seconds for item in queue.ready(100)) == 8 * 60.0
+
+    # Every queued delta still rebuilds to the frame that was grabbed
+    for i in range(1, 4):
+        path = str(tmp_path / f"tile_{i}.png")
+        width, height, rgb = reconstruct(path)
+        assert (width, height) == (WIDTH, HEIGHT)
+        assert rgb == _rgb(originals[path])
+    assert os.path.exists(str(tmp_path / "tile_0.png"))
+    queue.close()
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from src.argus.uploadqueue.drainer import BacklogDrainer
+from src.argus.uploadqueue.persistent_queue import PersistentUploadQueue
+
+
+class RecordingServer:
+    """Upload function that records how many requests overlap and the capture time of every record"""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.captured_at = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def upload(self, item) -> bool:
+        return self.upload_batch([item])[0]
+
+    def upload_batch(self, items) -> list:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.captured_at.extend(item.captured_at for item in items)
+            self.in_flight -= 1
+        return [True] * len(items)
+
+
+def _queue(tmp_path, count: int) -> PersistentUploadQueue:
+    queue = PersistentUploadQueue(str(tmp_path / "queue.db"))
+    for i in range(count):
+        queue.put("e1", None, 60.0, idempotency_key=f"e1-{i}", captured_at=1_700_000_000.0 + 60 * i)
+    return queue
+
+
+def test_single_employee_backlog_uploads_concurrently(tmp_path):
+    queue = _queue(tmp_path, 20)
+    server = RecordingServer()
+
+    started = time.monotonic()
+    report = BacklogDrainer(queue, server.upload, concurrency=4).drain()
+    elapsed = time.monotonic() - started
+
+    assert report.uploaded == 20 and len(queue) == 0
+    assert server.max_in_flight == 4
+    # Serial uploads would take 20 x 50 ms
+    assert elapsed < 0.75
+    # Arrival order is not guaranteed, but every record carries its capture time for the server to order by
+    assert sorted(server.captured_at) == [1_700_000_000.0 + 60 * i for i in range(20)]
+    queue.close()
+
+
+def test_batches_hold_consecutive_records_and_overlap(tmp_path):
+    queue = _queue(tmp_path, 45)
+    batches = []
+
+    server = RecordingServer()
+
+    def upload_batch(items):
+        batches.append([item.captured_at for item in items])
+        return server.upload_batch(items)
+
+    report = BacklogDrainer(queue, server.upload, concurrency=4,
+                            upload_batch_fn=upload_batch, batch_size=10).drain()
+
+    assert report.uploaded == 45 and report.requests == 5
+    assert server.max_in_flight > 1
+    assert all(batch == sorted(batch) for batch in batches)
+    queue.close()
+
+
+def test_capture_time_defaults_to_enqueue_time(tmp_path):
+    queue = PersistentUploadQueue(str(tmp_path / "queue.db"))
+    before = time.time()
+    queue.put("e1", None, 60.0)
+    item = queue.ready(1)[0]
+    assert before <= item.captured_at == item.created_at <= time.time()
+    queue.close()
@@ -0,0 +1,48 @@
+from src.argus.screenshot import grabber as grabber_module
+from src.argus.screenshot.grabber import ScreenGrabber
+
+
+class FakeShot:
+    def __init__(self, monitor: dict):
+        self.raw = bytearray(monitor["width"] * monitor["height"] * 4)
+        self.width, self.height = monitor["width"], monitor["height"]
+        self.left, self.top = monitor["left"], monitor["top"]
+
+
+class FakeMSS:
+    """Stands in for mss.mss(): the monitor list is read once per handle, like mss caches it"""
+    layout = []
+    opened = 0
+    closed = 0
+
+    def __init__(self):
+        FakeMSS.opened += 1
+        physical = [dict(m) for m in FakeMSS.layout]
+        self.monitors = [grabber_module.virtual_region(physical)] + physical if physical else [{}]
+
+    def grab(self, monitor: dict) -> FakeShot:
+        return FakeShot(monitor)
+
+    def close(self):
+        FakeMSS.closed += 1
+
+
+def test_layout_check_picks_up_a_hot_plugged_monitor_with_a_fresh_handle(monkeypatch):
+    monkeypatch.setattr(grabber_module.mss, "mss", FakeMSS)
+    FakeMSS.layout = [{"left": 0, "top": 0, "width": 64, "height": 48}]
+    FakeMSS.opened = FakeMSS.closed = 0
+    grabber = ScreenGrabber(mode="per_monitor", output="separate", layout_check_sec=3600)
+
+    assert [frame.size for frame in grabber.grab()] == [(64, 48)]
+    FakeMSS.layout.append({"left": 64, "top": 0, "width": 32, "height": 48})
+    # Within layout_check_sec the cached layout and handle are reused
+    assert [frame.size for frame in grabber.grab()] == [(64, 48)]
+    assert FakeMSS.opened == 1
+
+    grabber.layout_check_sec = 0
+    assert [frame.size for frame in grabber.grab()] == [(64, 48), (32, 48)]
+    stats = grabber.get_stats()
+    assert (stats["handles_opened"], stats["layout_changes"], stats["monitors"]) == (2, 1, 2)
+
+    grabber.close()
+    assert FakeMSS.closed == FakeMSS.opened
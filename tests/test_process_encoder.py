@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from benchmarks.frames import synthetic_frame
+from src.argus.screenshot.codecs import PngCodec
+from src.argus.screenshot.png import read_png
+from src.argus.screenshot.process_encoder import ProcessPoolEncoder, shared_memory
+
+pytestmark = pytest.mark.skipif(shared_memory is None, reason="needs multiprocessing.shared_memory")
+
+
+def test_write_error_fails_only_that_frame(tmp_path):
+    encoder = ProcessPoolEncoder(workers=1)
+    frame = synthetic_frame(320, 200)
+    try:
+        # The worker cannot write here; the error reaches the caller like an in-thread failure
+        with pytest.raises(OSError):
+            encoder.encode(frame, str(tmp_path / "missing" / "shot.png"), PngCodec())
+        assert encoder.enabled
+
+        path = str(tmp_path / "shot.png")
+        result = encoder.encode(frame, path, PngCodec())
+        assert result.size == os.path.getsize(path)
+        assert read_png(path)[2] == frame.rgb
+        assert encoder.enabled and encoder._pool is not None
+    finally:
+        encoder.shutdown()
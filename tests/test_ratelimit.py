@@ -0,0 +1,55 @@
+import threading
+import time
+
+from src.argus.api.ratelimit import BACKLOG, LIVE, TokenBucket
+
+
+def _wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_live_sender_goes_ahead_of_waiting_backlog():
+    bucket = TokenBucket(rate=50_000, burst=10_000)
+    bucket.acquire(10_000)  # Empty the bucket
+    served = []
+    lock = threading.Lock()
+
+    def send(name: str, priority: int):
+        bucket.acquire(10_000, priority)
+        with lock:
+            served.append(name)
+
+    threads = [threading.Thread(target=send, args=(f"backlog{i}", BACKLOG)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: bucket.get_stats()["waiting_backlog"] == 3)
+    live = threading.Thread(target=send, args=("live", LIVE))
+    live.start()
+    threads.append(live)
+    for thread in threads:
+        thread.join(5.0)
+
+    # The backlog was waiting first, yet the live capture gets the next tokens
+    assert served[0] == "live"
+    assert sorted(served[1:]) == ["backlog0", "backlog1", "backlog2"]
+    assert bucket.get_stats()["bytes_sent"] == 50_000
+
+
+def test_rate_is_enforced_after_the_burst():
+    bucket = TokenBucket(rate=100_000, burst=10_000)
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire(10_000)
+    # The first 10 kB is the burst; the other 40 kB take 0.4 s at 100 kB/s
+    assert time.monotonic() - started >= 0.35
+
+
+def test_zero_rate_disables_limiting():
+    bucket = TokenBucket(rate=0, burst=1024)
+    started = time.monotonic()
+    bucket.acquire(100 * 1024 * 1024, LIVE)
+    assert time.monotonic() - started < 0.1
+    assert not bucket.enabled and bucket.bytes_sent == 100 * 1024 * 1024
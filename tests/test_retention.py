@@ -0,0 +1,106 @@
+import os
+import time
+
+from src.argus.retention.retention import RetentionManager
+
+
+def _write(path, size, age_sec):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    stamp = time.time() - age_sec
+    os.utime(path, (stamp, stamp))
+
+
+def test_adopted_files_are_never_expired_as_uploaded(tmp_path):
+    root = tmp_path / "screenshots"
+    old = [str(root / "1" / f"old_{i}.png") for i in range(5)]
+    for path in old:
+        _write(path, 100, age_sec=7 * 24 * 3600)
+
+    retention = RetentionManager(str(tmp_path / "retention.db"), str(root), quota_bytes=0, grace_sec=0)
+    changes = retention.run_once(now=time.time() + 30 * 24 * 3600)
+
+    assert changes["adopted"] == 5
+    assert changes["deleted"] == 0
+    assert all(os.path.exists(path) for path in old)
+    assert retention.get_stats()["not_uploaded"] == 5
+    retention.close()
+
+
+def test_adopted_files_only_leave_through_recorded_quota_evictions(tmp_path):
+    root = tmp_path / "screenshots"
+    for i in range(4):
+        _write(str(root / "1" / f"old_{i}.png"), 100, age_sec=(10 - i) * 3600)
+
+    retention = RetentionManager(str(tmp_path / "retention.db"), str(root), quota_bytes=250, grace_sec=0)
+    changes = retention.run_once()
+
+    assert changes["deleted"] == 0
+    assert changes["evicted"] == 2
+    assert retention.total_bytes == 200
+    # The two oldest went, and both evictions are on record
+    assert not os.path.exists(str(root / "1" / "old_0.png"))
+    assert os.path.exists(str(root / "1" / "old_3.png"))
+    assert retention.get_stats()["evicted_not_uploaded_total"] == 2
+    retention.close()
+
+
+def test_acknowledged_files_expire_after_grace(tmp_path):
+    root = tmp_path / "screenshots"
+    path = str(root / "1" / "new.png")
+    _write(path, 100, age_sec=0)
+
+    retention = RetentionManager(str(tmp_path / "retention.db"), str(root), quota_bytes=0, grace_sec=60)
+    retention.run_once()
+    retention.mark_uploaded(path)
+    assert retention.run_once()["deleted"] == 0
+    assert retention.run_once(now=time.time() + 120)["deleted"] == 1
+    assert not os.path.exists(path)
+    retention.close()
+
+
+def _track_tile_run(retention: RetentionManager, root, names):
+    """Write and register a keyframe followed by deltas against it, oldest first"""
+    paths = {}
+    for name in names:
+        path = str(root / "1" / name)
+        _write(path, 100, age_sec=0)
+        retention.track(path, 100, keyframe=None if name == "key.png" else "key.png")
+        paths[name] = path
+        time.sleep(0.01)
+    return paths
+
+
+def test_pending_keyframe_is_evicted_with_its_deltas(tmp_path):
+    root = tmp_path / "screenshots"
+    retention = RetentionManager(str(tmp_path / "retention.db"), str(root), quota_bytes=350, grace_sec=60)
+    paths = _track_tile_run(retention, root, ["key.png", "delta_1.png", "delta_2.png"])
+    plain = str(root / "1" / "plain.png")
+    _write(plain, 100, age_sec=0)
+    retention.track(plain, 100)
+
+    changes = retention.run_once()
+
+    # Evicting the keyframe alone would have been enough for the quota, but its deltas could never be rebuilt
+    assert changes["evicted"] == 3
+    assert not any(os.path.exists(path) for path in paths.values())
+    assert os.path.exists(plain)
+    assert retention.total_bytes == 100
+    retention.close()
+
+
+def test_uploaded_keyframe_is_evicted_alone(tmp_path):
+    root = tmp_path / "screenshots"
+    retention = RetentionManager(str(tmp_path / "retention.db"), str(root), quota_bytes=250, grace_sec=3600)
+    paths = _track_tile_run(retention, root, ["key.png", "delta_1.png", "delta_2.png"])
+    retention.mark_uploaded(paths["key.png"])
+
+    changes = retention.run_once()
+
+    # The server already has the keyframe, so the pending deltas stay
+    assert changes["evicted"] == 1
+    assert not os.path.exists(paths["key.png"])
+    assert os.path.exists(paths["delta_1.png"]) and os.path.exists(paths["delta_2.png"])
+    assert retention.total_bytes == 200
+    retention.close()
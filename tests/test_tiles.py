@@ -0,0 +1,54 @@
+from benchmarks.frames import synthetic_frame
+from src.argus.screenshot.grabber import Frame
+from src.argus.screenshot.png import write_frame_png
+from src.argus.screenshot.tiles import TileDeltaEncoder, reconstruct, tile_metadata
+
+WIDTH, HEIGHT = 320, 200
+TILE = 32
+
+
+def _paint(frame: Frame, x: int, y: int, width: int, height: int) -> Frame:
+    """Copy of frame with a solid rectangle drawn on it"""
+    changed = Frame(bytearray(frame.raw), frame.width, frame.height)
+    for row in range(y, y + height):
+        offset = (row * frame.width + x) * 4
+        changed.raw[offset:offset + width * 4] = b"\x10\xe0\x80\xff" * width
+    return changed
+
+
+def test_unchanged_screen_sends_no_tiles():
+    encoder = TileDeltaEncoder(tile_size=TILE, keyframe_interval=10)
+    frame = synthetic_frame(WIDTH, HEIGHT)
+    encoder.process(frame, "key.png")
+
+    packed, meta = encoder.process(Frame(bytearray(frame.raw), WIDTH, HEIGHT), "same.png")
+
+    assert meta["type"] == "delta" and meta["tiles"] == []
+    assert packed.size == (1, 1)
+
+
+def test_delta_holds_only_the_touched_tiles_and_rebuilds_the_frame(tmp_path):
+    encoder = TileDeltaEncoder(tile_size=TILE, keyframe_interval=10)
+    keyframe = synthetic_frame(WIDTH, HEIGHT)
+    key_out, key_meta = encoder.process(keyframe, "key.png")
+    write_frame_png(key_out, str(tmp_path / "key.png"), text=tile_metadata(key_meta))
+
+    # Spans tiles (1..2, 1) of a 10-column grid, and the partial last column on row 5
+    changed = _paint(keyframe, 40, 40, 40, 10)
+    changed = _paint(changed, WIDTH - 5, 170, 5, 20)
+    packed, meta = encoder.process(changed, "delta.png")
+    delta_path = str(tmp_path / "delta.png")
+    write_frame_png(packed, delta_path, text=tile_metadata(meta))
+
+    assert meta["tiles"] == [11, 12, 59]
+    assert reconstruct(delta_path) == (WIDTH, HEIGHT, changed.rgb)
+
+
+def test_keyframe_every_interval_and_on_resize():
+    encoder = TileDeltaEncoder(tile_size=TILE, keyframe_interval=3)
+    frame = synthetic_frame(WIDTH, HEIGHT)
+    types = [encoder.process(frame, f"{i}.png")[1]["type"] for i in range(5)]
+    assert types == ["keyframe", "delta", "delta", "delta", "keyframe"]
+
+    _, meta = encoder.process(synthetic_frame(WIDTH // 2, HEIGHT), "resized.png")
+    assert meta == {"type": "keyframe", "id": "resized.png"}